@@ -0,0 +1,645 @@
+"""Grocery Store Simulation - Benchmarks
+
+This file contains timing and memory benchmarks for the data structures
+used by the simulation, and a suite of benchmarks of the simulation's hot
+paths whose results can be saved as JSON and compared between commits.
+
+Run it from this directory, e.g.
+    python benchmark.py queue
+    python benchmark.py queue --sizes 1000 10000 --legacy-limit 10000
+    python benchmark.py memory --count 100000
+    python benchmark.py suite --output before.json
+    python benchmark.py compare before.json after.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+from container import Container, PriorityQueue
+from event import JoinLine, FinishCheckOut
+from event_generator import write_events
+from simulation import GroceryStoreSimulation
+from store import GroceryStore, Customer
+
+
+class SortedListPriorityQueue(Container):
+    """The original list-based priority queue, kept for comparison.
+
+    add walks the sorted list to find the insertion point and remove pops
+    the front of the list, so both are O(n).
+    """
+    # === Private Attributes ===
+    # @type _items: list
+    #     The items stored in the priority queue, sorted by priority.
+
+    def __init__(self):
+        """Initialize an empty SortedListPriorityQueue.
+
+        @type self: SortedListPriorityQueue
+        @rtype: None
+        """
+        self._items = []
+
+    def remove(self):
+        """Remove and return the next item from this queue.
+
+        @type self: SortedListPriorityQueue
+        @rtype: object
+        """
+        return self._items.pop(0)
+
+    def is_empty(self):
+        """Return true iff this queue is empty.
+
+        @type self: SortedListPriorityQueue
+        @rtype: bool
+        """
+        return len(self._items) == 0
+
+    def add(self, item):
+        """Add <item> to this queue.
+
+        @type self: SortedListPriorityQueue
+        @type item: object
+        @rtype: None
+        """
+        if self.is_empty():
+            self._items.append(item)
+        else:
+            found = False
+            i = 0
+            while not found:
+                if item < self._items[i]:
+                    self._items.insert(i, item)
+                    found = True
+                elif item == self._items[i]:
+                    self._items.insert(i+1, item)
+                    found = True
+                else:
+                    if i == len(self._items) - 1:
+                        self._items.append(item)
+                        found = True
+                    else:
+                        i += 1
+
+
+def random_events(n, seed=0):
+    """Return a list of <n> JoinLine events with random timestamps.
+
+    Timestamps are drawn from a range of n // 4 values so that many
+    events share a timestamp and FIFO tie-breaking is exercised.
+
+    @type n: int
+    @type seed: int
+    @rtype: list[JoinLine]
+    """
+    rng = random.Random(seed)
+    high = max(n // 4, 1)
+    return [JoinLine(rng.randint(0, high), 'c' + str(i), rng.randint(1, 20))
+            for i in range(n)]
+
+
+def time_queue(queue_class, events):
+    """Return the seconds taken to add then remove all of <events>
+    using a new queue of type <queue_class>.
+
+    @type queue_class: type
+    @type events: list[Event]
+    @rtype: float
+    """
+    queue = queue_class()
+    start = time.perf_counter()
+    for event in events:
+        queue.add(event)
+    while not queue.is_empty():
+        queue.remove()
+    return time.perf_counter() - start
+
+
+def bench_queue(sizes, legacy_limit=10 ** 4):
+    """Compare the heap PriorityQueue with SortedListPriorityQueue.
+
+    Return one row per size with the seconds each queue took, and the
+    speedup of the heap queue. The legacy queue is quadratic, so it is
+    skipped (its time is None) for sizes above <legacy_limit>.
+
+    @type sizes: list[int]
+    @type legacy_limit: int
+    @rtype: list[dict[str, object]]
+    """
+    rows = []
+    for n in sizes:
+        events = random_events(n)
+        heap_time = time_queue(PriorityQueue, events)
+        if n <= legacy_limit:
+            legacy_time = time_queue(SortedListPriorityQueue, events)
+            speedup = legacy_time / heap_time
+        else:
+            legacy_time = None
+            speedup = None
+        rows.append({'events': n,
+                     'heap_seconds': heap_time,
+                     'legacy_seconds': legacy_time,
+                     'speedup': speedup})
+    return rows
+
+
+def print_queue_rows(rows):
+    """Print the rows returned by bench_queue as a table.
+
+    @type rows: list[dict[str, object]]
+    @rtype: None
+    """
+    print('{:>10} {:>12} {:>12} {:>9}'.format('events', 'heap (s)',
+                                             'legacy (s)', 'speedup'))
+    for row in rows:
+        if row['legacy_seconds'] is None:
+            legacy, speedup = 'skipped', '-'
+        else:
+            legacy = '{:.4f}'.format(row['legacy_seconds'])
+            speedup = '{:.1f}x'.format(row['speedup'])
+        print('{:>10} {:>12.4f} {:>12} {:>9}'.format(
+            row['events'], row['heap_seconds'], legacy, speedup))
+
+
+class DictCustomer:
+    """A Customer with a __dict__, the layout Customer had before it
+    used __slots__. Kept for comparison.
+    """
+    # === Public Attributes ===
+    # @type name: str
+    #     The name of customers.
+    #
+    # @type items: int
+    #     The number of items the customer has.
+
+    def __init__(self, name, items):
+        """Initialize a DictCustomer with name and num of items.
+
+        @type self: DictCustomer
+        @type name: str
+        @type items: int
+        @rtype: None
+        """
+        self.name = name
+        self.items = items
+
+
+class DictJoinLine:
+    """A JoinLine event with a __dict__, the layout events had before
+    they used __slots__. Kept for comparison.
+    """
+    # === Public Attributes ===
+    # @type timestamp: int
+    #    A timestamp for this event.
+    # @type name: str
+    #    The name of the customer.
+    # @type items: int
+    #    The number of items the customer has.
+
+    def __init__(self, timestamp, name, num_items):
+        """Initialize a DictJoinLine event.
+
+        @type self: DictJoinLine
+        @type timestamp: int
+        @type name: str
+        @type num_items: int
+        @rtype: None
+        """
+        self.timestamp = timestamp
+        self.name = name
+        self.items = num_items
+
+    def __lt__(self, other):
+        """Return True iff this event is less than <other>.
+
+        @type self: DictJoinLine
+        @type other: DictJoinLine
+        @rtype: bool
+        """
+        return self.timestamp < other.timestamp
+
+    def __eq__(self, other):
+        """Return whether this event is equal to <other>.
+
+        @type self: DictJoinLine
+        @type other: DictJoinLine
+        @rtype: bool
+        """
+        return self.timestamp == other.timestamp
+
+
+def bytes_per_item(build, count):
+    """Return the number of bytes allocated by calling <build>, divided
+    by <count>.
+
+    <build> takes no arguments and must return what it built, so that the
+    objects are kept alive until the allocation has been measured.
+
+    @type build: callable
+    @type count: int
+    @rtype: float
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+    return (after - before) / count
+
+
+def _customers(customer_class, names):
+    """Return a list of one <customer_class> object for each of <names>.
+
+    @type customer_class: type
+    @type names: list[str]
+    @rtype: list[object]
+    """
+    return [customer_class(name, 5) for name in names]
+
+
+def _queued_events(event_class, names):
+    """Return a PriorityQueue holding one <event_class> join event for
+    each of <names>.
+
+    @type event_class: type
+    @type names: list[str]
+    @rtype: PriorityQueue
+    """
+    queue = PriorityQueue()
+    for i in range(len(names)):
+        queue.add(event_class(i, names[i], 5))
+    return queue
+
+
+def make_store(config):
+    """Return a new GroceryStore with the configuration <config>.
+
+    @type config: dict[str, int]
+        A dictionary with the keys of a configuration file.
+    @rtype: GroceryStore
+    """
+    handle, filename = tempfile.mkstemp(suffix='.json')
+    with os.fdopen(handle, 'w') as file:
+        json.dump(config, file)
+    try:
+        return GroceryStore(filename)
+    finally:
+        os.remove(filename)
+
+
+def _busy_store(names):
+    """Return a GroceryStore with every customer in <names> in a line.
+
+    @type names: list[str]
+    @rtype: GroceryStore
+    """
+    store = make_store({'cashier_count': 100, 'express_count': 0,
+                        'self_serve_count': 0, 'line_capacity': len(names)})
+    for name in names:
+        store.join_line(name, 5)
+    return store
+
+
+def bench_memory(count):
+    """Measure the bytes used per customer and per queued event, with and
+    without __slots__.
+
+    Customer names are created before measuring, so the sizes only count
+    the objects that hold them. The in-flight figure is everything
+    GroceryStore allocates per customer in a line: the Customer, its deque
+    slot and its entry in the name index.
+
+    @type count: int
+    @rtype: dict[str, float]
+    """
+    names = ['c' + str(i) for i in range(count)]
+    return {
+        'customer_dict': bytes_per_item(
+            lambda: _customers(DictCustomer, names), count),
+        'customer_slots': bytes_per_item(
+            lambda: _customers(Customer, names), count),
+        'queued_event_dict': bytes_per_item(
+            lambda: _queued_events(DictJoinLine, names), count),
+        'queued_event_slots': bytes_per_item(
+            lambda: _queued_events(JoinLine, names), count),
+        'in_flight_customer': bytes_per_item(
+            lambda: _busy_store(names), count)
+    }
+
+
+def print_memory(sizes):
+    """Print the sizes returned by bench_memory.
+
+    @type sizes: dict[str, float]
+    @rtype: None
+    """
+    print('{:<24} {:>10} {:>10}'.format('bytes per', 'before', 'after'))
+    print('{:<24} {:>10.1f} {:>10.1f}'.format(
+        'Customer', sizes['customer_dict'], sizes['customer_slots']))
+    print('{:<24} {:>10.1f} {:>10.1f}'.format(
+        'queued JoinLine', sizes['queued_event_dict'],
+        sizes['queued_event_slots']))
+    print('{:<24} {:>10} {:>10.1f}'.format(
+        'in-flight customer', '-', sizes['in_flight_customer']))
+
+
+# The events file sizes and configuration files used by the suite.
+SUITE_SIZES = [10 ** 3, 10 ** 4, 10 ** 5]
+SUITE_CONFIGS = ['config_100_10.json', 'config_111_10.json', 'config1.json']
+
+
+def percentile(values, p):
+    """Return the nearest-rank <p>th percentile of <values>.
+
+    Precondition: <values> is sorted and not empty, and 0 < p <= 100.
+
+    >>> percentile([1, 2, 3, 4], 50)
+    2
+    >>> percentile([1, 2, 3, 4], 99)
+    4
+
+    @type values: list[float]
+    @type p: float
+    @rtype: float
+    """
+    rank = -(-p * len(values) // 100)
+    return values[int(rank) - 1]
+
+
+def time_calls(setup, call):
+    """Time every call of a benchmarked operation and return a result row.
+
+    <setup> takes no arguments and returns a list of argument tuples; it
+    is not timed. <call> is then called once with each tuple. The row has
+    the number of calls, calls per second, and the 50th, 95th and 99th
+    percentile time per call in microseconds. Its peak memory is the most
+    memory allocated by a second, untimed run of <setup> and the calls.
+
+    @type setup: callable
+    @type call: callable
+    @rtype: dict[str, float]
+    """
+    args_list = setup()
+    latencies = []
+    clock = time.perf_counter
+    gc.collect()
+    start = clock()
+    for args in args_list:
+        before = clock()
+        call(*args)
+        latencies.append(clock() - before)
+    total = clock() - start
+    latencies.sort()
+    del args_list
+    row = {'count': len(latencies),
+           'events_per_second': len(latencies) / total,
+           'p50_us': percentile(latencies, 50) * 10 ** 6,
+           'p95_us': percentile(latencies, 95) * 10 ** 6,
+           'p99_us': percentile(latencies, 99) * 10 ** 6}
+    row['peak_bytes'] = peak_memory(lambda: [call(*args) for args in setup()])
+    return row
+
+
+def peak_memory(work):
+    """Return the most memory, in bytes, allocated at once while calling
+    <work> with no arguments.
+
+    @type work: callable
+    @rtype: int
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        work()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_queue_add(n):
+    """Benchmark PriorityQueue.add on <n> random events.
+
+    @type n: int
+    @rtype: dict[str, float]
+    """
+    def setup():
+        queue = PriorityQueue()
+        return [(queue, event) for event in random_events(n)]
+    return time_calls(setup, PriorityQueue.add)
+
+
+def bench_queue_remove(n):
+    """Benchmark PriorityQueue.remove on a queue of <n> random events.
+
+    @type n: int
+    @rtype: dict[str, float]
+    """
+    def setup():
+        queue = PriorityQueue()
+        for event in random_events(n):
+            queue.add(event)
+        return [(queue,)] * n
+    return time_calls(setup, PriorityQueue.remove)
+
+
+def bench_join_line(n, config):
+    """Benchmark GroceryStore.join_line with <n> customers joining a store
+    with the configuration <config>.
+
+    @type n: int
+    @type config: dict[str, int]
+    @rtype: dict[str, float]
+    """
+    def setup():
+        store = make_store(config)
+        rng = random.Random(0)
+        return [(store, 'c' + str(i), rng.randint(1, 20)) for i in range(n)]
+    return time_calls(setup, GroceryStore.join_line)
+
+
+def bench_finish_checkout(n, config):
+    """Benchmark FinishCheckOut.do as <n> customers finish checking out
+    from the lines of a store with the configuration <config>.
+
+    @type n: int
+    @type config: dict[str, int]
+    @rtype: dict[str, float]
+    """
+    def setup():
+        store = make_store(config)
+        rng = random.Random(0)
+        # The names of the customers in each line, from front to back.
+        lines = {}
+        for i in range(n):
+            line_index = store.join_line('c' + str(i), rng.randint(1, 20))
+            lines.setdefault(line_index, []).append('c' + str(i))
+        # Take turns finishing the customer at the front of each line.
+        args_list = []
+        for place in range(max(len(names) for names in lines.values())):
+            for line_index in sorted(lines):
+                if place < len(lines[line_index]):
+                    name = lines[line_index][place]
+                    event = FinishCheckOut(len(args_list), name, line_index)
+                    args_list.append((event, store))
+        return args_list
+    return time_calls(setup, FinishCheckOut.do)
+
+
+def bench_run(event_file, config_file):
+    """Benchmark GroceryStoreSimulation.run on <event_file> with the store
+    in <config_file>.
+
+    Events per second counts the events in <event_file>.
+
+    @type event_file: str
+    @type config_file: str
+    @rtype: dict[str, float]
+    """
+    with open(event_file, 'r') as file:
+        count = sum(1 for _ in file)
+    gc.collect()
+    start = time.perf_counter()
+    GroceryStoreSimulation(config_file).run(event_file)
+    total = time.perf_counter() - start
+    peak = peak_memory(
+        lambda: GroceryStoreSimulation(config_file).run(event_file))
+    return {'count': count,
+            'events_per_second': count / total,
+            'seconds': total,
+            'peak_bytes': peak}
+
+
+def run_suite(sizes=None, config_files=None):
+    """Run every benchmark in the suite and return a report.
+
+    Each benchmark is run for each size in <sizes>, and the store
+    benchmarks once for each configuration in <config_files>. Events
+    files are generated with event_generator.write_events.
+
+    @type sizes: list[int] | None
+    @type config_files: list[str] | None
+    @rtype: dict[str, object]
+    """
+    if sizes is None:
+        sizes = SUITE_SIZES
+    if config_files is None:
+        config_files = SUITE_CONFIGS
+    results = []
+
+    def record(name, size, config_file, row):
+        row['benchmark'] = name
+        row['size'] = size
+        row['config'] = config_file
+        results.append(row)
+        print('{:<16} {:>8} {:<20} {:>14.0f}/s'.format(
+            name, size, config_file or '', row['events_per_second']))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            record('queue_add', size, None, bench_queue_add(size))
+            record('queue_remove', size, None, bench_queue_remove(size))
+            event_file = os.path.join(directory, str(size) + '.txt')
+            write_events(event_file, size)
+            for config_file in config_files:
+                with open(config_file, 'r') as file:
+                    config = json.load(file)
+                config['line_capacity'] = size
+                record('join_line', size, config_file,
+                       bench_join_line(size, config))
+                record('finish_checkout', size, config_file,
+                       bench_finish_checkout(size, config))
+                record('run', size, config_file,
+                       bench_run(event_file, config_file))
+    return {'commit': _git_commit(),
+            'python': platform.python_version(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'results': results}
+
+
+def compare_reports(old, new):
+    """Print how the events per second of each benchmark in report <old>
+    changed in report <new>.
+
+    @type old: dict[str, object]
+    @type new: dict[str, object]
+    @rtype: None
+    """
+    old_rows = {}
+    for row in old['results']:
+        old_rows[(row['benchmark'], row['size'], row['config'])] = row
+    print('{} -> {}'.format(old['commit'], new['commit']))
+    for row in new['results']:
+        key = (row['benchmark'], row['size'], row['config'])
+        if key in old_rows:
+            ratio = row['events_per_second'] / \
+                old_rows[key]['events_per_second']
+            print('{:<16} {:>8} {:<20} {:>7.2f}x'.format(
+                key[0], key[1], key[2] or '', ratio))
+
+
+def _git_commit():
+    """Return the current git commit hash, or None outside a git checkout.
+
+    @rtype: str | None
+    """
+    try:
+        output = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                         stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode().strip()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the simulation.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+    queue_parser = commands.add_parser('queue',
+                                       help='time the event queue')
+    queue_parser.add_argument('--sizes', type=int, nargs='+',
+                              default=[10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6],
+                              help='numbers of events to queue')
+    queue_parser.add_argument('--legacy-limit', type=int, default=10 ** 4,
+                              help='largest size to run the list-based '
+                                   'queue on')
+    memory_parser = commands.add_parser('memory',
+                                        help='measure bytes per object')
+    memory_parser.add_argument('--count', type=int, default=10 ** 5,
+                               help='number of objects to measure')
+    suite_parser = commands.add_parser('suite',
+                                       help='run the hot path benchmarks')
+    suite_parser.add_argument('--sizes', type=int, nargs='+',
+                              default=SUITE_SIZES,
+                              help='numbers of events or customers')
+    suite_parser.add_argument('--configs', nargs='+', default=SUITE_CONFIGS,
+                              help='store configuration files')
+    suite_parser.add_argument('--output',
+                              help='file to save the results to as JSON')
+    compare_parser = commands.add_parser('compare',
+                                         help='compare two suite results')
+    compare_parser.add_argument('old', help='results of the old commit')
+    compare_parser.add_argument('new', help='results of the new commit')
+    args = parser.parse_args()
+    if args.command == 'queue':
+        print_queue_rows(bench_queue(args.sizes, args.legacy_limit))
+    elif args.command == 'memory':
+        print_memory(bench_memory(args.count))
+    elif args.command == 'suite':
+        report = run_suite(args.sizes, args.configs)
+        if args.output is not None:
+            with open(args.output, 'w') as output:
+                json.dump(report, output, indent=2)
+    else:
+        with open(args.old, 'r') as old_file, \
+                open(args.new, 'r') as new_file:
+            compare_reports(json.load(old_file), json.load(new_file))
@@ -6,6 +6,7 @@ and Priority Queue data types.
 You are responsible for completing the 'add' method of
 PriorityQueue.
 """
+from heapq import heapify, heappop, heappush
 
 
 class Container:
@@ -57,12 +58,16 @@ class PriorityQueue(Container):
     All objects in the container must be of the same type.
     """
     # === Private Attributes ===
-    # @type _items: list
-    #     The items stored in the priority queue.
+    # @type _items: list[(object, int)]
+    #     A binary min-heap of (item, sequence number) pairs.
+    # @type _count: int
+    #     The sequence number that will be given to the next added item.
     #
     # === Representation Invariants ===
-    # _items is a sorted list, where the front item is the one with the
-    # highest priority.
+    # _items satisfies the heap property of the heapq module, so the front
+    # item _items[0] is the one with the highest priority.
+    # Sequence numbers are unique and increase with insertion order, so two
+    # items that compare equal are removed in the order they were added.
 
     def __init__(self):
         """Initialize an empty PriorityQueue.
@@ -71,6 +76,7 @@ class PriorityQueue(Container):
         @rtype: None
         """
         self._items = []
+        self._count = 0
 
     def remove(self):
         """Remove and return the next item from this PriorityQueue.
@@ -94,7 +100,7 @@ class PriorityQueue(Container):
         >>> pq.remove()
         'mona'
         """
-        return self._items.pop(0)
+        return heappop(self._items)[0]
 
     def is_empty(self):
         """
@@ -115,6 +121,9 @@ class PriorityQueue(Container):
     def add(self, item):
         """Add <item> to this PriorityQueue.
 
+        <item> is removed after any items already in the queue that
+        compare equal to it.
+
         @type self: PriorityQueue
         @type item: object
         @rtype: None
@@ -124,24 +133,243 @@ class PriorityQueue(Container):
         >>> pq.add('arju')
         >>> pq.add('mona')
         >>> pq.add('hat')
-        >>> pq
+        >>> [pq.remove() for _ in range(len(pq))]
+        ['arju', 'fred', 'hat', 'mona']
+        >>> from decimal import Decimal
+        >>> pq.add(Decimal('1'))
+        >>> pq.add(Decimal('1.0'))
+        >>> pq.add(Decimal('1.00'))
+        >>> [str(pq.remove()) for _ in range(len(pq))]
+        ['1', '1.0', '1.00']
+        """
+        heappush(self._items, (item, self._count))
+        self._count += 1
+
+    def add_all(self, items):
+        """Add every item of <items> to this PriorityQueue.
+
+        Items that compare equal are removed in the order they appear
+        in <items>, after any equal items already in the queue.
+        Rebuilding the heap costs O(n) instead of O(n log n) for
+        calling add on each item.
+
+        @type self: PriorityQueue
+        @type items: iterable
+        @rtype: None
+
+        >>> pq = PriorityQueue()
+        >>> pq.add('mona')
+        >>> pq.add_all(['fred', 'arju', 'hat'])
+        >>> [pq.remove() for _ in range(len(pq))]
         ['arju', 'fred', 'hat', 'mona']
         """
-        if self.is_empty():
-            self._items.append(item)
+        start = self._count
+        for item in items:
+            self._items.append((item, self._count))
+            self._count += 1
+        if self._count > start:
+            heapify(self._items)
+
+    def peek(self):
+        """Return the next item of this PriorityQueue without removing it.
+
+        Precondition: <self> should not be empty.
+
+        @type self: PriorityQueue
+        @rtype: object
+
+        >>> pq = PriorityQueue()
+        >>> pq.add('fred')
+        >>> pq.add('arju')
+        >>> pq.peek()
+        'arju'
+        >>> len(pq)
+        2
+        """
+        return self._items[0][0]
+
+    def __len__(self):
+        """Return the number of items in this PriorityQueue.
+
+        @type self: PriorityQueue
+        @rtype: int
+
+        >>> pq = PriorityQueue()
+        >>> len(pq)
+        0
+        >>> pq.add('fred')
+        >>> len(pq)
+        1
+        """
+        return len(self._items)
+
+
+class IndexedPriorityQueue:
+    """A priority queue of distinct keys whose priorities can be changed.
+
+    Each key in the queue has a priority, and peek returns the key with the
+    *HIGHEST* priority, i.e. the smallest priority value. Unlike
+    PriorityQueue, keys can be looked up, given a new priority or removed
+    from anywhere in the queue in O(log n) time.
+
+    All priorities in the queue must be comparable with each other, and
+    keys must be hashable.
+
+    >>> pq = IndexedPriorityQueue()
+    >>> pq.set_priority('fred', 3)
+    >>> pq.set_priority('arju', 1)
+    >>> pq.set_priority('mona', 2)
+    >>> pq.peek()
+    'arju'
+    >>> pq.set_priority('arju', 5)
+    >>> pq.peek()
+    'mona'
+    >>> pq.discard('mona')
+    >>> pq.peek()
+    'fred'
+    >>> len(pq)
+    2
+    """
+    # === Private Attributes ===
+    # @type _heap: list[(object, object)]
+    #     A binary min-heap of (priority, key) pairs.
+    # @type _positions: dict[object, int]
+    #     The index in _heap of each key in the queue.
+    #
+    # === Representation Invariants ===
+    # _heap[i][0] <= _heap[2 * i + 1][0] and
+    # _heap[i][0] <= _heap[2 * i + 2][0] whenever those indexes exist.
+    # _heap[_positions[key]][1] == key for every key in the queue.
+
+    def __init__(self):
+        """Initialize an empty IndexedPriorityQueue.
+
+        @type self: IndexedPriorityQueue
+        @rtype: None
+        """
+        self._heap = []
+        self._positions = {}
+
+    def is_empty(self):
+        """Return True iff this IndexedPriorityQueue is empty.
+
+        @type self: IndexedPriorityQueue
+        @rtype: bool
+        """
+        return len(self._heap) == 0
+
+    def __len__(self):
+        """Return the number of keys in this IndexedPriorityQueue.
+
+        @type self: IndexedPriorityQueue
+        @rtype: int
+        """
+        return len(self._heap)
+
+    def __contains__(self, key):
+        """Return True iff <key> is in this IndexedPriorityQueue.
+
+        @type self: IndexedPriorityQueue
+        @type key: object
+        @rtype: bool
+        """
+        return key in self._positions
+
+    def peek(self):
+        """Return the key with the highest priority without removing it.
+
+        Precondition: <self> should not be empty.
+
+        @type self: IndexedPriorityQueue
+        @rtype: object
+        """
+        return self._heap[0][1]
+
+    def set_priority(self, key, priority):
+        """Give <key> the priority <priority>, adding <key> to this
+        IndexedPriorityQueue if it is not already in it.
+
+        @type self: IndexedPriorityQueue
+        @type key: object
+        @type priority: object
+        @rtype: None
+        """
+        if key in self._positions:
+            i = self._positions[key]
+            old = self._heap[i][0]
+            self._heap[i] = (priority, key)
+            if priority < old:
+                self._sift_up(i)
+            else:
+                self._sift_down(i)
         else:
-            found = False
-            i = 0
-            while not found:
-                if item < self._items[i]:
-                    self._items.insert(i, item)
-                    found = True
-                elif item == self._items[i]:
-                    self._items.insert(i+1, item)
-                    found = True
-                else:
-                    if i == len(self._items) - 1:
-                        self._items.append(item)
-                        found = True
-                    else:
-                        i += 1
+            self._heap.append((priority, key))
+            self._positions[key] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+
+    def discard(self, key):
+        """Remove <key> from this IndexedPriorityQueue if it is in it.
+
+        @type self: IndexedPriorityQueue
+        @type key: object
+        @rtype: None
+        """
+        if key not in self._positions:
+            return
+        i = self._positions.pop(key)
+        last = self._heap.pop()
+        if i < len(self._heap):
+            old = self._heap[i][0]
+            self._heap[i] = last
+            self._positions[last[1]] = i
+            if last[0] < old:
+                self._sift_up(i)
+            else:
+                self._sift_down(i)
+
+    def _swap(self, i, j):
+        """Swap the entries at indexes <i> and <j> of the heap.
+
+        @type self: IndexedPriorityQueue
+        @type i: int
+        @type j: int
+        @rtype: None
+        """
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._positions[heap[i][1]] = i
+        self._positions[heap[j][1]] = j
+
+    def _sift_up(self, i):
+        """Move the entry at index <i> up until its parent is not larger.
+
+        @type self: IndexedPriorityQueue
+        @type i: int
+        @rtype: None
+        """
+        while i > 0:
+            parent = (i - 1) // 2
+            if self._heap[i][0] < self._heap[parent][0]:
+                self._swap(i, parent)
+                i = parent
+            else:
+                return
+
+    def _sift_down(self, i):
+        """Move the entry at index <i> down until no child is smaller.
+
+        @type self: IndexedPriorityQueue
+        @type i: int
+        @rtype: None
+        """
+        size = len(self._heap)
+        while True:
+            smallest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < size and \
+                        self._heap[child][0] < self._heap[smallest][0]:
+                    smallest = child
+            if smallest == i:
+                return
+            self._swap(i, smallest)
+            i = smallest
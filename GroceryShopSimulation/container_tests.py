@@ -0,0 +1,48 @@
+# Assignment 1 - Unit Tests for Containers
+#
+# CSC148 Fall 2015, University of Toronto
+# Instructor: David Liu
+# ---------------------------------------------
+import unittest
+from container import IndexedPriorityQueue
+
+
+class IndexedPriorityQueueTest(unittest.TestCase):
+    def _pop_all(self, pq):
+        """Return the keys of pq in the order peek gives them, emptying it.
+
+        @type self: IndexedPriorityQueueTest
+        @type pq: IndexedPriorityQueue
+        @rtype: list[object]
+        """
+        order = []
+        while not pq.is_empty():
+            key = pq.peek()
+            order.append(key)
+            pq.discard(key)
+        return order
+
+    def test_set_priority_and_discard(self):
+        pq = IndexedPriorityQueue()
+        for i, key in enumerate('abcdefg'):
+            pq.set_priority(key, i * 10)
+        # Move a key from the front of the queue to the back...
+        pq.set_priority('a', 65)
+        # ...and another one from the back to the front.
+        pq.set_priority('f', 5)
+        # Remove a key from the middle of the queue.
+        pq.discard('d')
+        self.assertNotIn('d', pq)
+        self.assertEqual(len(pq), 6)
+        self.assertEqual(self._pop_all(pq), ['f', 'b', 'c', 'e', 'g', 'a'])
+        self.assertEqual(len(pq), 0)
+
+    def test_discard_missing_key(self):
+        pq = IndexedPriorityQueue()
+        pq.set_priority('a', 1)
+        pq.discard('b')
+        self.assertEqual(self._pop_all(pq), ['a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
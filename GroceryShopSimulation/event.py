@@ -5,6 +5,8 @@ kinds of events in the simulation.
 """
 # Feel free to import classes and functions from
 # *your other files*, but remember not to import any external libraries.
+from heapq import heappop, heappush
+
 from store import GroceryStore
 
 
@@ -29,6 +31,10 @@ class Event:
         A timestamp for this event.
     """
 
+    # Events and their subclasses use __slots__ instead of a __dict__
+    # because a long simulation keeps a large number of them queued.
+    __slots__ = ('timestamp',)
+
     def __init__(self, timestamp):
         """Initialize an Event with a given timestamp.
 
@@ -185,6 +191,8 @@ class JoinLine(Event):
     # @type items: int
     #    The number of items the customer has.
 
+    __slots__ = ('name', 'items')
+
     def __init__(self, timestamp, name, num_items):
         """Initialize Join Line event with given timestamp, customer name
         and number of items.
@@ -238,6 +246,8 @@ class BeginCheckOut(Event):
     # @type line_index: int
     #     The index of the line that this event is happening.
 
+    __slots__ = ('name', 'items', 'line_index')
+
     def __init__(self, timestamp, name, items, line_index):
         """Initialize Begin Check Out with given timestamp, customer name,
         number of items,and index of the line that the customer joins
@@ -287,6 +297,8 @@ class FinishCheckOut(Event):
     # @type line: int
     #     The index of the line that this event is happening.
 
+    __slots__ = ('name', 'line')
+
     def __init__(self, timestamp, name, line):
         """Initialize Finish Check Out with given timestamp, customer name,
         and index of the line that the customer joins.
@@ -338,6 +350,8 @@ class CloseLine(Event):
     # @type line_index: int
     #     The index of the line that should be closed.
 
+    __slots__ = ('line_index',)
+
     def __init__(self, timestamp, line_index):
         """Initialize Close Line with given timestamp, and given index of line.
 
@@ -387,19 +401,81 @@ def create_event_list(filename):
     events = []
     with open(filename, 'r') as file:
         for line in file:
-            # Create a list of words in the line, e.g.
-            # ['60', 'Arrive', 'Bob', '5'].
-            tokens = line.split()
-            timestamp = int(tokens[0])
-            last = int(tokens[len(tokens) - 1])
-            if tokens[1] == 'Arrive':
-                event_element = JoinLine(timestamp, tokens[2], last)
-            else:
-                event_element = CloseLine(timestamp, last)
-            events.append(event_element)
+            events.append(parse_event(line))
     return events
 
 
+def parse_event(line):
+    """Return the Event described by one <line> of an events file.
+
+    >>> event = parse_event('60 Arrive Bob 5')
+    >>> event.timestamp, event.name, event.items
+    (60, 'Bob', 5)
+    >>> parse_event('70 Close 2').line_index
+    2
+
+    @type line: str
+    @rtype: Event
+    """
+    # Create a list of words in the line, e.g.
+    # ['60', 'Arrive', 'Bob', '5'].
+    tokens = line.split()
+    timestamp = int(tokens[0])
+    last = int(tokens[len(tokens) - 1])
+    if tokens[1] == 'Arrive':
+        return JoinLine(timestamp, tokens[2], last)
+    else:
+        return CloseLine(timestamp, last)
+
+
+# The number of events iter_events holds back to put a slightly
+# out-of-order events file back into timestamp order.
+REORDER_WINDOW = 1024
+
+
+def iter_events(filename, window=REORDER_WINDOW):
+    """Yield the Events in <filename> one at a time, in timestamp order.
+
+    The file is read lazily, so at most <window> + 1 events are held in
+    memory at once. An event may appear up to <window> lines later than
+    its place in timestamp order; it is moved back into place before it
+    is yielded. Events with the same timestamp keep their file order.
+    With a <window> of 0 the file must already be in timestamp order.
+
+    Raise a ValueError if an event is further out of order than
+    <window> allows.
+
+    Precondition: the file stored at <filename> is in the format specified
+    by the assignment handout. Blank lines are skipped.
+
+    @type filename: str
+    @type window: int
+    @rtype: generator[Event]
+    """
+    # Heap of (timestamp, line number, event); the line number keeps
+    # ties in file order and means events are never compared directly.
+    pending = []
+    # Timestamp of the latest event yielded so far.
+    latest = None
+    with open(filename, 'r') as file:
+        for line_number, line in enumerate(file, 1):
+            if line.strip() == '':
+                continue
+            event = parse_event(line)
+            if latest is not None and event.timestamp < latest:
+                raise ValueError(
+                    '{}:{}: event at time {} comes after an event at time {} '
+                    'that was already processed (reorder window is {} '
+                    'events)'.format(filename, line_number, event.timestamp,
+                                     latest, window))
+            heappush(pending, (event.timestamp, line_number, event))
+            if len(pending) > window:
+                latest, _, event = heappop(pending)
+                yield event
+    while len(pending) > 0:
+        yield heappop(pending)[2]
+
+
 if __name__ == '__main__':
     import doctest
 
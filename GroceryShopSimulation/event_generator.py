@@ -0,0 +1,218 @@
+"""Grocery Store Simulation - Event Generator
+
+This file writes synthetic events files, in the format read by
+event.create_event_list, for load-testing the simulation.
+
+Customers arrive as a Poisson process: the time between two arrivals is
+exponentially distributed, and timestamps are rounded down to whole time
+units. Each customer gets a number of items from a configurable
+distribution, and lines can be closed at scheduled times.
+
+The same seed always gives the same file. Events are written in chunks as
+they are generated, so files of any size can be written without holding
+them in memory.
+
+Run it from this directory, e.g.
+    python event_generator.py trace.txt --count 1000000 --seed 3
+    python event_generator.py trace.txt --count 1000 --items geometric \\
+        --mean-items 6 --close 200:0 400:1
+    python event_generator.py --canned medium
+"""
+import argparse
+import math
+import random
+
+
+# Events file sizes for repeatable benchmarks, by name. Each is written
+# with seed 0 and the default arrival rate and item distribution.
+CANNED_SIZES = {
+    'tiny': 10 ** 3,
+    'small': 10 ** 4,
+    'medium': 10 ** 5,
+    'large': 10 ** 6,
+    'huge': 10 ** 7,
+    'giant': 10 ** 8
+}
+
+# The number of lines written to the file at a time.
+CHUNK_SIZE = 10000
+
+
+def uniform_items(low, high):
+    """Return an item count distribution that picks a whole number from
+    <low> to <high> inclusive with equal probability.
+
+    A distribution is a function that takes a random.Random and returns a
+    number of items.
+
+    @type low: int
+    @type high: int
+    @rtype: callable
+    """
+    def items(rng):
+        return rng.randint(low, high)
+    return items
+
+
+def geometric_items(mean):
+    """Return an item count distribution that picks a number of items of
+    at least 1 from a geometric distribution with mean <mean>.
+
+    Most customers have a few items and a few have many, like real
+    shoppers.
+
+    Precondition: mean >= 1.
+
+    @type mean: float
+    @rtype: callable
+    """
+    if mean <= 1:
+        return uniform_items(1, 1)
+    log_miss = math.log(1 - 1 / mean)
+
+    def items(rng):
+        # Inverse transform sampling; 1 - random() is never 0.
+        return 1 + int(math.log(1 - rng.random()) / log_miss)
+    return items
+
+
+def iter_event_lines(count, rate=0.2, items=None, closes=None, seed=0):
+    """Yield the lines of a synthetic events file with <count> events.
+
+    Customers arrive at an average of <rate> per time unit. <closes> is a
+    list of (timestamp, line index) pairs, one for each Close event; they
+    count towards <count> if they happen before the last arrival, and are
+    left out otherwise. Lines are yielded in timestamp order, without a
+    trailing newline.
+
+    >>> lines = list(iter_event_lines(4, rate=1, closes=[(1, 0)], seed=2))
+    >>> len(lines)
+    4
+    >>> [line.split()[1] for line in lines].count('Close')
+    1
+
+    @type count: int
+    @type rate: float
+    @type items: callable | None
+        An item count distribution; by default uniform_items(1, 20).
+    @type closes: list[(int, int)] | None
+    @type seed: int
+    @rtype: generator[str]
+    """
+    rng = random.Random(seed)
+    if items is None:
+        items = uniform_items(1, 20)
+    if closes is None:
+        closes = []
+    closes = sorted(closes)
+    next_close = 0
+    time = 0.0
+    customer = 0
+    written = 0
+    while written < count:
+        time += rng.expovariate(rate)
+        timestamp = int(time)
+        while next_close < len(closes) and written < count and \
+                closes[next_close][0] <= timestamp:
+            close_time, line_index = closes[next_close]
+            yield str(close_time) + ' Close ' + str(line_index)
+            next_close += 1
+            written += 1
+        if written < count:
+            yield str(timestamp) + ' Arrive C' + str(customer) + ' ' + \
+                str(items(rng))
+            customer += 1
+            written += 1
+
+
+def write_events(filename, count, rate=0.2, items=None, closes=None, seed=0):
+    """Write a synthetic events file with <count> events to <filename>.
+
+    The arguments other than <filename> are as for iter_event_lines.
+
+    @type filename: str
+    @type count: int
+    @type rate: float
+    @type items: callable | None
+    @type closes: list[(int, int)] | None
+    @type seed: int
+    @rtype: None
+    """
+    with open(filename, 'w') as file:
+        chunk = []
+        for line in iter_event_lines(count, rate, items, closes, seed):
+            chunk.append(line)
+            if len(chunk) == CHUNK_SIZE:
+                chunk.append('')
+                file.write('\n'.join(chunk))
+                chunk = []
+        if len(chunk) > 0:
+            chunk.append('')
+            file.write('\n'.join(chunk))
+
+
+def write_canned(name, filename=None):
+    """Write the canned events file called <name> and return its filename.
+
+    By default the file is called 'events_<name>.txt'.
+
+    @type name: str
+        One of the keys of CANNED_SIZES.
+    @type filename: str | None
+    @rtype: str
+    """
+    if filename is None:
+        filename = 'events_' + name + '.txt'
+    write_events(filename, CANNED_SIZES[name])
+    return filename
+
+
+def _parse_close(text):
+    """Return the (timestamp, line index) pair written as 'TIME:LINE'.
+
+    @type text: str
+    @rtype: (int, int)
+    """
+    timestamp, line_index = text.split(':')
+    return int(timestamp), int(line_index)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Write a synthetic grocery store events file.')
+    parser.add_argument('filename', nargs='?',
+                        help='the file to write (default for --canned: '
+                             'events_<name>.txt)')
+    parser.add_argument('--canned', choices=sorted(CANNED_SIZES),
+                        help='write one of the canned benchmark files')
+    parser.add_argument('--count', type=int, default=1000,
+                        help='number of events')
+    parser.add_argument('--rate', type=float, default=0.2,
+                        help='average customer arrivals per time unit')
+    parser.add_argument('--items', choices=['uniform', 'geometric'],
+                        default='uniform',
+                        help='item count distribution')
+    parser.add_argument('--min-items', type=int, default=1,
+                        help='fewest items, for --items uniform')
+    parser.add_argument('--max-items', type=int, default=20,
+                        help='most items, for --items uniform')
+    parser.add_argument('--mean-items', type=float, default=8,
+                        help='mean items, for --items geometric')
+    parser.add_argument('--close', type=_parse_close, nargs='+', default=[],
+                        metavar='TIME:LINE',
+                        help='close line LINE at time TIME')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='random seed')
+    args = parser.parse_args()
+
+    if args.canned is not None:
+        print(write_canned(args.canned, args.filename))
+    elif args.filename is None:
+        parser.error('give a filename or --canned')
+    else:
+        if args.items == 'uniform':
+            distribution = uniform_items(args.min_items, args.max_items)
+        else:
+            distribution = geometric_items(args.mean_items)
+        write_events(args.filename, args.count, args.rate, distribution,
+                     args.close, args.seed)
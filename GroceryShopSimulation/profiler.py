@@ -0,0 +1,162 @@
+"""Grocery Store Simulation - Profiler
+
+This file contains the SimulationProfiler class, which records where the
+time goes in a run of GroceryStoreSimulation.
+
+Profiling is opt-in: pass a SimulationProfiler to GroceryStoreSimulation,
+e.g.
+    profiler = SimulationProfiler(filename='profile.json')
+    GroceryStoreSimulation('config.json', profiler).run('events.txt')
+    print(profiler.summary()['events']['JoinLine']['count'])
+"""
+import json
+import time
+
+from event import BeginCheckOut, FinishCheckOut
+
+
+class SimulationProfiler:
+    """A record of the work done by one simulation run.
+
+    For each type of Event, the profiler records how many events were
+    performed and the total and longest wall-clock time their do method
+    took. It also records the most events that were waiting in the
+    simulation's event queue at once, and how busy each line was.
+
+    When the run finishes, the summary is passed to <callback> and written
+    to <filename> as JSON, if they were given.
+    """
+    # === Private Attributes ===
+    # @type _callback: callable | None
+    #     Called with the summary when the run finishes.
+    # @type _filename: str | None
+    #     The JSON file the summary is written to when the run finishes.
+    # @type _events: dict[str, list[int | float]]
+    #     [count, total seconds, max seconds] for each Event class name.
+    # @type _max_queue_size: int
+    #     The most events that were in the event queue at once.
+    # @type _checkouts: dict[(int, str), int]
+    #     The time each customer who is checking out began, keyed by
+    #     (line index, customer name).
+    # @type _lines: dict[int, list[int]]
+    #     [customers served, time spent checking out customers] for each
+    #     line that has served a customer, keyed by line index.
+    # @type _start: float
+    #     The wall-clock time the profiler was created.
+    # @type _summary: dict[str, object] | None
+    #     The summary of the run, once it has finished.
+
+    def __init__(self, callback=None, filename=None):
+        """Initialize a SimulationProfiler.
+
+        @type self: SimulationProfiler
+        @type callback: callable | None
+            A function of one argument that the summary is passed to.
+        @type filename: str | None
+            The name of a file to write the summary to as JSON.
+        @rtype: None
+        """
+        self._callback = callback
+        self._filename = filename
+        self._events = {}
+        self._max_queue_size = 0
+        self._checkouts = {}
+        self._lines = {}
+        self._start = time.perf_counter()
+        self._summary = None
+
+    def record_event(self, event, seconds):
+        """Record that performing <event> took <seconds>.
+
+        @type self: SimulationProfiler
+        @type event: Event
+        @type seconds: float
+        @rtype: None
+        """
+        name = type(event).__name__
+        if name not in self._events:
+            self._events[name] = [0, 0.0, 0.0]
+        record = self._events[name]
+        record[0] += 1
+        record[1] += seconds
+        if seconds > record[2]:
+            record[2] = seconds
+
+        if type(event) == BeginCheckOut:
+            self._checkouts[(event.line_index, event.name)] = event.timestamp
+        elif type(event) == FinishCheckOut:
+            began = self._checkouts.pop((event.line, event.name), None)
+            if began is not None:
+                if event.line not in self._lines:
+                    self._lines[event.line] = [0, 0]
+                self._lines[event.line][0] += 1
+                self._lines[event.line][1] += event.timestamp - began
+
+    def record_queue_size(self, size):
+        """Record that <size> events are waiting in the event queue.
+
+        @type self: SimulationProfiler
+        @type size: int
+        @rtype: None
+        """
+        if size > self._max_queue_size:
+            self._max_queue_size = size
+
+    def finish(self, total_time):
+        """Record that the run has finished at simulated time <total_time>,
+        and export the summary.
+
+        @type self: SimulationProfiler
+        @type total_time: int
+        @rtype: None
+        """
+        events = {}
+        for name in sorted(self._events):
+            count, total, longest = self._events[name]
+            events[name] = {'count': count,
+                            'total_seconds': total,
+                            'max_seconds': longest,
+                            'mean_seconds': total / count}
+        lines = []
+        for line_index in sorted(self._lines):
+            served, busy = self._lines[line_index]
+            if total_time > 0:
+                utilization = busy / total_time
+            else:
+                utilization = 0.0
+            lines.append({'line': line_index,
+                          'customers_served': served,
+                          'busy_time': busy,
+                          'utilization': utilization})
+        self._summary = {'wall_seconds': time.perf_counter() - self._start,
+                         'total_time': total_time,
+                         'max_queue_size': self._max_queue_size,
+                         'events': events,
+                         'lines': lines}
+
+        if self._callback is not None:
+            self._callback(self._summary)
+        if self._filename is not None:
+            with open(self._filename, 'w') as file:
+                json.dump(self._summary, file, indent=2)
+
+    def summary(self):
+        """Return the summary of the run, or None if it has not finished.
+
+        The summary is a dictionary with:
+            'wall_seconds': the wall-clock seconds since the profiler
+                was created
+            'total_time': the simulated time the run finished at
+            'max_queue_size': the most events waiting in the queue at once
+            'events': for each Event class name, a dictionary with the
+                'count' of events performed and the 'total_seconds',
+                'max_seconds' and 'mean_seconds' their do method took
+            'lines': for each line that served a customer, a dictionary
+                with its 'line' index, 'customers_served', 'busy_time'
+                spent checking out customers, and 'utilization', the
+                fraction of 'total_time' it was busy
+
+        @type self: SimulationProfiler
+        @rtype: dict[str, object] | None
+        """
+        return self._summary
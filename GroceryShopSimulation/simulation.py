@@ -3,9 +3,11 @@
 This file should contain all of the classes necessary to model the different
 kinds of events in the simulation.
 """
+from time import perf_counter
+
 from container import PriorityQueue
 from store import GroceryStore
-from event import create_event_list, JoinLine, FinishCheckOut
+from event import iter_events, JoinLine, FinishCheckOut
 
 
 class GroceryStoreSimulation:
@@ -30,28 +32,48 @@ class GroceryStoreSimulation:
     #     sorting order.
     # @type _store: GroceryStore
     #     The grocery store associated with the simulation.
+    # @type _profiler: SimulationProfiler | None
+    #     Records the work done by run, if profiling is turned on.
 
-    def __init__(self, store_file):
+    def __init__(self, store_file, profiler=None):
         """Initialize a GroceryStoreSimulation from a file.
 
         @type store_file: str
             A file containing the configuration of the grocery store.
+        @type profiler: SimulationProfiler | None
+            A profiler to record the work done by run (see profiler.py).
+            By default nothing is recorded.
         @rtype: None
         """
         self._events = PriorityQueue()
         self._store = GroceryStore(store_file)
+        self._profiler = profiler
 
     def run(self, event_file):
         """Run the simulation on the events stored in <event_file>.
 
         Return a dictionary containing statistics of the simulation,
         according to the specifications in the assignment handout.
+        Besides 'max_wait', the dictionary also describes the distribution
+        of customer wait times with 'mean_wait', 'p50_wait', 'p95_wait'
+        and 'p99_wait' (see WaitTimeSummary).
 
         @type self: GroceryStoreSimulation
         @type event_file: str
             A filename referring to a raw list of events.
             Precondition: the event file is a valid list of events.
-        @rtype: dict[str, int]
+        @rtype: dict[str, int | float]
+        """
+        return self._run_events(iter_events(event_file))
+
+    def _run_events(self, file_events):
+        """Run the simulation on <file_events> and return its statistics,
+        as described in run.
+
+        @type self: GroceryStoreSimulation
+        @type file_events: iterator[Event]
+            The events that start the simulation, in timestamp order.
+        @rtype: dict[str, int | float]
         """
         # Initialize statistics
         stats = {
@@ -59,43 +81,157 @@ class GroceryStoreSimulation:
             'total_time': 0,
             'max_wait': -1
         }
-
-        initial_events = create_event_list(event_file)
-
-        for i in range(len(initial_events)):
-            self._events.add(initial_events[i])
-            if type(initial_events[i]) == JoinLine:
-                stats['num_customers'] += 1
-
-                # THE FOLLOWING CODE MAY SHOW SOME WARNINGS.
-                # (IF NOT, PLEASE IGNORE THIS COMMENT)
-                # PROFESSOR LIU TOLD ME THAT THESE WARNINGS ARE PROBLEMS
-                # WITH PyCharm ITSELF. SINCE WE ARE NOT ALLOWED TO CHANGE
-                # THE INTERFACE, PROF SAID WE CAN JUST IGNORE THEM. THANK YOU.
-
-        while not self._events.is_empty():
-            event = self._events.remove()
-            spawned_events = event.do(self._store)
+        waits = WaitTimeSummary()
+        profiler = self._profiler
+
+        # Arrival time of each customer who is still in the store,
+        # keyed by name.
+        arrivals = {}
+        # Events are taken from file_events as the simulation reaches them.
+        # The next one is kept out of self._events and wins ties against
+        # queued events, just as if every event in the file had been
+        # queued before the simulation started.
+        next_event = next(file_events, None)
+
+        while next_event is not None or not self._events.is_empty():
+            if next_event is not None and \
+                    (self._events.is_empty() or
+                     next_event <= self._events.peek()):
+                event = next_event
+                next_event = next(file_events, None)
+                if type(event) == JoinLine:
+                    stats['num_customers'] += 1
+                    arrivals[event.name] = event.timestamp
+            else:
+                event = self._events.remove()
+            if profiler is None:
+                spawned_events = event.do(self._store)
+            else:
+                start = perf_counter()
+                spawned_events = event.do(self._store)
+                profiler.record_event(event, perf_counter() - start)
             stats['total_time'] = event.timestamp
             # Calculate max_wait
-            if type(event) == FinishCheckOut:
-                end_time = event.timestamp
-                customer_name = event.name
-                for u in range(len(initial_events)):
-                    if type(initial_events[u]) == JoinLine:
-                        temp = initial_events[u]
-                        if customer_name == temp.name:
-                            start_time = temp.timestamp
-                            waited_time = end_time - start_time
-                            if waited_time > stats['max_wait']:
-                                stats['max_wait'] = waited_time
+            if type(event) == FinishCheckOut and event.name in arrivals:
+                waited_time = event.timestamp - arrivals.pop(event.name)
+                waits.add(waited_time)
+                if waited_time > stats['max_wait']:
+                    stats['max_wait'] = waited_time
 
             if spawned_events is not None:
                 for j in range(len(spawned_events)):
                     self._events.add(spawned_events[j])
+                if profiler is not None:
+                    profiler.record_queue_size(len(self._events))
+
+        stats['mean_wait'] = waits.mean()
+        stats['p50_wait'] = waits.percentile(50)
+        stats['p95_wait'] = waits.percentile(95)
+        stats['p99_wait'] = waits.percentile(99)
+        if profiler is not None:
+            profiler.finish(stats['total_time'])
         return stats
 
 
+def run_events(store_file, events):
+    """Run a new simulation of the store configured in <store_file> on
+    <events>, and return its statistics as described in
+    GroceryStoreSimulation.run.
+
+    Unlike GroceryStoreSimulation.run, this takes events that have
+    already been read, so one events file can be read once and simulated
+    many times. The events are not changed by the simulation.
+
+    @type store_file: str
+    @type events: iterable[Event]
+        Events in timestamp order, e.g. from event.iter_events.
+    @rtype: dict[str, int | float]
+    """
+    return GroceryStoreSimulation(store_file)._run_events(iter(events))
+
+
+class WaitTimeSummary:
+    """A running summary of the times customers waited in the store.
+
+    Wait times are integers, so a count of each distinct wait time is
+    enough to give exact percentiles. Memory grows with the number of
+    distinct wait times, not the number of customers.
+
+    >>> waits = WaitTimeSummary()
+    >>> waits.mean()
+    -1
+    >>> for wait in [4, 1, 3, 2, 10]:
+    ...     waits.add(wait)
+    >>> waits.mean()
+    4.0
+    >>> waits.percentile(50)
+    3
+    >>> waits.percentile(95)
+    10
+    """
+    # === Private Attributes ===
+    # @type _counts: dict[int, int]
+    #     The number of customers who waited for each wait time.
+    # @type _num: int
+    #     The number of wait times added.
+    # @type _total: int
+    #     The sum of all wait times added.
+
+    def __init__(self):
+        """Initialize an empty WaitTimeSummary.
+
+        @type self: WaitTimeSummary
+        @rtype: None
+        """
+        self._counts = {}
+        self._num = 0
+        self._total = 0
+
+    def add(self, wait):
+        """Record that a customer waited for <wait>.
+
+        @type self: WaitTimeSummary
+        @type wait: int
+        @rtype: None
+        """
+        self._counts[wait] = self._counts.get(wait, 0) + 1
+        self._num += 1
+        self._total += wait
+
+    def mean(self):
+        """Return the mean wait time, or -1 if nothing was added.
+
+        @type self: WaitTimeSummary
+        @rtype: float | int
+        """
+        if self._num == 0:
+            return -1
+        return self._total / self._num
+
+    def percentile(self, p):
+        """Return the <p>th percentile wait time, or -1 if nothing was
+        added.
+
+        This is the nearest-rank percentile: the smallest recorded wait
+        time that at least <p> percent of customers waited no longer than.
+
+        Precondition: 0 < p <= 100.
+
+        @type self: WaitTimeSummary
+        @type p: int | float
+        @rtype: int
+        """
+        if self._num == 0:
+            return -1
+        # Rank of the wanted wait time, i.e. ceil(p / 100 * self._num).
+        rank = -(-p * self._num // 100)
+        seen = 0
+        for wait in sorted(self._counts):
+            seen += self._counts[wait]
+            if seen >= rank:
+                return wait
+
+
 if __name__ == '__main__':
     sim = GroceryStoreSimulation('config1.json')
     final_stats = sim.run('events1.txt')
@@ -5,6 +5,9 @@ in a grocery store.
 """
 # This module is used to read in the data from a json configuration file.
 import json
+from collections import deque
+
+from container import IndexedPriorityQueue
 
 
 class GroceryStore:
@@ -17,8 +20,21 @@ class GroceryStore:
         The the maximum number of customers allowed in each line.
         All lines have the same capacity.
 
-    @type _line_list: list
+    @type _line_list: list[CheckoutLine]
         A list of lines for each checkout counter.
+
+    @type _customers: dict[str, (int, int)]
+        The index of the line each customer in a line is in, and the
+        customer's position in that line (see CheckoutLine), keyed by the
+        customer's name. Customer names must be unique among the customers
+        in the store.
+
+    @type _open_lines: IndexedPriorityQueue
+        The indexes of all open lines, prioritized by (length, index).
+
+    @type _open_regular_lines: IndexedPriorityQueue
+        The indexes of the open lines that are not express lines,
+        prioritized by (length, index).
     """
     def __init__(self, filename):
         """Initialize a GroceryStore from a configuration file <filename>.
@@ -34,6 +50,9 @@ class GroceryStore:
         # 'express_count', 'self_serve_count', and 'line_capacity'.
         self._capacity = config['line_capacity']
         self._line_list = []
+        self._customers = {}
+        self._open_lines = IndexedPriorityQueue()
+        self._open_regular_lines = IndexedPriorityQueue()
 
         cashier_num = config['cashier_count']
         express_num = config['express_count']
@@ -50,6 +69,7 @@ class GroceryStore:
             else:
                 count = SelfServe()
                 self._line_list.append(count)
+            self._update_line(count_id)
 
     def line_is_empty(self, index):
         """Indicate if a line is empty by giving the index of the line.
@@ -65,29 +85,32 @@ class GroceryStore:
         Customers join the line that has fewest people.
         However, customers can only join the express line if he/she
         has less than 8 items. The number of customers in the line
-        should not be more than line capacity.
+        should not be more than line capacity. Ties go to the line with
+        the smallest index, and if no line can take the customer they
+        join line 0.
+
+        Open lines are kept in priority queues by length, so choosing a
+        line takes O(log L) time for L lines.
 
         @type name: str
         @type num_items: int
         @rtype: int
             Return the index of the chosen line.
         """
+        if num_items < 8:
+            candidates = self._open_lines
+        else:
+            candidates = self._open_regular_lines
         chosen_line_index = 0
-        shortest_length = self._capacity
-        for line_index in range(len(self._line_list)):
-            if self._line_list[line_index].open:
-                sublist = self._line_list[line_index].customer_list
-                if num_items < 8:
-                    if len(sublist) < shortest_length:
-                        shortest_length = len(sublist)
-                        chosen_line_index = line_index
-                else:
-                    if len(sublist) < shortest_length:
-                        if not type(self._line_list[line_index]) == Express:
-                            shortest_length = len(sublist)
-                            chosen_line_index = line_index
-
-        self._line_list[chosen_line_index].add_customer(name, num_items)
+        if not candidates.is_empty():
+            shortest = candidates.peek()
+            if len(self._line_list[shortest].customer_list) < self._capacity:
+                chosen_line_index = shortest
+
+        position = self._line_list[chosen_line_index].add_customer(name,
+                                                                   num_items)
+        self._customers[name] = (chosen_line_index, position)
+        self._update_line(chosen_line_index)
         return chosen_line_index
 
     def spend_time(self, name, num_items):
@@ -100,13 +123,10 @@ class GroceryStore:
         @rtype: int
             The spent time during checkout.
         """
-        time = 0
-        for i in range(len(self._line_list)):
-            sub_list = self._line_list[i].customer_list
-            for j in range(len(sub_list)):
-                if name == sub_list[j].name:
-                    time = self._line_list[i].checkout_time(num_items)
-        return time
+        if name not in self._customers:
+            return 0
+        line_index = self._customers[name][0]
+        return self._line_list[line_index].checkout_time(num_items)
 
     def find_next_customer(self, name):
         """Determine whether there existing next customer in the line given the
@@ -118,14 +138,10 @@ class GroceryStore:
            Return false the customer is the last customer in the line.
            Return true if there are more customers in the line.
         """
-        for i in range(len(self._line_list)):
-            sub_list = self._line_list[i].customer_list
-            for j in range(len(sub_list)):
-                if name == sub_list[j].name:
-                    if j == len(sub_list) - 1:
-                        return False
-                    else:
-                        return True
+        if name not in self._customers:
+            return False
+        line, index = self._locate(name)
+        return index < len(line.customer_list) - 1
 
     def find_next_customer_name(self, name):
         """Find the name of the next customer given current customer name.
@@ -133,11 +149,8 @@ class GroceryStore:
         @type name: str
         @rtype: str
         """
-        for i in range(len(self._line_list)):
-            sub_list = self._line_list[i].customer_list
-            for j in range(len(sub_list)):
-                if name == sub_list[j].name:
-                    return self._line_list[i].customer_list[j+1].name
+        line, index = self._locate(name)
+        return line.customer_list[index + 1].name
 
     def find_next_customer_items(self, name):
         """Find the number of items the next customer has
@@ -146,11 +159,8 @@ class GroceryStore:
         @type name: str
         @rtype: int
         """
-        for i in range(len(self._line_list)):
-            sub_list = self._line_list[i].customer_list
-            for j in range(len(sub_list)):
-                if name == sub_list[j].name:
-                    return self._line_list[i].customer_list[j+1].items
+        line, index = self._locate(name)
+        return line.customer_list[index + 1].items
 
     def leave_store(self, line_index):
         """Remove the customer from list after the customer has checked out
@@ -160,7 +170,10 @@ class GroceryStore:
             The index of the line where the customer checked out
         @rtype: None
         """
-        self._line_list[line_index].remove_customer(0)
+        line = self._line_list[line_index]
+        del self._customers[line.customer_list[0].name]
+        line.remove_customer(0)
+        self._update_line(line_index)
 
     def close_line(self, line_index):
         """Close the line given its index.
@@ -169,12 +182,14 @@ class GroceryStore:
         @rtype: None
         """
         self._line_list[line_index].open = False
+        self._open_lines.discard(line_index)
+        self._open_regular_lines.discard(line_index)
 
     def get_customer_list(self, line_index):
         """Get the list of customer line by its index.
 
         @type line_index: int
-        @rtype: list
+        @rtype: deque[Customer]
 
         """
         return self._line_list[line_index].customer_list
@@ -182,142 +197,161 @@ class GroceryStore:
     def leave_line(self, name):
         """To remove a customer from a line after the line is closed
 
+        Customers leave a closed line from the back, which takes O(1).
+        Removing a customer from the middle of a line is O(n) because
+        everyone behind them moves up.
+
         @type name: str
         @rtype: None
         """
-        for i in range(len(self._line_list)):
-            sublist = self._line_list[i].customer_list
-            for j in range(len(sublist)):
-                if name == sublist[j].name:
-                    self._line_list[i].remove_customer(j)
+        if name not in self._customers:
+            return
+        line, index = self._locate(name)
+        line_index = self._customers.pop(name)[0]
+        line.remove_customer(index)
+        self._update_line(line_index)
+        if index > 0:
+            # Everyone who was behind the customer moves up one place.
+            for i in range(index, len(line.customer_list)):
+                customer = line.customer_list[i]
+                self._customers[customer.name] = (line_index, line.served + i)
+
+    def _update_line(self, line_index):
+        """Record the current length of the line at <line_index> in the
+        queues of open lines.
+
+        Must be called whenever a customer joins or leaves an open line.
+
+        @type line_index: int
+        @rtype: None
+        """
+        line = self._line_list[line_index]
+        if line.open:
+            priority = (len(line.customer_list), line_index)
+            self._open_lines.set_priority(line_index, priority)
+            if not type(line) == Express:
+                self._open_regular_lines.set_priority(line_index, priority)
 
+    def _locate(self, name):
+        """Return the line of the customer called <name> and the customer's
+        index in that line.
 
-class Cashier:
-    """A cashier count in the store.
+        Precondition: a customer called <name> is in a line.
+
+        @type name: str
+        @rtype: (CheckoutLine, int)
+        """
+        line_index, position = self._customers[name]
+        line = self._line_list[line_index]
+        return line, position - line.served
+
+
+class CheckoutLine:
+    """A checkout line in the store.
+
+    This is an abstract class. Only child classes should be instantiated.
     """
 
     # === Public Attributes ===
-    # @type customer_list: list
-    #     A list of customers for the cashier counter.
+    # @type customer_list: deque[Customer]
+    #     The customers in the line, from front to back.
     #
     # @type open: bool
     #     Determine whether the counter is closed or open.
+    #
+    # @type served: int
+    #     The number of customers who have left from the front of the line.
+    #     A customer's position in the line, counted from the first
+    #     customer who ever joined it, minus <served> is the customer's
+    #     index in <customer_list>.
 
     def __init__(self):
-        """Initialize the status of cashier count.
+        """Initialize the status of the checkout line.
 
-        @type self: Cashier
+        @type self: CheckoutLine
         @rtype: None
         """
-        self.customer_list = []
+        self.customer_list = deque()
         self.open = True
+        self.served = 0
 
     @staticmethod
     def checkout_time(items):
-        """Calculate the time a customer need to check out by a cashier count
+        """Calculate the time a customer need to check out at this line
         with certain number of items.
 
         @type items: int
         @rtype: int
             The time need during checkout.
         """
-        time = items + 7
-        return time
+        raise NotImplementedError
 
     def add_customer(self, name, items):
-        """Add a customer in the line to cashier given the number of items
+        """Add a customer to the back of the line given the number of items
         and his/her name.
 
+        Return the position of the new customer in the line.
+
         @type name:  str
         @type items: int
-        @rtype: None
+        @rtype: int
         """
         new_customer = Customer(name, items)
         self.customer_list.append(new_customer)
+        return self.served + len(self.customer_list) - 1
 
     def remove_customer(self, index):
-        """Remove a customer from the cashier line given the index of the line.
+        """Remove a customer from the line given the index of the customer.
 
         @type index: int
-            The index of the cashier line
+            The index of the customer in the line
         @rtype: None
         """
-        self.customer_list.pop(index)
+        if index == 0:
+            self.customer_list.popleft()
+            self.served += 1
+        else:
+            del self.customer_list[index]
 
 
-class Express:
-    """A express count in the store.
+class Cashier(CheckoutLine):
+    """A cashier count in the store.
     """
 
-    # === Public Attributes ===
-    # @type customer_list: list
-    #     A list of customers for the express counter.
-    #
-    # @type open: bool
-    #     Determine whether the counter is closed or open.
-
-    def __init__(self):
-        """Initialize the status of express count.
-
-        @type self: Express
-        @rtype: None
-        """
-        self.customer_list = []
-        self.open = True
-
     @staticmethod
     def checkout_time(items):
-        """Calculate the time a customer need to check out by an express count
+        """Calculate the time a customer need to check out by a cashier count
         with certain number of items.
 
         @type items: int
         @rtype: int
             The time need during checkout.
         """
-        time = items + 4
+        time = items + 7
         return time
 
-    def add_customer(self, name, items):
-        """Add a customer in the line to express count given the number
-        of items and his/her name.
 
-        @type name:  str
-        @type items: int
-        @rtype: None
-        """
-        new_customer = Customer(name, items)
-        self.customer_list.append(new_customer)
+class Express(CheckoutLine):
+    """A express count in the store.
+    """
 
-    def remove_customer(self, index):
-        """Remove a customer from the express line given the index of the line.
+    @staticmethod
+    def checkout_time(items):
+        """Calculate the time a customer need to check out by an express count
+        with certain number of items.
 
-        @type index: int
-            The index of the express line
-        @rtype: None
+        @type items: int
+        @rtype: int
+            The time need during checkout.
         """
-        self.customer_list.pop(index)
+        time = items + 4
+        return time
 
 
-class SelfServe:
+class SelfServe(CheckoutLine):
     """A express count in the store.
     """
 
-    # === Public Attributes ===
-    # @type customer_list: list
-    #     A list of customers for the self-serve counter.
-    #
-    # @type open: bool
-    #     Determine whether the counter is closed or open.
-
-    def __init__(self):
-        """Initialize the status of self-serve count.
-
-        @type self: SelfServe
-        @rtype: None
-        """
-        self.customer_list = []
-        self.open = True
-
     @staticmethod
     def checkout_time(items):
         """Calculate the time a customer need to check out by a self-serve
@@ -330,27 +364,6 @@ class SelfServe:
         time = 2 * items + 1
         return time
 
-    def add_customer(self, name, items):
-        """Add a customer in the line to self-serve count given the number
-        of items and his/her name.
-
-        @type name:  str
-        @type items: int
-        @rtype: None
-        """
-        new_customer = Customer(name, items)
-        self.customer_list.append(new_customer)
-
-    def remove_customer(self, index):
-        """Remove a customer from the self-serve line given the
-        index of the line.
-
-        @type index: int
-            The index of the self-serve line
-        @rtype: None
-        """
-        self.customer_list.pop(index)
-
 
 class Customer:
     """A Customer in the store.
@@ -362,6 +375,10 @@ class Customer:
     # @type items: int
     #     The number of items the customer has.
 
+    # Every customer in a line has a Customer object, so they use
+    # __slots__ instead of a __dict__.
+    __slots__ = ('name', 'items')
+
     def __init__(self, name, items):
         """Initialize the information of a customer with name and num of items.
 
@@ -0,0 +1,209 @@
+"""Grocery Store Simulation - Parameter Sweeps
+
+This file runs one events file against many grocery store configurations
+and collects the statistics of each run into a table.
+
+The events file is read once. Configurations are simulated in parallel on
+a pool of worker processes. Where the 'fork' start method is available,
+the workers inherit the parsed events from this process instead of being
+sent a copy.
+
+Run it from this directory, e.g.
+    python sweep.py events.txt --configs config_001_10.json config_111_10.json
+    python sweep.py events.txt --cashiers 0 1 2 --express 0 1 \\
+        --self-serve 0 1 --capacity 5 10
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import tempfile
+
+from event import iter_events
+from simulation import run_events
+
+
+# The keys of a grocery store configuration, in the order they are shown.
+CONFIG_KEYS = ['cashier_count', 'express_count', 'self_serve_count',
+               'line_capacity']
+
+# The statistics shown for each configuration, in order.
+STAT_KEYS = ['num_customers', 'total_time', 'max_wait', 'mean_wait',
+             'p50_wait', 'p95_wait', 'p99_wait']
+
+# The events being simulated by this process. Set by _share_events before
+# any simulation runs, so that forked workers inherit it.
+_events = []
+
+
+def config_grid(cashier_counts, express_counts, self_serve_counts,
+                line_capacities):
+    """Return every combination of the given numbers of lines and line
+    capacities as a list of configurations.
+
+    Combinations without any lines are left out.
+
+    >>> grid = config_grid([0, 1], [0, 1], [1], [10])
+    >>> len(grid)
+    4
+    >>> grid[0]['cashier_count'], grid[0]['express_count']
+    (0, 0)
+
+    @type cashier_counts: list[int]
+    @type express_counts: list[int]
+    @type self_serve_counts: list[int]
+    @type line_capacities: list[int]
+    @rtype: list[dict[str, int]]
+    """
+    configs = []
+    for values in itertools.product(cashier_counts, express_counts,
+                                    self_serve_counts, line_capacities):
+        config = dict(zip(CONFIG_KEYS, values))
+        if config['cashier_count'] + config['express_count'] + \
+                config['self_serve_count'] > 0:
+            configs.append(config)
+    return configs
+
+
+def sweep(configs, event_file, processes=None):
+    """Simulate <event_file> on each of <configs> and return one row per
+    configuration, in the same order as <configs>.
+
+    Each configuration is either the name of a configuration file or a
+    dictionary with the same keys. Each row is a dictionary with the
+    configuration's keys and the statistics returned by
+    GroceryStoreSimulation.run.
+
+    <processes> is the number of worker processes to use. By default there
+    is one per CPU. With 1, every simulation runs in this process.
+
+    @type configs: list[str | dict[str, int]]
+    @type event_file: str
+    @type processes: int | None
+    @rtype: list[dict[str, int | float]]
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        config_files = []
+        config_dicts = []
+        for i in range(len(configs)):
+            if isinstance(configs[i], str):
+                filename = configs[i]
+                with open(filename, 'r') as file:
+                    config_dicts.append(json.load(file))
+            else:
+                filename = os.path.join(directory, str(i) + '.json')
+                with open(filename, 'w') as file:
+                    json.dump(configs[i], file)
+                config_dicts.append(configs[i])
+            config_files.append(filename)
+
+        events = list(iter_events(event_file))
+        if processes == 1:
+            _share_events(events)
+            results = [_run_config(filename) for filename in config_files]
+        else:
+            results = _run_in_pool(events, config_files, processes)
+
+    rows = []
+    for i in range(len(configs)):
+        row = {}
+        for key in CONFIG_KEYS:
+            row[key] = config_dicts[i][key]
+        row.update(results[i])
+        rows.append(row)
+    return rows
+
+
+def print_rows(rows):
+    """Print the rows returned by sweep as a table.
+
+    @type rows: list[dict[str, int | float]]
+    @rtype: None
+    """
+    headers = ['cashier', 'express', 'self', 'cap'] + \
+        [key.replace('num_customers', 'customers') for key in STAT_KEYS]
+    print(' '.join('{:>10}'.format(header) for header in headers))
+    for row in rows:
+        cells = []
+        for key in CONFIG_KEYS + STAT_KEYS:
+            if isinstance(row[key], float):
+                cells.append('{:>10.2f}'.format(row[key]))
+            else:
+                cells.append('{:>10}'.format(row[key]))
+        print(' '.join(cells))
+
+
+# ----------------------------------------------------------------------------
+# Helpers for running simulations in worker processes
+# ----------------------------------------------------------------------------
+
+def _share_events(events):
+    """Make <events> the events simulated by _run_config in this process.
+
+    @type events: list[Event]
+    @rtype: None
+    """
+    global _events
+    _events = events
+
+
+def _run_config(config_file):
+    """Return the statistics of simulating the shared events on the store
+    configured in <config_file>.
+
+    @type config_file: str
+    @rtype: dict[str, int | float]
+    """
+    return run_events(config_file, _events)
+
+
+def _run_in_pool(events, config_files, processes):
+    """Return the statistics of simulating <events> on each of
+    <config_files>, using a pool of <processes> worker processes.
+
+    @type events: list[Event]
+    @type config_files: list[str]
+    @type processes: int | None
+    @rtype: list[dict[str, int | float]]
+    """
+    if 'fork' in multiprocessing.get_all_start_methods():
+        # Forked workers see _events without it being pickled.
+        _share_events(events)
+        context = multiprocessing.get_context('fork')
+        pool = context.Pool(processes)
+    else:
+        # Each worker gets one copy of the events when it starts.
+        pool = multiprocessing.Pool(processes, _share_events, (events,))
+    with pool:
+        # One configuration at a time, so a slow one does not hold up
+        # others that were sent to the same worker.
+        return pool.map(_run_config, config_files, chunksize=1)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Simulate an events file on many store configurations.')
+    parser.add_argument('event_file', help='the events file to simulate')
+    parser.add_argument('--configs', nargs='+', default=[],
+                        help='configuration files to simulate')
+    parser.add_argument('--cashiers', type=int, nargs='+',
+                        help='numbers of cashier lines for a grid')
+    parser.add_argument('--express', type=int, nargs='+', default=[0],
+                        help='numbers of express lines for a grid')
+    parser.add_argument('--self-serve', type=int, nargs='+', default=[0],
+                        help='numbers of self-serve lines for a grid')
+    parser.add_argument('--capacity', type=int, nargs='+', default=[10],
+                        help='line capacities for a grid')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='number of worker processes (default: one '
+                             'per CPU)')
+    args = parser.parse_args()
+
+    all_configs = list(args.configs)
+    if args.cashiers is not None:
+        all_configs.extend(config_grid(args.cashiers, args.express,
+                                       args.self_serve, args.capacity))
+    if len(all_configs) == 0:
+        parser.error('give --configs or a grid with --cashiers')
+    print_rows(sweep(all_configs, args.event_file, args.processes))
@@ -6,7 +6,8 @@
 """Module containing the Controller class."""
 from view import TextView, WebView
 from puzzle import Puzzle
-from solver import solve, solve_complete, hint_by_depth
+from solver import solve, solve_complete, hint_by_depth, hint_by_time, \
+    solve_portfolio, split_search, TIMED_OUT
 
 
 class Controller:
@@ -18,40 +19,63 @@ class Controller:
     # === Private Attributes ===
     # @type _puzzle: Puzzle
     #     The puzzle associated with this game controller
-    # @type _view: View
-    #     The view associated with this game controller
+    # @type _view: View | None
+    #     The view associated with this game controller, or None if it has
+    #     no view
     # @type _data: StateTree
     #     The tree that stores all the state data associated with the game
     # @type _index: [int, int]
     #     The index that labels every state data that is stored in the data
     # @type _undo: bool
     #     The indicator that shows if the previous command is :UNDO or not
+    # @type _solve_timeout: float | None
+    #     The seconds :SOLVE may take, or None if it may take any time
+    # @type _hint_budget: float | None
+    #     The milliseconds :HINT may take, or None if it may take any time
 
-    def __init__(self, puzzle, mode='text'):
+    def __init__(self, puzzle, mode='text', solve_timeout=None,
+                 hint_budget=None):
         """Create a new controller.
 
         <mode> is either 'text' or 'web', representing the type of view
-        to use.
+        to use, or None for no view, in which case the game is not started
+        and actions can be run with act.
 
         By default, <mode> has a value of 'text'.
 
+        If <solve_timeout> is given, :SOLVE searches parts of the puzzle
+        in parallel (see solver.solve_portfolio) and gives up after
+        <solve_timeout> seconds. Splitting the puzzle into parts (see
+        solver.split_search) explores its first few moves beforehand, and
+        that is not timed.
+
+        If <hint_budget> is given, :HINT searches for at most
+        <hint_budget> milliseconds (see to_hint).
+
         @type puzzle: Puzzle
-        @type mode: str
+        @type mode: str | None
+        @type solve_timeout: float | None
+        @type hint_budget: float | None
         @rtype: None
         """
         self._puzzle = puzzle
         self._data = StateTree(puzzle)     # with index [0, 0]
         self._index = [0, 0]
         self._undo = False
+        self._solve_timeout = solve_timeout
+        self._hint_budget = hint_budget
         if mode == 'text':
             self._view = TextView(self)
         elif mode == 'web':
             self._view = WebView(self)
+        elif mode is None:
+            self._view = None
         else:
             raise ValueError()
 
         # Start the game.
-        self._view.run()
+        if self._view is not None:
+            self._view.run()
 
     def state(self):
         """Return a string representation of the current puzzle state.
@@ -127,7 +151,15 @@ class Controller:
 
         @rtype: tuple
         """
-        result = solve(self._puzzle)
+        if self._solve_timeout is None:
+            result = solve(self._puzzle)
+        else:
+            result, status = solve_portfolio(split_search(self._puzzle),
+                                             self._solve_timeout)
+            if status == TIMED_OUT:
+                message = 'No solution found within {} seconds.'.format(
+                    self._solve_timeout)
+                return (message, False)
         if result is None:
             message = 'The puzzle is unsolvable from the current state'
             return (message, True)
@@ -175,11 +207,20 @@ class Controller:
     def to_hint(self, action):
         """ To give hint of the puzzle at current state.
 
+        The action is ':HINT n', for a hint within n moves, or
+        ':HINT n ms', to search for at most ms milliseconds. If the
+        controller has a hint budget, ':HINT n' and ':HINT' (with no
+        limit on the moves) search for at most that long. A search that
+        runs out of time gives the best hint found so far, and how many
+        moves ahead it searched.
+
         @type action: str
         @rtype: tuple
         """
         typed = action.split()
-        if len(typed) == 2:
+        if len(typed) == 1 and self._hint_budget is not None:
+            return self._timed_hint(None, self._hint_budget)
+        if len(typed) == 2 or len(typed) == 3:
             try:
                 n = int(typed[1])
             except ValueError:
@@ -188,6 +229,18 @@ class Controller:
             if n < 1:
                 message = 'Please type a positive number!'
                 return (message, False)
+            if len(typed) == 3:
+                try:
+                    budget = float(typed[2])
+                except ValueError:
+                    message = 'Please type the number of milliseconds!'
+                    return (message, False)
+                if budget <= 0:
+                    message = 'Please type a positive number!'
+                    return (message, False)
+                return self._timed_hint(n, budget)
+            elif self._hint_budget is not None:
+                return self._timed_hint(n, self._hint_budget)
             else:
                 hint = hint_by_depth(self._puzzle, n)
                 return (hint, False)
@@ -195,6 +248,22 @@ class Controller:
             message = 'Please type the number of moves!'
             return (message, False)
 
+    def _timed_hint(self, n, budget):
+        """ To give the best hint of the puzzle at current state found
+        within n moves (any number of moves if n is None) and budget
+        milliseconds.
+
+        @type n: int | None
+        @type budget: float
+        @rtype: tuple
+        """
+        hint, depth = hint_by_time(self._puzzle, budget, n)
+        if depth == 0:
+            return (hint, False)
+        message = '{} (searched {} move{} ahead)'.format(
+            hint, depth, '' if depth == 1 else 's')
+        return (message, False)
+
     def to_react(self, action):
         """ To change the puzzle state according to the user's command.
 
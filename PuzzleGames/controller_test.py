@@ -17,7 +17,10 @@
 # you may share the outputs of these tests with your classmates.
 # ---------------------------------------------
 from controller import Controller
+from sudoku_puzzle import SudokuPuzzle
+from puzzle_test_helpers import SumPuzzle
 import sys
+import unittest
 from io import StringIO
 
 
@@ -57,8 +60,63 @@ def run_controller(puzzle, commands, filename=''):
         with open(filename, 'w') as result_file:
             result_file.writelines(messages)
 
+
+class ControllerTest(unittest.TestCase):
+    def setUp(self):
+        # (1, 2) and (2, 1) must both be 'A'.
+        self.puzzle = SudokuPuzzle([['A', 'B', 'C', 'D'],
+                                    ['C', 'D', '', 'B'],
+                                    ['B', '', 'D', 'C'],
+                                    ['D', 'C', 'B', 'A']])
+
+    def test_hint(self):
+        controller = Controller(self.puzzle, None)
+        self.assertEqual(controller.act(':HINT 1'), ('(1, 2) -> A', False))
+
+    def test_hint_bad_input(self):
+        controller = Controller(self.puzzle, None)
+        moves = ('Please type the number of moves!', False)
+        positive = ('Please type a positive number!', False)
+        self.assertEqual(controller.act(':HINT'), moves)
+        self.assertEqual(controller.act(':HINT x'), moves)
+        self.assertEqual(controller.act(':HINT 1 2 3'), moves)
+        self.assertEqual(controller.act(':HINT 0'), positive)
+        self.assertEqual(controller.act(':HINT 3 x'),
+                         ('Please type the number of milliseconds!', False))
+        self.assertEqual(controller.act(':HINT 3 -1'), positive)
+        self.assertEqual(controller.act(':HINT 3 0'), positive)
+
+    def test_hint_milliseconds(self):
+        controller = Controller(self.puzzle, None)
+        self.assertEqual(controller.act(':HINT 3 1000'),
+                         ('(1, 2) -> A (searched 2 moves ahead)', False))
+        self.assertEqual(controller.act(':HINT 1 1000'),
+                         ('(1, 2) -> A (searched 1 move ahead)', False))
+
+    def test_hint_budget(self):
+        controller = Controller(self.puzzle, None, hint_budget=1000)
+        self.assertEqual(controller.act(':HINT'),
+                         ('(1, 2) -> A (searched 2 moves ahead)', False))
+        self.assertEqual(controller.act(':HINT 1'),
+                         ('(1, 2) -> A (searched 1 move ahead)', False))
+        controller.act('(1, 2) -> A')
+        controller.act('(2, 1) -> A')
+        self.assertEqual(controller.act(':HINT'),
+                         ('Already at a solution!', False))
+
+    def test_solve_timeout(self):
+        controller = Controller(self.puzzle, None, solve_timeout=60)
+        solved, ended = controller.act(':SOLVE')
+        self.assertTrue(ended)
+        self.assertIn('2|BA|DC', solved)
+        # Adding 1 at a time takes far too long.
+        controller = Controller(SumPuzzle(0, 10 ** 9), None,
+                                solve_timeout=0.2)
+        self.assertEqual(controller.act(':SOLVE'),
+                         ('No solution found within 0.2 seconds.', False))
+
+
 if __name__ == '__main__':
-    from sudoku_puzzle import SudokuPuzzle
     from word_ladder_puzzle import WordLadderPuzzle
     # s = SudokuPuzzle([['A', 'B', '', 'D'],
     #                   ['C', 'D', '', 'B'],
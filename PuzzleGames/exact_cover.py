@@ -0,0 +1,256 @@
+# Assignment 2 - Puzzle Game
+#
+# CSC148 Fall 2015, University of Toronto
+# Instructor: David Liu
+# ---------------------------------------------
+"""Exact cover module.
+
+An exact cover problem has a set of columns (constraints) and a set of
+rows (choices), each of which covers some of the columns. A solution is a
+set of rows that covers every column exactly once.
+
+ExactCover solves these with Knuth's Algorithm X, using Dancing Links:
+the rows and columns are a grid of doubly linked nodes, so covering and
+uncovering a column only relinks its neighbours and costs no copying.
+The search uses an explicit stack, so it is not limited by Python's
+recursion limit, and solutions are yielded one at a time.
+"""
+
+
+class ExactCover:
+    """An exact cover problem.
+
+    >>> problem = ExactCover(4, [('a', [0, 1]), ('b', [2, 3]), ('c', [1, 2]),
+    ...                          ('d', [0]), ('e', [3])])
+    >>> [sorted(solution) for solution in problem.iter_solutions()]
+    [['a', 'b'], ['c', 'd', 'e']]
+    """
+    # === Private Attributes ===
+    # Nodes are numbered. Node 0 is the root, nodes 1 to the number of
+    # columns are the column headers, and the rest are the 1s of the rows.
+    # @type _left: list[int]
+    # @type _right: list[int]
+    # @type _up: list[int]
+    # @type _down: list[int]
+    #     The neighbouring node in each direction of each node. Columns
+    #     are linked left and right through the root, and the nodes of a
+    #     column are linked up and down through its header.
+    # @type _column: list[int]
+    #     The column header of each node.
+    # @type _size: list[int]
+    #     The number of rows left in each column, indexed by header.
+    # @type _label: list[object]
+    #     The label of the row of each node.
+    # @type _expanded: int
+    #     The number of nodes expanded by searches: partial solutions
+    #     whose next column was chosen to branch on.
+
+    def __init__(self, columns, rows):
+        """Create the exact cover problem with <columns> columns, numbered
+        from 0, and rows <rows>.
+
+        Each row is a pair of a label and the columns it covers. Labels
+        are what solutions are made of.
+
+        @type self: ExactCover
+        @type columns: int
+        @type rows: list[(object, list[int])]
+        @rtype: None
+        """
+        count = columns + 1
+        self._left = [i - 1 for i in range(count)]
+        self._left[0] = columns
+        self._right = [i + 1 for i in range(count)]
+        self._right[columns] = 0
+        self._up = list(range(count))
+        self._down = list(range(count))
+        self._column = list(range(count))
+        self._size = [0] * count
+        self._label = [None] * count
+        self._expanded = 0
+
+        for label, row_columns in rows:
+            first = len(self._column)
+            for column in row_columns:
+                header = column + 1
+                node = len(self._column)
+                self._left.append(node - 1)
+                self._right.append(node + 1)
+                self._up.append(self._up[header])
+                self._down.append(header)
+                self._down[self._up[header]] = node
+                self._up[header] = node
+                self._column.append(header)
+                self._label.append(label)
+                self._size[header] += 1
+            if len(self._column) > first:
+                last = len(self._column) - 1
+                self._left[first] = last
+                self._right[last] = first
+
+    def iter_solutions(self, limit=None):
+        """Yield each solution, as a list of row labels, stopping after
+        <limit> solutions if it is given.
+
+        A problem with no columns has one solution, with no rows. The
+        problem is left as it was, however the search ends, so it can be
+        solved again.
+
+        @type self: ExactCover
+        @type limit: int | None
+        @rtype: generator[list[object]]
+
+        >>> problem = ExactCover(2, [('a', [0]), ('b', [1]), ('c', [0, 1])])
+        >>> list(problem.iter_solutions(limit=1))
+        [['a', 'b']]
+        >>> solutions = problem.iter_solutions()
+        >>> next(solutions)
+        ['a', 'b']
+        >>> solutions.close()
+        >>> list(problem.iter_solutions())
+        [['a', 'b'], ['c']]
+        """
+        if limit is not None and limit <= 0:
+            return
+        right, down = self._right, self._down
+        if right[0] == 0:
+            yield []
+            return
+        found = 0
+        # The column covered at each level of the search, and the row
+        # chosen at each level below the last.
+        columns = []
+        chosen = []
+        # Stopping at <limit>, or the caller dropping the generator, leaves
+        # rows and columns covered, so they are put back on every exit.
+        try:
+            self._expanded += 1
+            column = self._choose_column()
+            self._cover(column)
+            columns.append(column)
+            node = down[column]
+            while True:
+                if node != columns[-1]:
+                    chosen.append(node)
+                    other = right[node]
+                    while other != node:
+                        self._cover(self._column[other])
+                        other = right[other]
+                    if right[0] == 0:
+                        yield [self._label[row] for row in chosen]
+                        found += 1
+                        if limit is not None and found >= limit:
+                            return
+                    else:
+                        self._expanded += 1
+                        column = self._choose_column()
+                        if self._size[column] > 0:
+                            self._cover(column)
+                            columns.append(column)
+                            node = down[column]
+                            continue
+                else:
+                    # Every row of this level's column has been tried.
+                    self._uncover(columns.pop())
+                    if len(columns) == 0:
+                        return
+                # Take back the last chosen row and try the one below it.
+                node = chosen.pop()
+                self._unchoose(node)
+                node = down[node]
+        finally:
+            while len(columns) > 0:
+                if len(chosen) == len(columns):
+                    self._unchoose(chosen.pop())
+                self._uncover(columns.pop())
+
+    def nodes_expanded(self):
+        """Return the number of nodes expanded by searches of this problem:
+        partial solutions whose next column was chosen to branch on,
+        including dead ends where no row covers that column.
+
+        @type self: ExactCover
+        @rtype: int
+
+        >>> problem = ExactCover(2, [('a', [0]), ('b', [1]), ('c', [0, 1])])
+        >>> list(problem.iter_solutions())
+        [['a', 'b'], ['c']]
+        >>> problem.nodes_expanded()
+        2
+        """
+        return self._expanded
+
+    def _unchoose(self, node):
+        """Put back the columns covered by choosing the row of <node>,
+        other than the column of <node> itself.
+
+        @type self: ExactCover
+        @type node: int
+        @rtype: None
+        """
+        left = self._left
+        other = left[node]
+        while other != node:
+            self._uncover(self._column[other])
+            other = left[other]
+
+    def _choose_column(self):
+        """Return the uncovered column with the fewest rows left.
+
+        @type self: ExactCover
+        @rtype: int
+        """
+        right, size = self._right, self._size
+        best = right[0]
+        column = right[best]
+        while column != 0 and size[best] > 1:
+            if size[column] < size[best]:
+                best = column
+            column = right[column]
+        return best
+
+    def _cover(self, column):
+        """Remove <column> and every row that covers it.
+
+        @type self: ExactCover
+        @type column: int
+        @rtype: None
+        """
+        left, right, up, down = self._left, self._right, self._up, self._down
+        right[left[column]] = right[column]
+        left[right[column]] = left[column]
+        row = down[column]
+        while row != column:
+            node = right[row]
+            while node != row:
+                down[up[node]] = down[node]
+                up[down[node]] = up[node]
+                self._size[self._column[node]] -= 1
+                node = right[node]
+            row = down[row]
+
+    def _uncover(self, column):
+        """Put back <column> and every row that covers it, undoing
+        _cover.
+
+        @type self: ExactCover
+        @type column: int
+        @rtype: None
+        """
+        left, right, up, down = self._left, self._right, self._up, self._down
+        row = up[column]
+        while row != column:
+            node = left[row]
+            while node != row:
+                self._size[self._column[node]] += 1
+                down[up[node]] = node
+                up[down[node]] = node
+                node = left[node]
+            row = up[row]
+        right[left[column]] = column
+        left[right[column]] = column
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
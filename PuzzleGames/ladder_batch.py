@@ -0,0 +1,379 @@
+# Assignment 2 - Puzzle Game
+#
+# CSC148 Fall 2015, University of Toronto
+# Instructor: David Liu
+# ---------------------------------------------
+"""Word ladder batch module.
+
+This module answers many (start, target) word ladder queries at once,
+faster than solving a WordLadderPuzzle for each one:
+
+- Queries whose target is a word of another length, or in another connected
+  component of the dictionary's one-letter graph, have no ladder. They are
+  answered straight away, without searching.
+- Queries with the same start word and many targets share one
+  breadth-first search, which stops once it has reached all of their
+  targets. Other queries use the two-way search of
+  WordLadderPuzzle.shortest_solution, which visits far fewer words for a
+  single pair.
+- Large batches are searched on a pool of worker processes. Answers are
+  yielded as soon as their search finishes, not in query order.
+
+Run it from this directory with a file of queries, one 'start target' pair
+per line, e.g.
+    python ladder_batch.py queries.txt --words wordsEn.txt
+"""
+import argparse
+import multiprocessing
+
+from word_ladder_puzzle import WORDS_FILE, WordLadderPuzzle, word_index
+
+
+# Batches with at least this many queries are searched on a process pool.
+POOL_THRESHOLD = 1000
+
+# A start word needs at least this many different targets for one search
+# from it to be shared by all of them.
+SHARED_SEARCH_TARGETS = 8
+
+# The dictionary searched by a worker process. Set by _share_words or
+# _load_words when the worker starts. Searches in the calling process are
+# given their service's dictionary instead, since more than one service
+# can be searching at a time.
+_words = None
+
+
+class LadderService:
+    """Shortest word ladders between many pairs of words of one dictionary.
+
+    A ladder is the list of words from the start word to the target word,
+    each one letter different from the one before. Every word after the
+    start must be in the dictionary.
+
+    >>> service = LadderService('wordsEnTest.txt')
+    >>> service.ladder('mire', 'cars')
+    ['mire', 'mare', 'care', 'cars']
+    >>> service.distance('mist', 'cars') is None
+    True
+    >>> for position, ladder in service.iter_batch([('mire', 'cars'),
+    ...                                             ('mire', 'mare')]):
+    ...     print(position, ladder)
+    0 ['mire', 'mare', 'care', 'cars']
+    1 ['mire', 'mare']
+    """
+    # === Private Attributes ===
+    # @type _filename: str
+    #     The dictionary file.
+    # @type _words: WordIndex | WordGraph
+    #     The words of the dictionary file.
+    # @type _components: dict[int, dict[str, int]]
+    #     For each word length that has been looked up, the number of the
+    #     connected component of each word of that length.
+
+    def __init__(self, filename=WORDS_FILE):
+        """Create a service for the words in the dictionary file
+        <filename>.
+
+        @type self: LadderService
+        @type filename: str
+        @rtype: None
+        """
+        self._filename = filename
+        self._words = word_index(filename)
+        self._components = {}
+
+    def ladder(self, start, target):
+        """Return a shortest ladder from <start> to <target>, or None if
+        there is none.
+
+        @type self: LadderService
+        @type start: str
+        @type target: str
+        @rtype: list[str] | None
+        """
+        for position, ladder in self.iter_batch([(start, target)], 1):
+            return ladder
+
+    def distance(self, start, target):
+        """Return the number of moves in a shortest ladder from <start> to
+        <target>, or None if there is none.
+
+        @type self: LadderService
+        @type start: str
+        @type target: str
+        @rtype: int | None
+        """
+        ladder = self.ladder(start, target)
+        if ladder is None:
+            return None
+        return len(ladder) - 1
+
+    def solve_batch(self, queries, processes=None):
+        """Return a shortest ladder for each (start, target) pair in
+        <queries>, in the same order, with None where there is none.
+
+        @type self: LadderService
+        @type queries: list[(str, str)]
+        @type processes: int | None
+        @rtype: list[list[str] | None]
+        """
+        ladders = [None] * len(queries)
+        for position, ladder in self.iter_batch(queries, processes):
+            ladders[position] = ladder
+        return ladders
+
+    def iter_batch(self, queries, processes=None):
+        """Yield (position, ladder) for each (start, target) pair in
+        <queries>, where position is the pair's index in <queries> and
+        ladder is a shortest ladder for it, or None if there is none.
+
+        Pairs are yielded as their answers are found: first those that
+        need no search, then each group of pairs with the same start word
+        as its search finishes.
+
+        <processes> is the number of worker processes to search with. By
+        default a pool with one per CPU is used for batches of at least
+        POOL_THRESHOLD queries. With 1, every search runs in this process.
+
+        @type self: LadderService
+        @type queries: list[(str, str)]
+        @type processes: int | None
+        @rtype: generator[(int, list[str] | None)]
+        """
+        # The positions of the queries still to be searched for, grouped
+        # by start word and then by target.
+        groups = {}
+        for position in range(len(queries)):
+            start, target = queries[position]
+            if start == target:
+                yield position, [start]
+            elif not self._connected(start, target):
+                yield position, None
+            else:
+                groups.setdefault(start, {}).setdefault(
+                    target, []).append(position)
+
+        tasks = list(groups.items())
+        if processes is None and len(queries) < POOL_THRESHOLD or \
+                processes == 1 or len(tasks) <= 1:
+            for task in tasks:
+                yield from _search_task(task, self._words)
+        else:
+            yield from self._search_in_pool(tasks, processes)
+
+    def components(self, length):
+        """Return the number of the connected component of each word of
+        length <length>.
+
+        Two words have the same number exactly when there is a ladder
+        between them. The components are found the first time they are
+        asked for.
+
+        @type self: LadderService
+        @type length: int
+        @rtype: dict[str, int]
+        """
+        if length not in self._components:
+            component = {}
+            number = 0
+            for word in self._words.words_of_length(length):
+                if word in component:
+                    continue
+                component[word] = number
+                level = [word]
+                while len(level) > 0:
+                    next_level = []
+                    for current in level:
+                        for neighbour in self._words.neighbours(current):
+                            if neighbour not in component:
+                                component[neighbour] = number
+                                next_level.append(neighbour)
+                    level = next_level
+                number += 1
+            self._components[length] = component
+        return self._components[length]
+
+    def _connected(self, start, target):
+        """Return False if there is certainly no ladder from <start> to
+        <target>.
+
+        A start word that is not in the dictionary can still have a
+        ladder, through any of its neighbours, so it is only rejected if
+        none of them is connected to <target>.
+
+        @type self: LadderService
+        @type start: str
+        @type target: str
+        @rtype: bool
+        """
+        if len(start) != len(target) or target not in self._words:
+            return False
+        component = self.components(len(target))
+        if start in self._words:
+            return component[start] == component[target]
+        for neighbour in self._words.neighbours(start):
+            if component[neighbour] == component[target]:
+                return True
+        return False
+
+    def _search_in_pool(self, tasks, processes):
+        """Yield the answers of searching <tasks> on a pool of <processes>
+        worker processes, as each task finishes.
+
+        @type self: LadderService
+        @type tasks: list[(str, dict[str, list[int]])]
+        @type processes: int | None
+        @rtype: generator[(int, list[str] | None)]
+        """
+        if 'fork' in multiprocessing.get_all_start_methods():
+            # Forked workers get _words, and the memory-mapped cache
+            # behind it, without it being pickled.
+            context = multiprocessing.get_context('fork')
+            pool = context.Pool(processes, _share_words, (self._words,))
+        else:
+            # Each worker loads the dictionary once, from its cache file.
+            pool = multiprocessing.Pool(processes, _load_words,
+                                        (self._filename,))
+        with pool:
+            for answers in pool.imap_unordered(_search_task_list, tasks):
+                yield from answers
+
+
+# ----------------------------------------------------------------------------
+# Helpers for searching, in this process or in worker processes
+# ----------------------------------------------------------------------------
+
+def _share_words(words):
+    """Make <words> the dictionary searched by _search_task_list in this
+    worker process.
+
+    @type words: WordIndex | WordGraph
+    @rtype: None
+    """
+    global _words
+    _words = words
+
+
+def _load_words(filename):
+    """Make the words of the dictionary file <filename> the dictionary
+    searched by _search_task_list in this worker process.
+
+    @type filename: str
+    @rtype: None
+    """
+    _share_words(word_index(filename))
+
+
+def _search_task(task, words):
+    """Yield (position, ladder) for each query of <task>, searching the
+    dictionary <words>.
+
+    A task is a start word and, for each target to reach from it, the
+    positions of the queries for that pair. With at least
+    SHARED_SEARCH_TARGETS targets, one breadth-first search from the start
+    word runs until it has reached every target. Otherwise each target is
+    searched for on its own.
+
+    @type task: (str, dict[str, list[int]])
+    @type words: WordIndex | WordGraph
+    @rtype: generator[(int, list[str] | None)]
+    """
+    start, targets = task
+    if len(targets) < SHARED_SEARCH_TARGETS:
+        for target in targets:
+            ladder = _search_pair(start, target, words)
+            for position in targets[target]:
+                yield position, ladder
+        return
+
+    remaining = len(targets)
+    parents = {start: None}
+    level = [start]
+    while len(level) > 0 and remaining > 0:
+        next_level = []
+        for word in level:
+            for neighbour in words.neighbours(word):
+                if neighbour not in parents:
+                    parents[neighbour] = word
+                    next_level.append(neighbour)
+                    if neighbour in targets:
+                        ladder = _walk_back(neighbour, parents)
+                        for position in targets[neighbour]:
+                            yield position, ladder
+                        remaining -= 1
+        level = next_level
+    for target in targets:
+        if target not in parents:
+            for position in targets[target]:
+                yield position, None
+
+
+def _search_pair(start, target, words):
+    """Return a shortest ladder from <start> to the different word
+    <target>, or None if there is none, searching the dictionary <words>.
+
+    @type start: str
+    @type target: str
+    @type words: WordIndex | WordGraph
+    @rtype: list[str] | None
+    """
+    solution = WordLadderPuzzle(start, target, [],
+                                words).shortest_solution()
+    if solution is None:
+        return None
+    if len(solution._ladder) == 0:
+        # A start word one letter from the target counts as solved already.
+        return [start, target]
+    return [start] + solution._ladder
+
+
+def _search_task_list(task):
+    """Return the answers of _search_task for <task> as a list, searching
+    the dictionary of this worker process.
+
+    @type task: (str, dict[str, list[int]])
+    @rtype: list[(int, list[str] | None)]
+    """
+    return list(_search_task(task, _words))
+
+
+def _walk_back(word, parents):
+    """Return the path of a breadth-first search from its start word to
+    <word>.
+
+    @type word: str
+    @type parents: dict[str, str | None]
+        The word each word was reached from.
+    @rtype: list[str]
+    """
+    path = []
+    while word is not None:
+        path.append(word)
+        word = parents[word]
+    path.reverse()
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Find shortest word ladders for many pairs of words.')
+    parser.add_argument('query_file',
+                        help="a file with one 'start target' pair per line")
+    parser.add_argument('--words', default=WORDS_FILE,
+                        help='the dictionary file')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='number of worker processes (default: one '
+                             'per CPU for large batches)')
+    args = parser.parse_args()
+
+    with open(args.query_file) as query_file:
+        all_queries = [tuple(line.split()) for line in query_file
+                       if line.strip() != '']
+    service = LadderService(args.words)
+    for query_position, query_ladder in service.iter_batch(all_queries,
+                                                           args.processes):
+        start_word, target_word = all_queries[query_position]
+        if query_ladder is None:
+            print(start_word, target_word, 'none')
+        else:
+            print(start_word, target_word, ' '.join(query_ladder))
@@ -27,6 +27,11 @@ class Puzzle:
         - is_solved
         - extensions
         - move
+
+    Subclasses that implement __eq__ must also implement key, and define
+    __hash__ again (Python drops the inherited __hash__ of a class that
+    defines __eq__), so that states can be stored in sets and dicts and
+    looked up in a solver's transposition table.
     """
     def __str__(self):
         """Return a human-readable representation of this puzzle.
@@ -56,6 +61,31 @@ class Puzzle:
         """
         raise NotImplementedError()
 
+    def iter_extensions(self):
+        """Return an iterator over the new states reachable by one move, in
+        the same order as extensions.
+
+        Subclasses can override this to make each state only when it is
+        needed, so a search can stop early without making them all.
+
+        @type self: Puzzle
+        @rtype: iterator[Puzzle]
+        """
+        return iter(self.extensions())
+
+    def solves_itself(self):
+        """Return whether the solver should find this puzzle's solutions
+        with its iter_solutions method instead of exploring extensions.
+
+        A puzzle that returns True must have a method iter_solutions(limit)
+        that yields its solved states, stopping after <limit> of them if
+        <limit> is not None.
+
+        @type self: Puzzle
+        @rtype: bool
+        """
+        return False
+
     def move(self, move):
         """Return a new puzzle state specified by making the given move.
 
@@ -92,6 +122,25 @@ class Puzzle:
         """
         raise NotImplementedError()
 
+    def key(self):
+        """Return a canonical key for this puzzle state.
+
+        The key must be hashable, and two states must have equal keys
+        exactly when they are equal (==).
+
+        @type self: Puzzle
+        @rtype: object
+        """
+        raise NotImplementedError()
+
+    def __hash__(self):
+        """Return a hash of this puzzle state, consistent with __eq__.
+
+        @type self: Puzzle
+        @rtype: int
+        """
+        return hash(self.key())
+
     def hint_generator(self, puzzle):
         """Compare two state of the puzzle and generate a valid hint of move.
 
@@ -0,0 +1,36 @@
+# Assignment 2 - Shared Helpers for the Unit Tests
+#
+# CSC148 Fall 2015, University of Toronto
+# Instructor: David Liu
+# ---------------------------------------------
+from puzzle import Puzzle
+
+
+class SumPuzzle(Puzzle):
+    """Reach a total by adding 1 or 2 at a time. Every order of the same
+    moves reaches the same state, so a search meets many transpositions.
+    """
+    def __init__(self, total, target):
+        self._total = total
+        self._target = target
+
+    def __str__(self):
+        return str(self._total)
+
+    def is_solved(self):
+        return self._total == self._target
+
+    def extensions(self):
+        return [SumPuzzle(self._total + step, self._target)
+                for step in (1, 2) if self._total + step <= self._target]
+
+    def __eq__(self, other):
+        """Return whether <other> has the same total and target."""
+        return self.key() == other.key()
+
+    def key(self):
+        """Return the total and the target."""
+        return self._total, self._target
+
+    def __hash__(self):
+        return hash(self.key())
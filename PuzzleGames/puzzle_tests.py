@@ -3,10 +3,25 @@
 # CSC148 Fall 2015, University of Toronto
 # Instructor: David Liu
 # ---------------------------------------------
+import inspect
+import os
+import pickle
+import sys
+import tempfile
+import time
 import unittest
-from sudoku_puzzle import SudokuPuzzle
-from word_ladder_puzzle import WordLadderPuzzle
-from solver import solve, solve_complete, hint_by_depth
+from unittest import mock
+from sudoku_puzzle import SudokuPuzzle, SudokuBoard, CHARS, FIRST_EMPTY, \
+    MOST_CONSTRAINED, IN_PLACE, EXACT_COVER
+from word_ladder_puzzle import WordLadderPuzzle, WordIndex, word_index
+import ladder_batch
+from ladder_batch import LadderService
+from word_graph import WordGraph, load_graph, SUFFIX
+from puzzle_test_helpers import SumPuzzle
+from solver import solve, solve_complete, solve_shortest, hint_by_depth, \
+    hint_by_depth_helper, hint_by_time, \
+    TranspositionTable, solve_complete_parallel, solve_portfolio, \
+    split_search, SOLVED, NO_SOLUTION, TIMED_OUT
 
 class SudokuPossibleLettersTest(unittest.TestCase):
     # Note that we are explicitly testing the _possible_letters
@@ -37,6 +52,85 @@ class SudokuPossibleLettersTest(unittest.TestCase):
         self.assertEqual(s._possible_letters(2, 3), ['C'])
 
 
+class SudokuPropagateTest(unittest.TestCase):
+    def test_hidden_single(self):
+        # 'A' can only go in (1, 2) in the top right subsquare.
+        s = SudokuPuzzle([['A', '', '', ''],
+                          ['', '', '', ''],
+                          ['', '', 'A', ''],
+                          ['', '', '', '']])
+        t = s.propagate()
+        self.assertIsNotNone(t)
+        self.assertEqual(t._board.letter(1, 3), 'A')
+
+    def test_propagated_extensions(self):
+        s = SudokuPuzzle([['', '', '', ''],
+                          ['', '', '', ''],
+                          ['', '', '', ''],
+                          ['', '', '', '']], True)
+        plain = SudokuPuzzle([[''] * 4 for _ in range(4)])
+        self.assertEqual(sorted(str(t) for t in solve_complete(s)),
+                         sorted(str(t) for t in solve_complete(plain)))
+        for extension in s.extensions():
+            # Nothing is left for propagation to fill in.
+            self.assertEqual(extension.propagate(), extension)
+
+
+class SudokuStrategyTest(unittest.TestCase):
+    GRID = ['53..7....', '6..195...', '.98....6.',
+            '8...6...3', '4..8.3..1', '7...2...6',
+            '.6....28.', '...419..5', '....8..79']
+
+    def make(self, strategy):
+        return SudokuPuzzle([['' if c == '.' else 'ABCDEFGHI'[int(c) - 1]
+                              for c in row] for row in self.GRID],
+                            strategy=strategy)
+
+    def test_most_constrained_expands_fewer_nodes(self):
+        first = self.make(FIRST_EMPTY)
+        mrv = self.make(MOST_CONSTRAINED)
+        self.assertEqual(solve(first), solve(mrv))
+        self.assertLess(mrv.nodes_expanded(), first.nodes_expanded())
+
+    def test_most_constrained_cell(self):
+        s = SudokuPuzzle([['A', 'B', '', ''],
+                          ['', '', '', ''],
+                          ['', '', '', ''],
+                          ['', '', '', 'A']], strategy=MOST_CONSTRAINED)
+        # (0, 2) and (0, 3) can only be 'C' or 'D'; (0, 2) has more empty
+        # cells around it.
+        extensions = s.extensions()
+        self.assertEqual([t._board.letter(0, 2) for t in extensions],
+                         ['C', 'D'])
+
+
+class SudokuBoardTest(unittest.TestCase):
+    def test_apply_undo(self):
+        board = SudokuBoard([['A', 'B', '', ''],
+                             ['C', 'D', '', ''],
+                             ['', '', '', ''],
+                             ['', '', '', '']])
+        copy = board.copy()
+        mark = board.mark()
+        board.apply(2, 2)
+        board.apply(3, 3)
+        self.assertEqual(board.letter(0, 3), 'D')
+        self.assertFalse(board == copy)
+        board.undo_to(mark)
+        self.assertTrue(board == copy)
+        self.assertEqual(board.candidates(2), copy.candidates(2))
+
+    def test_in_place_same_solutions(self):
+        grid = [['A', 'B', '', ''],
+                ['', '', '', ''],
+                ['', '', '', ''],
+                ['', '', '', '']]
+        for strategy in [FIRST_EMPTY, MOST_CONSTRAINED]:
+            states = solve_complete(SudokuPuzzle(grid, strategy=strategy))
+            in_place = SudokuPuzzle(grid, strategy=strategy, engine=IN_PLACE)
+            self.assertEqual(solve_complete(in_place), states)
+
+
 class SudokuMoveTest(unittest.TestCase):
     def test_sample(self):
         s = SudokuPuzzle([['A', 'B', 'C', 'D'],
@@ -122,6 +216,13 @@ class WordLadderPart1Test(unittest.TestCase):
         self.assertEqual(len(exts), 4)
         self.assertTrue(exts[-1].is_solved())
 
+    def test_iter_extensions(self):
+        word_ladder = WordLadderPuzzle('mare', 'mire', ['care'])
+        self.assertEqual(list(word_ladder.iter_extensions()),
+                         word_ladder.extensions())
+        first = next(word_ladder.iter_extensions())
+        self.assertEqual(first, word_ladder.extensions()[0])
+
     def test_no_duplicates(self):
         word_ladder = WordLadderPuzzle('mare', 'mire')
         exts = word_ladder.extensions()
@@ -155,6 +256,177 @@ class WordLadderPart2Test(unittest.TestCase):
             word_ladder.move('cars')
 
 
+class WordIndexTest(unittest.TestCase):
+    def test_neighbours(self):
+        index = WordIndex(['mare', 'care', 'mire', 'male', 'mist'])
+        self.assertEqual(index.neighbours('mare'), ['care', 'male', 'mire'])
+
+    def test_neighbours_of_unknown_word(self):
+        index = WordIndex(['mare', 'care'])
+        self.assertEqual(index.neighbours('dare'), ['care', 'mare'])
+
+    def test_file_read_once(self):
+        self.assertIs(word_index('wordsEnTest.txt'),
+                      word_index('wordsEnTest.txt'))
+
+    def test_uncached_index(self):
+        index = word_index('wordsEnTest.txt', cache=False)
+        self.assertIsInstance(index, WordIndex)
+        self.assertIsNot(index, word_index('wordsEnTest.txt'))
+        self.assertIs(index, word_index('wordsEnTest.txt', cache=False))
+
+    def test_extensions_share_index(self):
+        word_ladder = WordLadderPuzzle('mare', 'mire')
+        for extension in word_ladder.extensions():
+            self.assertIs(extension._words, word_ladder._words)
+
+    def test_unpickled_puzzle_shares_index(self):
+        word_ladder = WordLadderPuzzle('mare', 'mire')
+        if not isinstance(word_ladder._words, WordGraph):
+            self.skipTest('the word graph cache could not be written')
+        copy = pickle.loads(pickle.dumps(word_ladder))
+        self.assertEqual(copy, word_ladder)
+        self.assertIs(copy._words, word_index())
+
+
+class WordGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'words.txt')
+        self.write_words(['mare', 'care', 'mire', 'male', 'mist', 'cat'])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_words(self, words):
+        with open(self.filename, 'w') as wordfile:
+            wordfile.write('\n'.join(words) + '\n')
+
+    def read_index(self, filename):
+        self.builds += 1
+        with open(filename) as wordfile:
+            return WordIndex(line.strip() for line in wordfile)
+
+    def test_same_as_index(self):
+        self.builds = 0
+        graph = load_graph(self.filename, self.read_index)
+        self.assertIsInstance(graph, WordGraph)
+        index = self.read_index(self.filename)
+        for word in ['mare', 'care', 'mist', 'cat', 'dare', 'cot', 'xyzw']:
+            self.assertEqual(graph.neighbours(word), index.neighbours(word))
+            self.assertEqual(word in graph, word in index)
+
+    def test_cache_reused(self):
+        self.builds = 0
+        load_graph(self.filename, self.read_index)
+        load_graph(self.filename, self.read_index)
+        self.assertEqual(self.builds, 1)
+
+    def test_pickled_graph_shared(self):
+        self.builds = 0
+        graph = load_graph(self.filename, self.read_index)
+        self.assertIs(pickle.loads(pickle.dumps(graph)), graph)
+        self.assertIs(load_graph(self.filename, self.read_index), graph)
+
+    def test_cache_rebuilt_when_dictionary_changes(self):
+        self.builds = 0
+        load_graph(self.filename, self.read_index)
+        self.write_words(['mare', 'dare'])
+        graph = load_graph(self.filename, self.read_index)
+        self.assertEqual(self.builds, 2)
+        self.assertEqual(graph.neighbours('mare'), ['dare'])
+
+    def test_corrupt_cache_rebuilt(self):
+        self.builds = 0
+        with open(self.filename + SUFFIX, 'wb') as cache:
+            cache.write(b'WLGRAPH1')
+        graph = load_graph(self.filename, self.read_index)
+        self.assertIsInstance(graph, WordGraph)
+        self.assertEqual(graph.neighbours('cat'), [])
+
+    def test_not_ascii(self):
+        self.builds = 0
+        self.write_words(['caf\u00e9', 'cafe'])
+        graph = load_graph(self.filename, self.read_index)
+        self.assertIsInstance(graph, WordIndex)
+        self.assertEqual(graph.neighbours('cafe'), ['caf\u00e9'])
+
+
+class LadderServiceTest(unittest.TestCase):
+    def setUp(self):
+        self.service = LadderService('wordsEn1000.txt')
+        self.queries = [('mire', 'cars'), ('mare', 'mare'), ('mist', 'cars'),
+                        ('care', 'cat'), ('mire', 'mare'), ('cold', 'warm'),
+                        ('mire', 'cars')]
+
+    def check_batch(self, ladders):
+        for (start, target), ladder in zip(self.queries, ladders):
+            solution = WordLadderPuzzle(
+                start, target, words=self.service._words).shortest_solution()
+            if solution is None:
+                self.assertIsNone(ladder)
+            else:
+                self.assertEqual(ladder[0], start)
+                self.assertEqual(ladder[-1], target)
+                if start == target:
+                    self.assertEqual(ladder, [start])
+                else:
+                    # A start one letter from the target is already solved.
+                    self.assertEqual(len(ladder) - 1,
+                                     max(len(solution._ladder), 1))
+
+    def test_distance(self):
+        service = LadderService('wordsEnTest.txt')
+        self.assertEqual(service.distance('mire', 'cars'), 3)
+        self.assertIsNone(service.distance('mist', 'cars'))
+
+    def test_unreachable_rejected_without_search(self):
+        service = LadderService('wordsEnTest.txt')
+        components = service.components(4)
+        self.assertNotEqual(components['mist'], components['cars'])
+        with mock.patch.object(ladder_batch, '_search_task') as search:
+            self.assertEqual(service.solve_batch([('mist', 'cars')], 1),
+                             [None])
+            search.assert_not_called()
+
+    def test_services_with_different_dictionaries(self):
+        with tempfile.TemporaryDirectory() as directory:
+            services = []
+            for name, words in [('a.txt', ['cat', 'cot', 'cog', 'dog']),
+                                ('b.txt', ['cat', 'cot', 'dot', 'dog'])]:
+                filename = os.path.join(directory, name)
+                with open(filename, 'w') as wordfile:
+                    wordfile.write('\n'.join(words) + '\n')
+                services.append(LadderService(filename))
+            a, b = services
+            queries = [('cat', 'dog'), ('cot', 'dog')]
+            batches = [a.iter_batch(queries, 1), b.iter_batch(queries, 1)]
+            ladders = [[], []]
+            # Take the answers of the two batches in turn.
+            for answers in zip(*batches):
+                for i in range(2):
+                    ladders[i].append(answers[i][1])
+            self.assertEqual(ladders[0], [['cat', 'cot', 'cog', 'dog'],
+                                          ['cot', 'cog', 'dog']])
+            self.assertEqual(ladders[1], [['cat', 'cot', 'dot', 'dog'],
+                                          ['cot', 'dot', 'dog']])
+            for position, ladder in a.iter_batch(queries, 1):
+                self.assertEqual(b.ladder('cot', 'dog'),
+                                 ['cot', 'dot', 'dog'])
+                self.assertNotIn('dot', ladder)
+
+    def test_batch(self):
+        self.check_batch(self.service.solve_batch(self.queries, 1))
+
+    def test_batch_in_pool(self):
+        self.check_batch(self.service.solve_batch(self.queries, 2))
+
+    def test_shared_search(self):
+        words = self.service._words.words_of_length(4)[:40]
+        self.queries = [('care', word) for word in words]
+        self.check_batch(self.service.solve_batch(self.queries, 1))
+
+
 class SolveTest(unittest.TestCase):
     def test_solve_one(self):
         s = SudokuPuzzle([['A', 'B', 'C', 'D'],
@@ -180,6 +452,109 @@ class SolveTest(unittest.TestCase):
         for solution in solutions:
             self.assertTrue(solution.is_solved())
 
+    def test_solve_complete_limit(self):
+        s = SudokuPuzzle([['A', 'B', '', ''],
+                          ['C', 'D', '', ''],
+                          ['B', '', '', ''],
+                          ['D', '', 'A', '']])
+        self.assertEqual(len(solve_complete(s, limit=1)), 1)
+
+    def test_solve_complete_exact_cover(self):
+        grid = [['A', 'B', '', ''],
+                ['C', 'D', '', ''],
+                ['B', '', '', ''],
+                ['D', '', 'A', '']]
+        s = SudokuPuzzle(grid, engine=EXACT_COVER)
+        self.assertEqual(sorted(str(t) for t in solve_complete(s)),
+                         sorted(str(t) for t in
+                                solve_complete(SudokuPuzzle(grid))))
+        self.assertEqual(len(solve_complete(s, limit=1)), 1)
+        # Both searches count the Dancing Links nodes they expanded.
+        problem = s._board.exact_cover()
+        list(problem.iter_solutions())
+        list(problem.iter_solutions(1))
+        self.assertGreater(problem.nodes_expanded(), 0)
+        self.assertEqual(s.nodes_expanded(), problem.nodes_expanded())
+
+    def test_solve_exact_cover_25(self):
+        grid = [[CHARS[(5 * (i % 5) + i // 5 + j) % 25] for j in range(25)]
+                for i in range(25)]
+        for i in range(25):
+            for j in range(0, 25, 2):
+                grid[i][(i + j) % 25] = ''
+        solved = solve(SudokuPuzzle(grid, engine=EXACT_COVER))
+        self.assertTrue(solved.is_solved())
+
+    def test_solve_exact_cover_no_solution(self):
+        s = SudokuPuzzle([['A', 'B', '', ''],
+                          ['', '', '', ''],
+                          ['', '', 'C', ''],
+                          ['', '', 'D', '']],
+                         engine=EXACT_COVER)
+        self.assertIsNone(solve(s))
+
+    def test_solve_deeper_than_recursion_limit(self):
+        grid = [[CHARS[(3 * (i % 3) + i // 3 + j) % 9] for j in range(9)]
+                for i in range(9)]
+        for i in range(9):
+            for j in range(9):
+                if (i + j) % 3 != 0:
+                    grid[i][j] = ''
+        limit = sys.getrecursionlimit()
+        # Leave too few frames to recurse once for each of the 54 moves.
+        sys.setrecursionlimit(len(inspect.stack()) + 30)
+        try:
+            solved = solve(SudokuPuzzle(grid))
+            solutions = solve_complete(SudokuPuzzle(grid), limit=3)
+        finally:
+            sys.setrecursionlimit(limit)
+        self.assertTrue(solved.is_solved())
+        self.assertEqual(len(solutions), 3)
+        self.assertEqual(str(solutions[0]), str(solved))
+
+    def test_solve_complete_parallel(self):
+        s = SudokuPuzzle([['A', 'B', '', ''],
+                          ['C', 'D', '', ''],
+                          ['B', '', '', ''],
+                          ['D', '', 'A', '']])
+        for split_depth in (1, 2):
+            self.assertEqual(solve_complete_parallel(s, 2,
+                                                     split_depth=split_depth),
+                             solve_complete(s))
+        self.assertRaises(ValueError, solve_complete_parallel, s, 2, None, 0)
+
+    def test_solve_complete_parallel_limit(self):
+        grid = [[CHARS[(3 * (i % 3) + i // 3 + j) % 9] for j in range(9)]
+                for i in range(9)]
+        for i in range(9):
+            for j in range(9):
+                if (i + j) % 3 != 0:
+                    grid[i][j] = ''
+        s = SudokuPuzzle(grid, propagate=True)
+        self.assertEqual(solve_complete_parallel(s, 2, 20),
+                         solve_complete(s, limit=20))
+
+    def test_solve_shortest_word_ladder(self):
+        # 'mist' has no neighbours in wordsEnTest.txt.
+        self.assertIsNone(solve_shortest(WordLadderPuzzle('mist', 'cars')))
+        solved = solve_shortest(WordLadderPuzzle('mire', 'cars'))
+        self.assertTrue(solved.is_solved())
+        self.assertEqual(solved._ladder, ['mare', 'care', 'cars'])
+
+    def test_solve_shortest_word_ladder_full_dictionary(self):
+        words = word_index('wordsEn.txt')
+        solved = solve_shortest(WordLadderPuzzle('cold', 'warm',
+                                                 words=words))
+        self.assertTrue(solved.is_solved())
+        self.assertEqual(len(solved._ladder), 4)
+
+    def test_solve_shortest_sudoku(self):
+        s = SudokuPuzzle([['A', 'B', 'C', 'D'],
+                          ['C', 'D', 'A', 'B'],
+                          ['B', 'A', '', ''],
+                          ['D', 'C', '', '']])
+        self.assertTrue(solve_shortest(s).is_solved())
+
     def test_hint_already_solved(self):
         s = SudokuPuzzle([['A', 'B', 'C', 'D'],
                           ['C', 'D', 'A', 'B'],
@@ -201,6 +576,56 @@ class SolveTest(unittest.TestCase):
                           ['D', 'C', 'B', 'A']])
         self.assertEqual(hint_by_depth(s, 2), '(1, 2) -> A')
 
+    def test_hint_word_ladder(self):
+        self.assertEqual(hint_by_depth(WordLadderPuzzle('mire', 'cars'), 3),
+                         'mare')
+
+    def test_hint_word_ladder_shortest_solution(self):
+        # care-mare-mire is shortest, but care-cars-mars-mare-mire also
+        # takes at most 4 moves and 'cars' is the first extension.
+        self.assertEqual(hint_by_depth(WordLadderPuzzle('care', 'mire'), 4),
+                         'mare')
+
+    def test_hint_shortest_solution_first(self):
+        # Adding 2 solves it in one move, adding 1 takes two.
+        self.assertEqual(hint_by_depth_helper(SumPuzzle(0, 2), 2),
+                         SumPuzzle(2, 2))
+        self.assertEqual(hint_by_depth_helper(SumPuzzle(0, 5), 2),
+                         SumPuzzle(1, 5))
+        self.assertIsNone(hint_by_depth_helper(SumPuzzle(2, 1), 2))
+
+    def test_hint_by_time(self):
+        solved = SudokuPuzzle([['A', 'B', 'C', 'D'],
+                               ['C', 'D', 'A', 'B'],
+                               ['B', 'A', 'D', 'C'],
+                               ['D', 'C', 'B', 'A']])
+        self.assertEqual(hint_by_time(solved, 1000),
+                         ('Already at a solution!', 0))
+        s = SudokuPuzzle([['A', 'B', 'C', 'D'],
+                          ['C', 'D', '', 'B'],
+                          ['B', 'A', 'D', 'C'],
+                          ['D', 'C', 'B', 'A']])
+        self.assertEqual(hint_by_time(s, 1000), ('(1, 2) -> A', 1))
+        s = SudokuPuzzle([['A', 'B', 'C', 'D'],
+                          ['C', 'D', '', 'B'],
+                          ['B', 'A', 'D', 'C'],
+                          ['C', '', 'A', 'A']])
+        self.assertEqual(hint_by_time(s, 1000),
+                         ('No possible extensions!', 1))
+
+    def test_hint_by_time_budget(self):
+        grid = [[CHARS[(3 * (i % 3) + i // 3 + j) % 9] for j in range(9)]
+                for i in range(9)]
+        for i in range(9):
+            for j in range(9):
+                if (i + j) % 3 != 0:
+                    grid[i][j] = ''
+        s = SudokuPuzzle(grid)
+        # However short the time, the moves one away are searched.
+        self.assertEqual(hint_by_time(s, 0), (hint_by_depth(s, 1), 1))
+        hint, depth = hint_by_time(s, 10000, 3)
+        self.assertEqual((hint, depth), (hint_by_depth(s, 3), 3))
+
     def test_hint_valid_state(self):
         s = SudokuPuzzle([['', 'B', 'C', 'D'],
                           ['C', 'D', '', 'B'],
@@ -211,5 +636,116 @@ class SolveTest(unittest.TestCase):
                                                 '(2, 1) -> A',
                                                 '(3, 3) -> A'])
 
+
+class TranspositionTableTest(unittest.TestCase):
+    def setUp(self):
+        self.s = SudokuPuzzle([['A', 'B', '', ''],
+                               ['C', 'D', '', ''],
+                               ['B', '', '', ''],
+                               ['D', '', 'A', '']])
+
+    def test_equal_states_hash_equal(self):
+        s = SudokuPuzzle([['A', 'B', 'C', 'D'],
+                          ['C', 'D', 'A', 'B'],
+                          ['B', 'A', '', ''],
+                          ['D', 'C', '', '']])
+        moved = s.move('(2, 2) -> D')
+        self.assertEqual(hash(moved), hash(s.extensions()[0]))
+        self.assertEqual(len({moved, s.extensions()[0], s}), 2)
+        w = WordLadderPuzzle('mire', 'cars')
+        self.assertEqual(hash(w.move('mare')), hash(w.extensions()[0]))
+        self.assertIn(w.move('mare'), set(w.extensions()))
+
+    def test_lru_eviction(self):
+        a, b = self.s.extensions()[:2]
+        c = b.extensions()[0]
+        table = TranspositionTable(2)
+        self.assertFalse(table.seen(a))
+        self.assertFalse(table.seen(b))
+        self.assertTrue(table.seen(a))
+        # b is now the least recently seen, so it makes room for c.
+        self.assertFalse(table.seen(c))
+        self.assertTrue(table.seen(a))
+        self.assertFalse(table.seen(b))
+        self.assertEqual(len(table), 2)
+        self.assertEqual((table.hits(), table.misses(), table.evictions()),
+                         (2, 4, 2))
+        table.clear()
+        self.assertEqual((len(table), table.hits(), table.misses()),
+                         (0, 0, 0))
+
+    def test_bad_capacity(self):
+        self.assertRaises(ValueError, TranspositionTable, 0)
+
+    def test_solve_complete_same_solutions(self):
+        table = TranspositionTable()
+        self.assertEqual(solve_complete(self.s, table=table),
+                         solve_complete(self.s))
+        self.assertGreater(table.misses(), 0)
+
+    def test_skips_transpositions(self):
+        self.assertEqual(len(solve_complete(SumPuzzle(0, 10))), 89)
+        table = TranspositionTable()
+        self.assertEqual(solve_complete(SumPuzzle(0, 10), table=table),
+                         [SumPuzzle(10, 10)])
+        self.assertGreater(table.hits(), 0)
+        table.clear()
+        self.assertEqual(solve(SumPuzzle(0, 10), table=table),
+                         SumPuzzle(10, 10))
+        # A state forgotten by a full table is explored again.
+        solutions = solve_complete(SumPuzzle(0, 10),
+                                   table=TranspositionTable(1))
+        self.assertLess(1, len(solutions))
+        self.assertLess(len(solutions), 89)
+        self.assertEqual(set(solutions), {SumPuzzle(10, 10)})
+
+
+class SolvePortfolioTest(unittest.TestCase):
+    def setUp(self):
+        self.grid = [['A', 'B', '', ''],
+                     ['C', 'D', '', ''],
+                     ['B', '', '', ''],
+                     ['D', '', 'A', '']]
+
+    def test_strategies(self):
+        solution, status = solve_portfolio(
+            [SudokuPuzzle(self.grid, strategy=MOST_CONSTRAINED),
+             SudokuPuzzle(self.grid, engine=EXACT_COVER)])
+        self.assertEqual(status, SOLVED)
+        self.assertIn(solution, solve_complete(SudokuPuzzle(self.grid)))
+
+    def test_split_search(self):
+        s = SudokuPuzzle(self.grid)
+        parts = split_search(s, 1)
+        self.assertGreater(len(parts), 1)
+        solution, status = solve_portfolio(parts)
+        self.assertEqual(status, SOLVED)
+        self.assertIn(solution, solve_complete(s))
+        self.assertRaises(ValueError, split_search, s, 0)
+
+    def test_no_solution(self):
+        s = SudokuPuzzle([['A', 'B', '', ''],
+                          ['', '', '', ''],
+                          ['', '', 'C', ''],
+                          ['', '', 'D', '']])
+        self.assertEqual(solve_portfolio(split_search(s)),
+                         (None, NO_SOLUTION))
+        self.assertEqual(solve_portfolio([]), (None, NO_SOLUTION))
+
+    def test_first_solution_wins(self):
+        # Adding 1 at a time, the first search takes far too long.
+        solution, status = solve_portfolio([SumPuzzle(0, 10 ** 9),
+                                            SumPuzzle(0, 10)],
+                                           timeout=60, processes=2)
+        self.assertEqual((solution, status), (SumPuzzle(10, 10), SOLVED))
+
+    def test_timeout(self):
+        start = time.monotonic()
+        self.assertEqual(solve_portfolio([SumPuzzle(0, 10 ** 9)],
+                                         timeout=0.2),
+                         (None, TIMED_OUT))
+        self.assertLess(time.monotonic() - start, 10)
+
+
 if __name__ == '__main__':
     unittest.main(exit=False)
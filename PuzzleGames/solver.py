@@ -8,10 +8,28 @@
 This module can be used to take a puzzle and generate one or all
 possible solutions. It can also generate hints for a puzzle (see Part 4).
 """
+import functools
+import multiprocessing
+import time
+from collections import OrderedDict
+
 from puzzle import Puzzle
 
 
-def solve(puzzle, verbose=False):
+# The number of states a TranspositionTable remembers by default.
+TABLE_CAPACITY = 100000
+
+# The number of search levels solve_complete_parallel explores itself before
+# handing the states it reaches to worker processes.
+SPLIT_DEPTH = 2
+
+# The outcomes of solve_portfolio.
+SOLVED = 'solved'
+NO_SOLUTION = 'no solution'
+TIMED_OUT = 'timed out'
+
+
+def solve(puzzle, verbose=False, table=None):
     """Return a solution of the puzzle.
 
     Even if there is only one possible solution, just return one of them.
@@ -20,107 +38,442 @@ def solve(puzzle, verbose=False):
     In 'verbose' mode, print out every state explored in addition to
     the final solution. By default 'verbose' mode is disabled.
 
-    Uses a recursive algorithm to exhaustively try all possible
-    sequences of moves (using the 'extensions' method of the Puzzle
-    interface) until it finds a solution.
+    Exhaustively tries all possible sequences of moves (using the
+    'extensions' method of the Puzzle interface) until it finds a
+    solution; see _search for the order. Puzzles that can solve
+    themselves (see Puzzle.solves_itself) are solved with their
+    iter_solutions method instead, unless in 'verbose' mode.
+
+    If a TranspositionTable <table> is given, a state equal to one already
+    in the table is not explored again.
 
     @type puzzle: Puzzle
     @type verbose: bool
+    @type table: TranspositionTable | None
     @rtype: Puzzle | None
     """
-    if puzzle.is_solved():
-        return puzzle
-    else:
-        lst = puzzle.extensions()
-        if verbose:
-            for i in lst:
-                print(i)
-        # the puzzle is finished answering, but with wrong solution
-        if len(lst) == 0:
-            return None
-        else:
-            choices = []
-            for status in lst:
-                # if one status is a correct solution, return it
-                if status.is_solved():
-                    return status
-                else:
-                    # the status is not solved, explore next extension
-                    next_step = status.extensions()
-                    if verbose:
-                        for j in next_step:
-                            print(j)
-                    choices.extend(next_step)
-
-            # No possible next steps
-            if len(choices) == 0:
-                return None
-            else:
-                for choice in choices:
-                    # for each next state, recursively solve them
-                    if verbose:
-                        answer = solve(choice, True)
-                    else:
-                        answer = solve(choice)
-                    # if the answer is a correct solution, return it
-                    if answer is not None:
-                        return answer
-                # When all answers are None
-                return None
-
-
-def solve_complete(puzzle, verbose=False):
-    """Return all solutions of the puzzle.
+    if not verbose and puzzle.solves_itself():
+        for solution in puzzle.iter_solutions(1):
+            return solution
+        return None
+    for solution in _search(puzzle, verbose, table):
+        return solution
+    return None
+
+
+def solve_complete(puzzle, verbose=False, limit=None, table=None):
+    """Return all solutions of the puzzle, or only the first <limit> found
+    if <limit> is not None.
 
     Return an empty list if there are no possible solutions.
 
     In 'verbose' mode, print out every state explored in addition to
     the final solution. By default 'verbose' mode is disabled.
 
-    Uses a recursive algorithm to exhaustively try all possible
-    sequences of moves (using the 'extensions' method of the Puzzle
-    interface) until it finds all solutions.
+    Exhaustively tries all possible sequences of moves (using the
+    'extensions' method of the Puzzle interface) until it finds all
+    solutions; see _search for the order. Puzzles that can solve
+    themselves (see Puzzle.solves_itself) are solved with their
+    iter_solutions method instead, unless in 'verbose' mode.
+
+    If a TranspositionTable <table> is given, a state equal to one already
+    in the table is not explored again, so equal solutions are only
+    returned once unless the table has forgotten the first of them.
 
     @type puzzle: Puzzle
     @type verbose: bool
+    @type limit: int | None
+    @type table: TranspositionTable | None
     @rtype: list[Puzzle]
     """
     final = []
-    if puzzle.is_solved():
-        final.append(puzzle)
+    if limit is not None and limit <= 0:
         return final
-    else:
-        lst = puzzle.extensions()
-        if verbose:
-            for i in lst:
-                print(i)
-        # the puzzle is finished answering, but with wrong solution
-        if len(lst) == 0:
-            return final
+    if not verbose and puzzle.solves_itself():
+        return list(puzzle.iter_solutions(limit))
+    for solution in _search(puzzle, verbose, table):
+        final.append(solution)
+        if limit is not None and len(final) >= limit:
+            break
+    return final
+
+
+def solve_complete_parallel(puzzle, processes=None, limit=None,
+                            split_depth=SPLIT_DEPTH):
+    """Return the same solutions as solve_complete(puzzle, limit=limit), in
+    the same order, searching independent parts of the puzzle on a pool of
+    <processes> worker processes (by default one per CPU).
+
+    The first <split_depth> levels of the search, of two moves each (see
+    _search), are explored in this process. Each unsolved state reached
+    below them is a unit of work, searched with solve_complete by a
+    worker. Idle workers take the next unit as soon as they finish one,
+    so a few large units do not hold up the rest. The solutions of each
+    unit take the unit's place in the search order, so the result does not
+    depend on which worker finishes first.
+
+    States are sent between processes by pickling them, so the puzzle must
+    be picklable. If the puzzle solves itself (see Puzzle.solves_itself),
+    each unit is solved with its iter_solutions method, so the solutions
+    may be in another order than solve_complete's.
+
+    Raise a ValueError if <split_depth> is less than 1.
+
+    @type puzzle: Puzzle
+    @type processes: int | None
+    @type limit: int | None
+    @type split_depth: int
+    @rtype: list[Puzzle]
+    """
+    if limit is not None and limit <= 0:
+        return []
+    states = split_search(puzzle, split_depth)
+    solved = [state.is_solved() for state in states]
+    units = [states[i] for i in range(len(states)) if not solved[i]]
+    search = functools.partial(solve_complete, limit=limit)
+    if processes == 1 or len(units) <= 1:
+        return _merge(states, solved, map(search, units), limit)
+    with _make_pool(processes) as pool:
+        return _merge(states, solved, pool.imap(search, units), limit)
+
+
+def split_search(puzzle, depth=SPLIT_DEPTH):
+    """Return the solutions and the unexplored states reached by exploring
+    the first <depth> levels of the search from <puzzle>, of two moves
+    each (see _search), in search order.
+
+    Every other solution of <puzzle> can be reached from exactly one of
+    the unexplored states, so these can be searched independently.
+
+    Raise a ValueError if <depth> is less than 1.
+
+    @type puzzle: Puzzle
+    @type depth: int
+    @rtype: list[Puzzle]
+    """
+    if depth < 1:
+        raise ValueError('depth must be at least 1')
+    return list(_search(puzzle, False, None, depth))
+
+
+def solve_portfolio(puzzles, timeout=None, processes=None):
+    """Search each of <puzzles> with solve at the same time, on a pool of
+    <processes> worker processes, and return the first solution found and
+    the outcome: SOLVED, NO_SOLUTION or TIMED_OUT.
+
+    <puzzles> can be different ways of searching one puzzle, e.g. one
+    SudokuPuzzle for each strategy, or the disjoint parts of a search
+    returned by split_search. As soon as any of them is solved, or
+    <timeout> seconds have passed, the workers still searching are
+    stopped. If every search finishes without a solution, the outcome is
+    NO_SOLUTION. The solution is None unless the outcome is SOLVED.
+
+    By default there is one worker per puzzle, up to one per CPU. Puzzles
+    are sent to the workers by pickling them, so they must be picklable.
+
+    @type puzzles: list[Puzzle]
+    @type timeout: float | None
+    @type processes: int | None
+    @rtype: (Puzzle | None, str)
+    """
+    if len(puzzles) == 0:
+        return None, NO_SOLUTION
+    if processes is None:
+        processes = min(len(puzzles), multiprocessing.cpu_count())
+    if timeout is not None:
+        deadline = time.monotonic() + timeout
+    # Leaving the pool's block terminates any worker still searching.
+    with _make_pool(processes) as pool:
+        solutions = pool.imap_unordered(solve, puzzles)
+        for _ in range(len(puzzles)):
+            wait = None
+            if timeout is not None:
+                wait = max(0, deadline - time.monotonic())
+            try:
+                solution = solutions.next(wait)
+            except multiprocessing.TimeoutError:
+                return None, TIMED_OUT
+            if solution is not None:
+                return solution, SOLVED
+    return None, NO_SOLUTION
+
+
+def _merge(states, solved, unit_solutions, limit):
+    """Return the solutions among <states>, in order, with each unsolved
+    state replaced by its solutions, stopping after <limit> solutions if
+    <limit> is not None.
+
+    @type states: list[Puzzle]
+    @type solved: list[bool]
+        Whether each state in <states> is solved.
+    @type unit_solutions: iterator[list[Puzzle]]
+        The solutions of each unsolved state in <states>, in order.
+    @type limit: int | None
+    @rtype: list[Puzzle]
+    """
+    final = []
+    for i in range(len(states)):
+        if solved[i]:
+            final.append(states[i])
         else:
-            choices = []
-            for status in lst:
-                if status.is_solved():
-                    final.append(status)
-                # not fully solved yet, then explore its next possible steps
-                next_step = status.extensions()
-                if verbose:
-                    for j in next_step:
-                        print(j)
-                choices.extend(next_step)
-
-            # if there is no possible next steps
-            if len(choices) == 0:
-                return final
-            else:
-                for choice in choices:
-                    # for each next state, recursively solve them
-                    if verbose:
-                        answer = solve_complete(choice, True)
-                    else:
-                        answer = solve_complete(choice)
-                    final.extend(answer)
-                return final
+            final.extend(next(unit_solutions))
+        if limit is not None and len(final) >= limit:
+            return final[:limit]
+    return final
+
+
+def _make_pool(processes):
+    """Return a pool of <processes> worker processes, forked from this one
+    where the platform allows it, since forking starts workers fastest.
+
+    @type processes: int | None
+    @rtype: multiprocessing.pool.Pool
+    """
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork').Pool(processes)
+    return multiprocessing.Pool(processes)
+
+
+def _search(puzzle, verbose, table=None, depth=None):
+    """Yield the solutions reachable from <puzzle>, printing the states
+    explored in 'verbose' mode.
+
+    A state is explored two moves at a time: its extensions are made
+    (and printed) first, and any of them that are solved are yielded.
+    Then the extensions of each of them are made (and printed), and
+    finally each of those grandchildren is yielded if it is solved, or
+    explored in the same way otherwise.
+
+    The search keeps an explicit stack instead of recursing, so deep
+    searches do not hit Python's recursion limit. Each level of the stack
+    keeps the extensions of one state and an iterator over the
+    extensions of one of them, so grandchildren are made only when they
+    are needed; in 'verbose' mode they are made once more to be printed
+    ahead of time.
+
+    If a TranspositionTable <table> is given, states that are already in
+    it are skipped, and the rest are added to it.
+
+    If <depth> is given, only the first <depth> levels of the search, of
+    two moves each, are explored: the unsolved states below them are
+    yielded, in the order they would have been explored, instead of being
+    explored.
+
+    @type puzzle: Puzzle
+    @type verbose: bool
+    @type table: TranspositionTable | None
+    @type depth: int | None
+    @rtype: generator[Puzzle]
+    """
+    if puzzle.is_solved():
+        yield puzzle
+        return
+    if table is not None:
+        table.seen(puzzle)
+    # Each level is [extensions of a state, the index of the extension
+    # whose own extensions are being explored, an iterator over those
+    # extensions or None before they are made].
+    children = yield from _expand(puzzle, verbose, table)
+    stack = [[children, 0, None]]
+    while len(stack) > 0:
+        level = stack[-1]
+        children, index, grandchildren = level
+        if grandchildren is None:
+            if index == len(children):
+                stack.pop()
+                continue
+            grandchildren = children[index].iter_extensions()
+            level[2] = grandchildren
+        state = next(grandchildren, None)
+        if state is None:
+            level[1] += 1
+            level[2] = None
+        elif table is not None and table.seen(state):
+            continue
+        elif state.is_solved() or len(stack) == depth:
+            yield state
+        else:
+            children = yield from _expand(state, verbose, table)
+            stack.append([children, 0, None])
+
+
+def _expand(puzzle, verbose, table):
+    """Yield the solved extensions of the unsolved <puzzle>, and return
+    all its extensions, leaving out those already in the
+    TranspositionTable <table> if it is given.
+
+    In 'verbose' mode, print the extensions of <puzzle>, and then the
+    extensions of each extension after it is checked.
+
+    @type puzzle: Puzzle
+    @type verbose: bool
+    @type table: TranspositionTable | None
+    @rtype: generator[Puzzle]
+    """
+    children = puzzle.extensions()
+    if verbose:
+        for child in children:
+            print(child)
+    if table is not None:
+        children = [child for child in children if not table.seen(child)]
+    for child in children:
+        if child.is_solved():
+            yield child
+        if verbose:
+            for grandchild in child.extensions():
+                print(grandchild)
+    return children
+
+
+class TranspositionTable:
+    """The puzzle states a search has already seen, so that it can skip a
+    state it reaches again by another sequence of moves.
+
+    States are remembered by their canonical keys (see Puzzle.key). The
+    table holds at most a fixed number of keys; when it is full, the key
+    seen least recently is forgotten to make room. It counts its hits
+    (states found in it) and misses (states added to it).
+
+    A table records every state a search explores, so use a new or
+    cleared table for each search.
+
+    >>> from sudoku_puzzle import SudokuPuzzle
+    >>> s = SudokuPuzzle([['A', 'B', 'C', 'D'],
+    ...                   ['C', 'D', 'A', 'B'],
+    ...                   ['B', 'A', '', ''],
+    ...                   ['D', 'C', '', '']])
+    >>> table = TranspositionTable(2)
+    >>> table.seen(s), table.seen(s.extensions()[0]), table.seen(s)
+    (False, False, True)
+    >>> print(table)
+    1 hits, 2 misses, 0 evictions, 2 of 2 states
+    """
+    # === Private Attributes ===
+    # @type _capacity: int
+    #     The most keys the table holds.
+    # @type _keys: OrderedDict[object, None]
+    #     The keys of the states seen, least recently seen first.
+    # @type _hits: int
+    # @type _misses: int
+    # @type _evictions: int
+    #     The number of lookups that found their state, the number that
+    #     did not, and the number of keys forgotten to make room.
+
+    def __init__(self, capacity=TABLE_CAPACITY):
+        """Create an empty table that holds at most <capacity> states.
+
+        Raise a ValueError if <capacity> is less than 1.
+
+        @type self: TranspositionTable
+        @type capacity: int
+        @rtype: None
+        """
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self._capacity = capacity
+        self._keys = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        """Return the number of states in <self>.
+
+        @type self: TranspositionTable
+        @rtype: int
+        """
+        return len(self._keys)
+
+    def __str__(self):
+        """Return a summary of the statistics of <self>.
+
+        @type self: TranspositionTable
+        @rtype: str
+        """
+        return '{} hits, {} misses, {} evictions, {} of {} states'.format(
+            self._hits, self._misses, self._evictions, len(self._keys),
+            self._capacity)
+
+    def seen(self, puzzle):
+        """Return True if a state equal to <puzzle> is in <self>. Otherwise
+        add <puzzle> to <self> and return False.
+
+        @type self: TranspositionTable
+        @type puzzle: Puzzle
+        @rtype: bool
+        """
+        key = puzzle.key()
+        if key in self._keys:
+            self._keys.move_to_end(key)
+            self._hits += 1
+            return True
+        self._misses += 1
+        self._keys[key] = None
+        if len(self._keys) > self._capacity:
+            self._keys.popitem(last=False)
+            self._evictions += 1
+        return False
+
+    def hits(self):
+        """Return the number of times seen found its state in <self>.
+
+        @type self: TranspositionTable
+        @rtype: int
+        """
+        return self._hits
+
+    def misses(self):
+        """Return the number of times seen added its state to <self>.
+
+        @type self: TranspositionTable
+        @rtype: int
+        """
+        return self._misses
+
+    def evictions(self):
+        """Return the number of states forgotten to make room for others.
+
+        @type self: TranspositionTable
+        @rtype: int
+        """
+        return self._evictions
+
+    def clear(self):
+        """Forget every state in <self> and reset its statistics.
+
+        @type self: TranspositionTable
+        @rtype: None
+        """
+        self._keys.clear()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+
+def solve_shortest(puzzle):
+    """Return a solution of the puzzle reached in the fewest moves.
+
+    If there are no possible solutions, return None.
+
+    Puzzles that can find their own shortest solution, such as
+    WordLadderPuzzle, provide a shortest_solution method, which is used
+    if it exists. Otherwise the puzzle's states are explored with a
+    breadth-first search using the 'extensions' method.
+
+    @type puzzle: Puzzle
+    @rtype: Puzzle | None
+    """
+    if hasattr(puzzle, 'shortest_solution'):
+        return puzzle.shortest_solution()
+    level = [puzzle]
+    while len(level) > 0:
+        next_level = []
+        for state in level:
+            if state.is_solved():
+                return state
+            next_level.extend(state.extensions())
+        level = next_level
+    return None
 
 
 def hint_by_depth(puzzle, n):
@@ -132,165 +485,131 @@ def hint_by_depth(puzzle, n):
     If <puzzle> cannot lead to a solution or other valid state within
     <n> moves, return the string 'No possible extensions!'
 
+    If a solution is within <n> moves, the hint is the first move of a
+    shortest solution (see hint_by_depth_helper). This is on purpose: the
+    hint used to be the first move, in the order of the puzzle's
+    extensions, from which any solution is within <n> moves, which could
+    point the long way round.
+
     @type puzzle: Puzzle
     @type n: int
     @rtype: str
     """
-    # TO TA:
-    # THIS FUNCTION IS NOT RECURSIVE, BUT ITS SUB HELPER FUNCTION
-    # build_solution_tree IS A RECURSIVE FUNCTION
     if puzzle.is_solved():
         message = 'Already at a solution!'
     else:
-        if hint_by_depth_helper(puzzle, n) is None:
+        hint = hint_by_depth_helper(puzzle, n)
+        if hint is None:
             message = 'No possible extensions!'
         else:
-            message = puzzle.hint_generator(hint_by_depth_helper(puzzle, n))
+            message = puzzle.hint_generator(hint)
     return message
 
 
+def hint_by_time(puzzle, milliseconds, n=None):
+    """Return the hint hint_by_depth gives for the given puzzle state and
+    the most moves that could be searched within <milliseconds>, and that
+    number of moves.
+
+    The search deepens one move at a time, up to <n> moves if <n> is not
+    None, until it finds a solution, runs out of states to search, or runs
+    out of time, so the hint is the best one found in the time given. The
+    moves one away are searched however short the time is.
+
+    If <puzzle> is already solved, return 'Already at a solution!' and 0.
+
+    @type puzzle: Puzzle
+    @type milliseconds: float
+    @type n: int | None
+    @rtype: (str, int)
+    """
+    if puzzle.is_solved():
+        return 'Already at a solution!', 0
+    deadline = time.monotonic() + milliseconds / 1000
+    depth, hint = 0, None
+    for depth, hint, solved in _hint_levels(puzzle, n, deadline):
+        pass
+    if hint is None:
+        return 'No possible extensions!', depth
+    return puzzle.hint_generator(hint), depth
+
+
 def hint_by_depth_helper(puzzle, n):
     """
     Return a valid state of the puzzle after one move, which can lead
     to a solution or a valid state within n moves.
     Return None if cannot find any above.
 
+    The state returned is the first move of a shortest sequence of moves
+    to a solution, if one takes at most n moves. Otherwise it is the
+    first move, in the order of the puzzle's extensions, that can lead to
+    a valid state n moves away.
+
     Precondition: n >= 1.
 
     @type puzzle: Puzzle
     @type n: int
     @rtype: Puzzle | None
     """
+    hint = None
+    for depth, hint, solved in _hint_levels(puzzle, n):
+        pass
+    return hint
 
-    start = SolutionTree(puzzle)
-    solution_tree = build_solution_tree(start, n)
-    next_move = solution_tree.items_at_depth(2)
-    for obj in next_move:
-        if obj.get_root().is_solved():
-            return obj.get_root()
-        else:
-            for dep in range(2, n+1):
-                reached_state = obj.items_at_depth(dep)
-                for nested_obj in reached_state:
-                    if nested_obj.get_root().is_solved():
-                        return obj.get_root()
-    # if still cannot find any solved solution within n moves,
-    # find if there are valid state at nth move
-    for obj in next_move:
-        reached_state_at_n = obj.items_at_depth(n)
-        if not len(reached_state_at_n) == 0:
-            return obj.get_root()
-    # if neither solution or valid state is found, return None
-    return None
 
+def _hint_levels(puzzle, n=None, deadline=None):
+    """Search breadth-first from the unsolved <puzzle>, up to <n> moves
+    away if <n> is not None, and yield (depth, hint, solved) after
+    searching each depth.
 
-def build_solution_tree(root, n):
-    """
-    Build a solution tree recursively that contains possible states of
-    the puzzle until nth moves by giving its root.
+    hint is the state after the first move towards a solution <depth>
+    moves away if solved is True, and the search stops there. Otherwise it
+    is the state after the first move, in the order of the puzzle's
+    extensions, that leads to a state <depth> moves away, or None if there
+    is no such state, and the search stops if it is None.
 
-    @type root: SolutionTree
-    @type n: int
-    @rtype: SolutionTree
-    """
-    puzzle = root.get_root()
-    exten = puzzle.extensions()
-    for element in exten:
-        subroot = SolutionTree(element)
-        root.add_extensions([subroot])
-    n -= 1
-    if n < 1:
-        return root
-    else:
-        for obj in root.get_extensions():
-            lst = obj.get_root().extensions()
-            for sol in lst:
-                subroot2 = SolutionTree(sol)
-                obj.add_extensions([subroot2])
-        n -= 1
-        if n < 1:
-            return root
-        else:
-            for choice in root.get_extensions():
-                for nest_obj in choice.get_extensions():
-                    build_solution_tree(nest_obj, n)
-            return root
+    Only the states at one depth are kept, each with the index of the
+    first move that led to it, instead of a tree of every state. The
+    states at depth <n> are checked as they are made and not kept.
 
+    If <deadline> is given, the search stops without finishing a depth
+    after 1 once time.monotonic() reaches <deadline>.
 
-class SolutionTree:
-    """ A tree data structure that contains all possible puzzle states
-    until specified steps of valid move.
-
+    @type puzzle: Puzzle
+    @type n: int | None
+    @type deadline: float | None
+    @rtype: generator[(int, Puzzle | None, bool)]
     """
-    # === Private Attributes ===
-    # @type _root: Puzzle
-    #     The puzzle associated with this solution tree
-    # @type _extensions: list[SolutionTree]
-    #     The all possible extensions associated with this solution tree
-
-    def __init__(self, puzzle):
-        """Initialize the solution tree.
-
-        @type puzzle: Puzzle
-        @rtype: None
-        """
-        self._root = puzzle
-        self._extensions = []
+    first_moves = puzzle.extensions()
+    # The (first move index, state) pairs at the current depth, in order
+    # of first move.
+    states = [(i, first_moves[i]) for i in range(len(first_moves))]
+    depth = 1
+    while True:
+        keep = n is None or depth < n
+        level = []
+        first = None
+        for label, state in states:
+            if depth > 1 and deadline is not None and \
+                    time.monotonic() >= deadline:
+                return
+            if state.is_solved():
+                yield depth, first_moves[label], True
+                return
+            if first is None:
+                first = label
+            if keep:
+                level.append((label, state))
+        if first is None:
+            yield depth, None, False
+            return
+        yield depth, first_moves[first], False
+        if not keep:
+            return
+        states = ((label, child) for label, state in level
+                  for child in state.iter_extensions())
+        depth += 1
 
-    def is_empty(self):
-        """Return whether this tree is empty.
-
-        @type self: SolutionTree
-        @rtype: bool
-        """
-        return self._root is None
-
-    def add_extensions(self, new_trees):
-        """ Add new tree extensions to the solution tree.
-
-        @type new_trees: list[SolutionTree]
-        @rtype: None
-        """
-        if self.is_empty():
-            raise ValueError()
-        else:
-            self._extensions.extend(new_trees)
-
-    def get_root(self):
-        """Return the root value of solution tree
-        @rtype: Puzzle
-        """
-        return self._root
-
-    def get_extensions(self):
-        """Return a list of extensions of solution tree
-        @rtype: list[SolutionTree]
-        """
-        return self._extensions
-
-    def items_at_depth(self, d):
-        """
-        Return a sorted list of all items in this solution tree at depth <d>.
-
-        Precondition: d >= 1.
-
-        @type self: SolutionTree
-        @type d: int
-        @rtype: list[SolutionTree]
-        """
-        result = []
-        if self.is_empty():
-            return result
-        elif d == 1:
-            result.append(self._root)
-            return result
-        else:
-            if d == 2:
-                return self._extensions
-            else:
-                for extension in self._extensions:
-                    result.extend(extension.items_at_depth(d-1))
-                return result
 
 if __name__ == '__main__':
     from sudoku_puzzle import SudokuPuzzle
@@ -311,11 +630,7 @@ if __name__ == '__main__':
     #      ['', '', '', '', 'H', '', '', 'G', 'I']]
     # )
     # s = WordLadderPuzzle('mist', 'cars')
-    # r = SolutionTree(s)
-    # tree = build_solution_tree(r, 4)
-    # pos = tree.items_at_depth(5)
-    # for item in pos:
-    #     print(item._root)
+    # print(hint_by_depth(s, 4))
 
     # solution = solve(s)
     # print(solution)
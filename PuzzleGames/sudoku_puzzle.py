@@ -23,34 +23,510 @@ Here are the rules of Sudoku:
 
 """
 from puzzle import Puzzle
+from exact_cover import ExactCover
 from math import sqrt
 
 CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
 
+# Ways of choosing the empty cell to fill in next.
+# The first empty cell, looking top-down, left-to-right.
+FIRST_EMPTY = 'first'
+# The empty cell where the fewest letters can go.
+MOST_CONSTRAINED = 'mrv'
+
+# Ways the solver can find the solutions of a puzzle.
+# Explore new puzzle states with extensions.
+EXTENSIONS = 'extensions'
+# Search by filling in and emptying the cells of one SudokuBoard.
+IN_PLACE = 'in_place'
+# Solve the puzzle as an exact cover problem with Dancing Links.
+EXACT_COVER = 'exact_cover'
+
+
+# For each n that has been used, the row, column and subsquare of each
+# cell of an n-by-n board, and the cells of each row, column and
+# subsquare. Cells are numbered row by row, from 0.
+_layouts = {}
+
+
+def _layout(n):
+    """Return the layout of an n-by-n board, as described for _layouts.
+
+    @type n: int
+    @rtype: (list[int], list[int], list[int], list[list[int]])
+    """
+    if n not in _layouts:
+        m = int(sqrt(n))
+        row_of = [index // n for index in range(n * n)]
+        col_of = [index % n for index in range(n * n)]
+        box_of = [row_of[index] // m * m + col_of[index] // m
+                  for index in range(n * n)]
+        units = [[i * n + j for j in range(n)] for i in range(n)]
+        units.extend([[i * n + j for i in range(n)] for j in range(n)])
+        units.extend([[(x + i) * n + y + j for i in range(m) for j in range(m)]
+                      for x in range(0, n, m) for y in range(0, n, m)])
+        _layouts[n] = (row_of, col_of, box_of, units)
+    return _layouts[n]
+
+
+class SudokuBoard:
+    """A Sudoku board that is changed in place, for searching.
+
+    A search fills in cells with apply and empties them again with undo,
+    instead of making a new board for each state it explores. Cells are
+    numbered row by row from 0, so the cell in row i and column j is
+    i * n + j, and letters are numbered from 0 for 'A'.
+
+    The board is a flat bytearray with 0 for an empty cell and k + 1 for
+    letter k. It also keeps a bitmask of the letters used in each row,
+    column and subsquare, where bit k stands for letter k, so the letters
+    that can go in an empty cell are the bits in none of its three masks.
+
+    >>> board = SudokuBoard([['A', 'B', 'C', 'D'], \
+                             ['C', 'D', 'A', 'B'], \
+                             ['B', 'A', '', ''], \
+                             ['D', 'C', '', '']])
+    >>> board.candidates(10)
+    8
+    >>> mark = board.mark()
+    >>> board.apply(10, 3)
+    >>> board.letter(2, 2)
+    'D'
+    >>> board.undo_to(mark)
+    >>> board.letter(2, 2)
+    ''
+    """
+    # === Private Attributes ===
+    # @type _n: int
+    #     The size of the board.
+    # @type _cells: bytearray
+    #     The letter number plus 1 of each cell, or 0 if it is empty.
+    # @type _rows: list[int]
+    #     The letters used in each row, as bitmasks.
+    # @type _cols: list[int]
+    #     The letters used in each column, as bitmasks.
+    # @type _boxes: list[int]
+    #     The letters used in each subsquare, as bitmasks. Subsquares are
+    #     numbered left-to-right, then top-down.
+    # @type _empty: int
+    #     The number of empty cells.
+    # @type _trail: list[int]
+    #     The cells filled in by apply that have not been undone, in the
+    #     order they were filled in.
+    # @type _row_of: list[int]
+    # @type _col_of: list[int]
+    # @type _box_of: list[int]
+    #     The row, column and subsquare of each cell.
+    # @type _units: list[list[int]]
+    #     The cells of each row, column and subsquare.
+
+    def __init__(self, grid):
+        """Create a board with the letters of <grid>, a list of rows where
+        each cell is a letter or '' for an empty cell.
+
+        @type self: SudokuBoard
+        @type grid: list[list[str]]
+        @rtype: None
+        """
+        self._n = len(grid)
+        self._row_of, self._col_of, self._box_of, self._units = \
+            _layout(self._n)
+        self._cells = bytearray(self._n * self._n)
+        self._rows = [0] * self._n
+        self._cols = [0] * self._n
+        self._boxes = [0] * self._n
+        self._empty = self._n * self._n
+        self._trail = []
+        for i in range(self._n):
+            for j in range(self._n):
+                if grid[i][j] != '':
+                    self.apply(i * self._n + j, CHARS.index(grid[i][j]))
+        self._trail = []
+
+    def __eq__(self, other):
+        """Return True if <self> and <other> have the same letters in the
+        same cells.
+
+        @type self: SudokuBoard
+        @type other: SudokuBoard
+        @rtype: bool
+        """
+        return self._cells == other._cells
+
+    def key(self):
+        """Return the letters of <self> as bytes, which are equal for two
+        boards exactly when the boards are equal.
+
+        A board changes as letters are applied and undone, so it is not
+        hashable itself; its key is a snapshot that is.
+
+        @type self: SudokuBoard
+        @rtype: bytes
+        """
+        return bytes(self._cells)
+
+    def copy(self):
+        """Return a new board with the same letters as <self>, and nothing
+        to undo.
+
+        @type self: SudokuBoard
+        @rtype: SudokuBoard
+        """
+        board = SudokuBoard.__new__(SudokuBoard)
+        board._n = self._n
+        board._row_of, board._col_of = self._row_of, self._col_of
+        board._box_of, board._units = self._box_of, self._units
+        board._cells = self._cells[:]
+        board._rows = self._rows[:]
+        board._cols = self._cols[:]
+        board._boxes = self._boxes[:]
+        board._empty = self._empty
+        board._trail = []
+        return board
+
+    def size(self):
+        """Return n, the number of rows of the board.
+
+        @type self: SudokuBoard
+        @rtype: int
+        """
+        return self._n
+
+    def letter(self, row_index, col_index):
+        """Return the letter in a cell, or '' if it is empty.
+
+        @type self: SudokuBoard
+        @type row_index: int
+        @type col_index: int
+        @rtype: str
+        """
+        value = self._cells[row_index * self._n + col_index]
+        if value == 0:
+            return ''
+        return CHARS[value - 1]
+
+    def is_full(self):
+        """Return True if no cell is empty.
+
+        @type self: SudokuBoard
+        @rtype: bool
+        """
+        return self._empty == 0
+
+    def is_solved(self):
+        """Return True if every row, column and subsquare has each of the
+        n letters once.
+
+        @type self: SudokuBoard
+        @rtype: bool
+        """
+        if self._empty > 0:
+            return False
+        # A full row, column or subsquare has all n letters exactly when
+        # its mask has all n bits.
+        full = (1 << self._n) - 1
+        for masks in (self._rows, self._cols, self._boxes):
+            for mask in masks:
+                if mask != full:
+                    return False
+        return True
+
+    def used(self, index):
+        """Return the bitmask of the letters in the row, column and
+        subsquare of cell <index>.
+
+        @type self: SudokuBoard
+        @type index: int
+        @rtype: int
+        """
+        return self._rows[self._row_of[index]] | \
+            self._cols[self._col_of[index]] | \
+            self._boxes[self._box_of[index]]
+
+    def candidates(self, index):
+        """Return the bitmask of the letters that can go in cell <index>.
+
+        @type self: SudokuBoard
+        @type index: int
+        @rtype: int
+        """
+        return ((1 << self._n) - 1) & ~self.used(index)
+
+    def apply(self, index, letter):
+        """Put letter number <letter> in the empty cell <index>.
+
+        @type self: SudokuBoard
+        @type index: int
+        @type letter: int
+        @rtype: None
+        """
+        bit = 1 << letter
+        self._cells[index] = letter + 1
+        self._rows[self._row_of[index]] |= bit
+        self._cols[self._col_of[index]] |= bit
+        self._boxes[self._box_of[index]] |= bit
+        self._empty -= 1
+        self._trail.append(index)
+
+    def undo(self):
+        """Empty the cell filled in by the last apply that has not been
+        undone.
+
+        @type self: SudokuBoard
+        @rtype: None
+        """
+        index = self._trail.pop()
+        bit = ~(1 << (self._cells[index] - 1))
+        self._cells[index] = 0
+        self._rows[self._row_of[index]] &= bit
+        self._cols[self._col_of[index]] &= bit
+        self._boxes[self._box_of[index]] &= bit
+        self._empty += 1
+
+    def mark(self):
+        """Return a mark that undo_to can take the board back to.
+
+        @type self: SudokuBoard
+        @rtype: int
+        """
+        return len(self._trail)
+
+    def undo_to(self, mark):
+        """Undo every apply since mark() returned <mark>.
+
+        @type self: SudokuBoard
+        @type mark: int
+        @rtype: None
+        """
+        while len(self._trail) > mark:
+            self.undo()
+
+    def choose_cell(self, strategy=FIRST_EMPTY):
+        """Return the empty cell to fill in next, or None if there is none.
+
+        With FIRST_EMPTY, this is the first empty cell. With
+        MOST_CONSTRAINED, it is the empty cell where the fewest letters
+        can go. Ties go to the cell with the most empty cells in its row,
+        its column and its subsquare, added up, since filling it in
+        constrains the most other cells, and then to the first cell. A
+        cell where no letter can go is returned straight away.
+
+        @type self: SudokuBoard
+        @type strategy: str
+        @rtype: int | None
+        """
+        if self._empty == 0:
+            return None
+        if strategy == FIRST_EMPTY:
+            return self._cells.index(0)
+
+        row_empty = [0] * self._n
+        col_empty = [0] * self._n
+        box_empty = [0] * self._n
+        cells = []
+        for index in range(self._n * self._n):
+            if self._cells[index] == 0:
+                row_empty[self._row_of[index]] += 1
+                col_empty[self._col_of[index]] += 1
+                box_empty[self._box_of[index]] += 1
+                cells.append(index)
+        best, best_key = None, None
+        for index in cells:
+            count = bin(self.candidates(index)).count('1')
+            if count == 0:
+                return index
+            key = (count, -(row_empty[self._row_of[index]] +
+                            col_empty[self._col_of[index]] +
+                            box_empty[self._box_of[index]]))
+            if best_key is None or key < best_key:
+                best, best_key = index, key
+        return best
+
+    def fill_singles(self):
+        """Fill in every forced cell, with apply.
+
+        A cell is forced if it is the only empty cell of its row, column or
+        subsquare where some letter can go (a hidden single), or if only
+        one letter can go in it (a naked single). Filling in one forced
+        cell can force others, so this repeats until no cell is forced.
+
+        Return False, possibly after filling in some cells, if some cell
+        can never be filled, and True otherwise.
+
+        @type self: SudokuBoard
+        @rtype: bool
+        """
+        full = (1 << self._n) - 1
+        cells, rows, cols, boxes = \
+            self._cells, self._rows, self._cols, self._boxes
+        row_of, col_of, box_of = self._row_of, self._col_of, self._box_of
+        changed = True
+        while changed and self._empty > 0:
+            changed = False
+            # Naked singles
+            for index in range(self._n * self._n):
+                if cells[index] == 0:
+                    free = full & ~(rows[row_of[index]] | cols[col_of[index]] |
+                                    boxes[box_of[index]])
+                    if free == 0:
+                        return False
+                    if free & (free - 1) == 0:
+                        self.apply(index, free.bit_length() - 1)
+                        changed = True
+            # Hidden singles
+            for unit in self._units:
+                # The letters that can go in at least one and at least two
+                # empty cells of the unit, and the letters already in it.
+                once, twice, placed = 0, 0, 0
+                for index in unit:
+                    if cells[index] == 0:
+                        free = full & ~(rows[row_of[index]] |
+                                        cols[col_of[index]] |
+                                        boxes[box_of[index]])
+                        twice |= once & free
+                        once |= free
+                    else:
+                        placed |= 1 << (cells[index] - 1)
+                if (once | placed) & full != full:
+                    # Some letter can go nowhere in the unit.
+                    return False
+                singles = once & ~twice
+                if singles == 0:
+                    continue
+                for index in unit:
+                    if cells[index] == 0:
+                        bit = singles & self.candidates(index)
+                        if bit & (bit - 1) != 0:
+                            # Two letters can only go in this cell.
+                            return False
+                        if bit != 0:
+                            self.apply(index, bit.bit_length() - 1)
+                            changed = True
+        return True
+
+    def is_consistent(self):
+        """Return whether no row, column or subsquare has a letter twice or
+        a letter beyond the n-th.
+
+        @type self: SudokuBoard
+        @rtype: bool
+        """
+        full = (1 << self._n) - 1
+        filled = [[0] * self._n for _ in range(3)]
+        for index in range(self._n * self._n):
+            if self._cells[index] != 0:
+                filled[0][self._row_of[index]] += 1
+                filled[1][self._col_of[index]] += 1
+                filled[2][self._box_of[index]] += 1
+        masks = (self._rows, self._cols, self._boxes)
+        for kind in range(3):
+            for unit in range(self._n):
+                mask = masks[kind][unit]
+                if mask & ~full != 0 or \
+                        bin(mask).count('1') != filled[kind][unit]:
+                    return False
+        return True
+
+    def exact_cover(self):
+        """Return the exact cover problem whose solutions are the ways of
+        filling in the empty cells of the board.
+
+        There is a column for each empty cell and for each letter missing
+        from each row, column and subsquare, and a row for each letter
+        that can go in each empty cell. Rows are labelled with the pair
+        (cell, letter).
+
+        Precondition: the board is consistent.
+
+        @type self: SudokuBoard
+        @rtype: ExactCover
+        """
+        # The number of each column, keyed by (kind, unit, letter), where
+        # the kinds are 0 to 2 for rows, columns and subsquares, and by
+        # cell for the cells.
+        columns = {}
+        masks = (self._rows, self._cols, self._boxes)
+        for kind in range(3):
+            for unit in range(self._n):
+                for letter in range(self._n):
+                    if not masks[kind][unit] >> letter & 1:
+                        columns[(kind, unit, letter)] = len(columns)
+        rows = []
+        for index in range(self._n * self._n):
+            if self._cells[index] == 0:
+                columns[index] = len(columns)
+                free = self.candidates(index)
+                for letter in range(self._n):
+                    if free >> letter & 1:
+                        rows.append(((index, letter), [
+                            columns[index],
+                            columns[(0, self._row_of[index], letter)],
+                            columns[(1, self._col_of[index], letter)],
+                            columns[(2, self._box_of[index], letter)]]))
+        return ExactCover(len(columns), rows)
+
 
 class SudokuPuzzle(Puzzle):
-    """Implementation of a Sudoku puzzle."""
+    """Implementation of a Sudoku puzzle.
+
+    The state of a puzzle is a SudokuBoard, which the puzzle never
+    changes. New states copy the board and fill in one cell.
+
+    A puzzle made with <propagate> fills in the cells that are forced after
+    every move in its extensions (see SudokuBoard.fill_singles).
+    Extensions that leave a cell with no possible letter are dropped.
+
+    A puzzle made with strategy MOST_CONSTRAINED branches on the empty cell
+    where the fewest letters can go, instead of the first empty cell (see
+    SudokuBoard.choose_cell). Every state made from a puzzle counts the
+    nodes expanded by searches of them all, so nodes_expanded tells how
+    much work a search did.
+
+    A puzzle made with engine IN_PLACE or EXACT_COVER is solved by its
+    iter_solutions method instead of by exploring extensions. IN_PLACE
+    searches by filling in and emptying the cells of a single SudokuBoard,
+    with the same strategy and propagation as extensions, so new puzzle
+    states are only made for solutions. EXACT_COVER uses Dancing Links.
+    """
     # === Private Attributes ===
     # @type _n: int
     #     The size of the board. Must be 4, 9, 16, or 25.
-    # @type _grid: list[list[str]]
-    #     A representation of the Sudoku grid. Consists of a list of lists,
-    #     where each inner list represents a row of the grid.
-    #
-    #     Each item of the inner list is either an uppercase letter,
-    #     or is the empty string '', representing an empty square.
-    #     Each letter must be between 'A' and the n-th letter of the alphabet.
-    def __init__(self, grid):
+    # @type _board: SudokuBoard
+    #     The letters on the board. Never changed.
+    # @type _propagate: bool
+    #     Whether extensions fill in forced cells.
+    # @type _strategy: str
+    #     How extensions chooses the cell to fill in: FIRST_EMPTY or
+    #     MOST_CONSTRAINED.
+    # @type _engine: str
+    #     How the solver finds solutions: EXTENSIONS, IN_PLACE or
+    #     EXACT_COVER.
+    # @type _expanded: list[int]
+    #     A list holding the number of nodes expanded by searches of this
+    #     state and the other states made from the same puzzle. Shared by
+    #     all of them.
+    def __init__(self, grid, propagate=False, strategy=FIRST_EMPTY,
+                 engine=EXTENSIONS):
         """Create a new Sudoku puzzle with an initial grid 'grid'.
 
         Precondition: <grid> is a valid Sudoku grid.
 
         @type self: SudokuPuzzle
         @type grid: list[list[str]]
+        @type propagate: bool
+            Whether extensions fill in forced cells.
+        @type strategy: str
+            FIRST_EMPTY or MOST_CONSTRAINED.
+        @type engine: str
+            EXTENSIONS, IN_PLACE or EXACT_COVER.
         @rtype: None
         """
         self._n = len(grid)
-        self._grid = grid
+        self._board = SudokuBoard(grid)
+        self._propagate = propagate
+        self._strategy = strategy
+        self._engine = engine
+        self._expanded = [0]
 
     def __str__(self):
         """Return a human-readable string representation of <self>.
@@ -88,7 +564,7 @@ class SudokuPuzzle(Puzzle):
             # Row label
             s += str(i % 10) + '|'
             for j in range(self._n):
-                cell = self._grid[i][j]
+                cell = self._board.letter(i, j)
                 if cell == '':
                     s += ' '
                 else:
@@ -127,41 +603,14 @@ class SudokuPuzzle(Puzzle):
         >>> s.is_solved()
         False
         """
-        # Check for empty cells
-        for row in self._grid:
-            if '' in row:
-                return False
-
-        # Check rows
-        for row in self._grid:
-            if sorted(row) != list(CHARS[:self._n]):
-                return False
-
-        # Check cols
-        for i in range(self._n):
-            # Note the use of a list comprehension here.
-            if sorted([row[i] for row in self._grid]) != list(CHARS[:self._n]):
-                return False
-
-        # Check all subsquares
-        m = int(sqrt(self._n))
-        for x in range(0, self._n, m):
-            for y in range(0, self._n, m):
-                items = [self._grid[x + i][y + j]
-                         for i in range(m)
-                         for j in range(m)]
-
-                if sorted(items) != list(CHARS[:self._n]):
-                    return False
-
-        # All checks passed
-        return True
+        return self._board.is_solved()
 
     def extensions(self):
         """Return list of extensions of <self>.
 
         This method picks the first empty cell (looking top-down,
-        left-to-right) and returns a list of the new puzzle states
+        left-to-right), or the most constrained one with strategy
+        MOST_CONSTRAINED, and returns a list of the new puzzle states
         obtained by filling in the empty cell with one of the
         available letters that does not violate any of the constraints
         listed in the problem description. (E.g., if there is
@@ -170,6 +619,10 @@ class SudokuPuzzle(Puzzle):
 
         If there are no empty cells, returns an empty list.
 
+        If <self> was made with propagate, each new state also has its
+        forced cells filled in, and states with a cell where no letter
+        can go are left out.
+
         @type self: SudokuPuzzle
         @rtype: list[SudokuPuzzle]
 
@@ -190,21 +643,54 @@ class SudokuPuzzle(Puzzle):
         3|DC|
         <BLANKLINE>
         """
-        # Search for the first empty cell
-        row_index, col_index = None, None
-        for i in range(self._n):
-            row = self._grid[i]
-            if '' in row:
-                row_index, col_index = i, row.index('')
-                break
-
-        if row_index is None:
+        self._expanded[0] += 1
+        index = self._board.choose_cell(self._strategy)
+        if index is None:
             return []
-        else:
-            # Calculate possible letter to fill the empty cell
-            letters = self._possible_letters(row_index, col_index)
-            return [self._extend(letter, row_index, col_index)
-                    for letter in letters]
+        # Calculate possible letter to fill the empty cell
+        letters = self._possible_letters(index // self._n, index % self._n)
+        states = [self._extend(letter, index // self._n, index % self._n)
+                  for letter in letters]
+        if self._propagate:
+            states = [state for state in states
+                      if state._board.fill_singles()]
+        return states
+
+    def propagate(self):
+        """Return a new state with every forced cell of <self> filled in,
+        or None if some cell of <self> can never be filled.
+
+        A cell is forced if it is the only empty cell of its row, column or
+        subsquare where some letter can go, or if only one letter can go in
+        it. Filling in one forced cell can force others, so this repeats
+        until no cell is forced.
+
+        @type self: SudokuPuzzle
+        @rtype: SudokuPuzzle | None
+
+        >>> s = SudokuPuzzle([['A', '', 'C', 'D'], \
+                              ['C', 'D', '', 'B'], \
+                              ['B', '', 'D', ''], \
+                              ['', 'C', '', '']])
+        >>> print(s.propagate())
+          01|23
+         ------
+        0|AB|CD
+        1|CD|AB
+         ------
+        2|BA|DC
+        3|DC|BA
+        <BLANKLINE>
+        >>> print(SudokuPuzzle([['A', 'B', '', ''], \
+                                ['', '', '', ''], \
+                                ['', '', 'C', ''], \
+                                ['', '', 'D', '']]).propagate())
+        None
+        """
+        board = self._board.copy()
+        if board.fill_singles():
+            return self._make_state(board)
+        return None
 
     def move(self, move):
         """Return a new puzzle state specified by making the given move.
@@ -216,52 +702,10 @@ class SudokuPuzzle(Puzzle):
         @type move: str
         @rtype: SudokuPuzzle
         """
-        move = move.replace('(', '')
-        move = move.replace(')', '')
-        move = move.replace('-', '')
-        move = move.replace('>', '')
-        move = move.replace(',', '')
-        move = move.split()
-        try:
-            row = int(move[0])
-        except ValueError:
-            raise ValueError
-        try:
-            col = int(move[1])
-        except ValueError:
-            raise ValueError
-        # out of range
-        if row < 0 or row >= self._n:
-            raise ValueError
-        if col < 0 or col >= self._n:
+        row, col, letter = self._parse_move(move)
+        if not self._fits(letter, row, col):
             raise ValueError
-
-        letter = move[-1]
-        if letter not in CHARS:
-            raise ValueError
-        # check for letter's existence in row
-        if letter in self._grid[row]:
-            raise ValueError
-        # check for letter's existence in col
-        for rows in self._grid:
-            if rows[col] == letter:
-                raise ValueError
-        # check for letter's existence in sub square
-        m = int(sqrt(self._n))
-        for x in range(0, self._n, m):
-            for y in range(0, self._n, m):
-                if 0 <= (row - x) < m and 0 <= (col - y) < m:
-                    for i in range(m):
-                        for j in range(m):
-                            if self._grid[x+i][y+j] == letter:
-                                raise ValueError
-
-        if not self._grid[row][col] == '':
-            raise ValueError
-
-        new_state = [row.copy() for row in self._grid]
-        new_state[row][col] = letter
-        return SudokuPuzzle(new_state)
+        return self._extend(letter, row, col)
 
     def is_valid(self, move):
         """Return True if the given move is valid,
@@ -271,66 +715,129 @@ class SudokuPuzzle(Puzzle):
         @type move: str
         @rtype: bool
         """
-        move = move.replace('(', '')
-        move = move.replace(')', '')
-        move = move.replace('-', '')
-        move = move.replace('>', '')
-        move = move.replace(',', '')
-        move = move.split()
-        try:
-            row = int(move[0])
-        except ValueError:
-            return False
         try:
-            col = int(move[1])
+            row, col, letter = self._parse_move(move)
         except ValueError:
             return False
-
-        if row < 0 or row >= self._n:
-            return False
-        if col < 0 or col >= self._n:
-            return False
-
-        letter = move[-1]
-        if letter not in CHARS:
-            return False
-        # check for letter's existence in row
-        if letter in self._grid[row]:
-            return False
-        # check for letter's existence in col
-        for rows in self._grid:
-            if rows[col] == letter:
-                return False
-        # check for letter's existence in sub square
-        m = int(sqrt(self._n))
-        for x in range(0, self._n, m):
-            for y in range(0, self._n, m):
-                if 0 <= (row - x) < m and 0 <= (col - y) < m:
-                    for i in range(m):
-                        for j in range(m):
-                            if self._grid[x+i][y+j] == letter:
-                                return False
-
-        if not self._grid[row][col] == '':
-            return False
-        return True
+        return self._fits(letter, row, col)
 
     def __eq__(self, other):
-        """Return True if the two puzzle objects have the same _grid.
+        """Return True if the two puzzle objects have the same letters in
+        the same cells.
         Return False if they are different.
 
         @type self: SudokuPuzzle
         @type other: SudokuPuzzle
         @rtype: bool
         """
-        if not self._n == other._n:
-            return False
+        return self._n == other._n and self._board == other._board
+
+    def key(self):
+        """Return a canonical key for <self>: the letters of its board, as
+        bytes.
+
+        @type self: SudokuPuzzle
+        @rtype: bytes
+
+        >>> s = SudokuPuzzle([['A', 'B', 'C', 'D'],
+        ...                   ['C', 'D', 'A', 'B'],
+        ...                   ['B', 'A', '', ''],
+        ...                   ['D', 'C', '', '']])
+        >>> s.move('(2, 2) -> D').key() == s.extensions()[0].key()
+        True
+        >>> len({s.move('(2, 2) -> D'), s.extensions()[0], s})
+        2
+        """
+        return self._board.key()
+
+    def __hash__(self):
+        """Return a hash of <self>, consistent with __eq__.
+
+        @type self: SudokuPuzzle
+        @rtype: int
+        """
+        return hash(self.key())
+
+    def solves_itself(self):
+        """Return whether the solver should use iter_solutions, i.e. whether
+        <self> was made with engine IN_PLACE or EXACT_COVER.
+
+        @type self: SudokuPuzzle
+        @rtype: bool
+        """
+        return self._engine != EXTENSIONS
+
+    def iter_solutions(self, limit=None):
+        """Yield the solved states that can be reached from <self>, stopping
+        after <limit> of them if <limit> is not None.
+
+        With engine EXACT_COVER, the puzzle is solved as an exact cover
+        problem (see SudokuBoard.exact_cover). Otherwise a depth-first
+        search fills in and empties the cells of one SudokuBoard, choosing
+        cells and propagating like extensions. It finds the same solutions
+        as exploring extensions, in depth-first order.
+
+        Solutions are found one at a time, so a caller checking that a
+        puzzle has exactly one solution can pass limit=2.
+
+        @type self: SudokuPuzzle
+        @type limit: int | None
+        @rtype: generator[SudokuPuzzle]
+
+        >>> s = SudokuPuzzle([['A', 'B', '', ''], \
+                              ['C', 'D', '', ''], \
+                              ['B', '', '', ''], \
+                              ['D', '', 'A', '']])
+        >>> len(list(s.iter_solutions()))
+        2
+        >>> len(list(s.iter_solutions(limit=1)))
+        1
+        """
+        if limit is not None and limit <= 0:
+            return
+        if self._engine == EXACT_COVER:
+            if not self._board.is_consistent():
+                return
+            problem = self._board.exact_cover()
+            # The nodes of the problem that have been added to _expanded.
+            counted = 0
+            try:
+                for solution in problem.iter_solutions(limit):
+                    self._expanded[0] += problem.nodes_expanded() - counted
+                    counted = problem.nodes_expanded()
+                    board = self._board.copy()
+                    for index, letter in solution:
+                        board.apply(index, letter)
+                    yield self._make_state(board)
+            finally:
+                self._expanded[0] += problem.nodes_expanded() - counted
         else:
-            for i in range(self._n):
-                for j in range(self._n):
-                    if not self._grid[i][j] == other._grid[i][j]:
-                        return False
-            return True
+            found = 0
+            for board in self._search_in_place():
+                yield self._make_state(board.copy())
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+
+    def nodes_expanded(self):
+        """Return the number of nodes expanded by searches of <self> and the
+        other states made from the same puzzle: calls of extensions, and
+        states whose cells iter_solutions branched on. With engine
+        EXACT_COVER, the nodes are those of the Dancing Links search (see
+        ExactCover.nodes_expanded), where a branch can be on a letter of a
+        row, column or subsquare as well as on a cell.
+
+        @type self: SudokuPuzzle
+        @rtype: int
+
+        >>> s = SudokuPuzzle([['A', 'B', 'C', 'D'], \
+                              ['C', 'D', 'A', 'B'], \
+                              ['B', 'A', '', ''], \
+                              ['D', 'C', '', '']])
+        >>> s.extensions()[0].extensions()[0].nodes_expanded()
+        2
+        """
+        return self._expanded[0]
 
     def hint_generator(self, puzzle):
         """Compare two state of the puzzle and generate a valid hint of move.
@@ -340,8 +847,8 @@ class SudokuPuzzle(Puzzle):
         """
         for i in range(self._n):
             for j in range(self._n):
-                if not self._grid[i][j] == puzzle._grid[i][j]:
-                    chara = puzzle._grid[i][j]
+                if not self._board.letter(i, j) == puzzle._board.letter(i, j):
+                    chara = puzzle._board.letter(i, j)
                     return '(' + str(i) + ', ' + str(j) + ') ' + '-> ' + chara
         return 'Hint Not Available'
 
@@ -360,30 +867,8 @@ class SudokuPuzzle(Puzzle):
         @type col_index: int
         @rtype: list[str]
         """
-        lst = list(CHARS[:self._n])
-        for letter in self._grid[row_index]:
-            try:
-                lst.remove(letter)
-            except ValueError:
-                pass
-
-        for row in self._grid:
-            try:
-                lst.remove(row[col_index])
-            except ValueError:
-                pass
-
-        m = int(sqrt(self._n))
-        for x in range(0, self._n, m):
-            for y in range(0, self._n, m):
-                if 0 <= (row_index - x) < m and 0 <= (col_index - y) < m:
-                    for i in range(m):
-                        for j in range(m):
-                            try:
-                                lst.remove(self._grid[x+i][y+j])
-                            except ValueError:
-                                pass
-        return lst
+        free = self._board.candidates(row_index * self._n + col_index)
+        return [CHARS[k] for k in range(self._n) if free >> k & 1]
 
     def _extend(self, letter, row_index, col_index):
         """Return a new Sudoku puzzle obtained after one move.
@@ -415,9 +900,120 @@ class SudokuPuzzle(Puzzle):
         3|DC|
         <BLANKLINE>
         """
-        new_grid = [row.copy() for row in self._grid]
-        new_grid[row_index][col_index] = letter
-        return SudokuPuzzle(new_grid)
+        board = self._board.copy()
+        board.apply(row_index * self._n + col_index, CHARS.index(letter))
+        return self._make_state(board)
+
+    def _make_state(self, board):
+        """Return a new state of the same puzzle as <self>, with board
+        <board>.
+
+        The new state has the same settings as <self>, and shares its
+        count of expanded nodes. <board> must not be changed afterwards.
+
+        @type self: SudokuPuzzle
+        @type board: SudokuBoard
+        @rtype: SudokuPuzzle
+        """
+        state = SudokuPuzzle.__new__(SudokuPuzzle)
+        state._n = self._n
+        state._board = board
+        state._propagate = self._propagate
+        state._strategy = self._strategy
+        state._engine = self._engine
+        state._expanded = self._expanded
+        return state
+
+    # ------------------------------------------------------------------------
+    # Helpers for method 'iter_solutions'
+    # ------------------------------------------------------------------------
+
+    def _search_in_place(self):
+        """Yield a board for each solution reachable from <self>, in
+        depth-first order.
+
+        The same board is yielded each time, filled in with the solution,
+        and changed again when the search resumes.
+
+        @type self: SudokuPuzzle
+        @rtype: generator[SudokuBoard]
+        """
+        board = self._board.copy()
+        if self._propagate and not board.fill_singles():
+            return
+        # For each cell being branched on: the cell, the letters still to
+        # try in it, and the mark to undo to before trying one.
+        stack = []
+        expand = True
+        while True:
+            if expand:
+                self._expanded[0] += 1
+                index = board.choose_cell(self._strategy)
+                if index is None:
+                    if board.is_solved():
+                        yield board
+                else:
+                    stack.append((index, board.candidates(index),
+                                  board.mark()))
+            if len(stack) == 0:
+                return
+            index, letters, mark = stack[-1]
+            board.undo_to(mark)
+            if letters == 0:
+                stack.pop()
+                expand = False
+                continue
+            bit = letters & -letters
+            stack[-1] = (index, letters & ~bit, mark)
+            board.apply(index, bit.bit_length() - 1)
+            expand = not self._propagate or board.fill_singles()
+
+    # ------------------------------------------------------------------------
+    # Helpers for methods 'move' and 'is_valid'
+    # ------------------------------------------------------------------------
+
+    def _parse_move(self, move):
+        """Return the row, column and letter of the move written as <move>,
+        e.g. '(2, 3) -> A'.
+
+        Raise a ValueError if <move> is not a move on this board.
+
+        @type self: SudokuPuzzle
+        @type move: str
+        @rtype: (int, int, str)
+        """
+        move = move.replace('(', '')
+        move = move.replace(')', '')
+        move = move.replace('-', '')
+        move = move.replace('>', '')
+        move = move.replace(',', '')
+        move = move.split()
+        row = int(move[0])
+        col = int(move[1])
+        # out of range
+        if row < 0 or row >= self._n:
+            raise ValueError
+        if col < 0 or col >= self._n:
+            raise ValueError
+        letter = move[-1]
+        if len(letter) != 1 or letter not in CHARS:
+            raise ValueError
+        return row, col, letter
+
+    def _fits(self, letter, row_index, col_index):
+        """Return True if <letter> can go in the cell at (row_index,
+        col_index): the cell is empty, and <letter> is not in its row,
+        column or subsquare.
+
+        @type self: SudokuPuzzle
+        @type letter: str
+        @type row_index: int
+        @type col_index: int
+        @rtype: bool
+        """
+        bit = 1 << CHARS.index(letter)
+        return self._board.letter(row_index, col_index) == '' and \
+            self._board.used(row_index * self._n + col_index) & bit == 0
 
 
 if __name__ == '__main__':
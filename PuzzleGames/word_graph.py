@@ -0,0 +1,337 @@
+# Assignment 2 - Puzzle Game
+#
+# CSC148 Fall 2015, University of Toronto
+# Instructor: David Liu
+# ---------------------------------------------
+"""Word graph cache module.
+
+Building the one-letter neighbours of every word in a big dictionary takes
+seconds. This module saves them once to a binary cache file next to the
+dictionary, and memory-maps the cache on later starts, so loading takes
+milliseconds and the pages are shared by every process using the same
+dictionary.
+
+Cache file format
+-----------------
+All integers are unsigned 32-bit, in the byte order of the machine that
+wrote the file.
+
+    magic          8 bytes, MAGIC
+    byte order     1 byte, b'l' or b'b'
+    digest         32 bytes, SHA-256 of the dictionary file
+    group count    integer
+
+then, for each word length, a group:
+
+    length         integer, the length of the words in the group
+    word count     integer, n
+    edge count     integer, m
+    words          n * length bytes, the words in alphabetical order
+    padding        0-3 zero bytes, so the arrays below are aligned
+    offsets        n + 1 integers
+    neighbours     m integers
+
+The neighbours of word i of a group are the words whose numbers are
+neighbours[offsets[i]:offsets[i + 1]], in increasing order. This is the
+compressed sparse row (CSR) layout of the group's graph.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+MAGIC = b'WLGRAPH1'
+# The end of a cache file name, after the dictionary file name.
+SUFFIX = '.wlgraph'
+
+_INT = struct.Struct('=I')
+_GROUP = struct.Struct('=III')
+_HEADER_SIZE = len(MAGIC) + 1 + 32 + _INT.size
+
+# The WordGraph of each cache file that has been opened in this process,
+# keyed by file name.
+_graphs = {}
+
+
+def dictionary_digest(filename):
+    """Return the SHA-256 digest of the file <filename>.
+
+    @type filename: str
+    @rtype: bytes
+    """
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 16), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def write_graph(filename, index, digest):
+    """Write the word graph of WordIndex <index> to the cache file
+    <filename>, labelled with the dictionary digest <digest>.
+
+    The file is written under a temporary name and then renamed, so a
+    process reading the cache never sees a half-written file.
+
+    Precondition: every word in <index> is ASCII.
+
+    @type filename: str
+    @type index: WordIndex
+    @type digest: bytes
+    @rtype: None
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    handle, temp_name = tempfile.mkstemp(dir=directory, suffix=SUFFIX)
+    try:
+        with os.fdopen(handle, 'wb') as file:
+            file.write(MAGIC)
+            file.write(sys.byteorder[0].encode())
+            file.write(digest)
+            lengths = index.lengths()
+            file.write(_INT.pack(len(lengths)))
+            for length in lengths:
+                words = index.words_of_length(length)
+                numbers = {}
+                for i in range(len(words)):
+                    numbers[words[i]] = i
+                offsets = array('I', [0])
+                neighbours = array('I')
+                for word in words:
+                    neighbours.extend(numbers[neighbour]
+                                      for neighbour in index.neighbours(word))
+                    offsets.append(len(neighbours))
+                file.write(_GROUP.pack(length, len(words), len(neighbours)))
+                file.write(''.join(words).encode('ascii'))
+                file.write(b'\0' * (-file.tell() % _INT.size))
+                offsets.tofile(file)
+                neighbours.tofile(file)
+        os.replace(temp_name, filename)
+    except BaseException:
+        os.remove(temp_name)
+        raise
+
+
+class WordGraph:
+    """The words of a dictionary and their one-letter neighbours, read from
+    a memory-mapped cache file.
+
+    A WordGraph can be used wherever a WordIndex is used.
+    """
+    # === Private Attributes ===
+    # @type _filename: str
+    #     The cache file.
+    # @type _digest: bytes
+    #     The digest of the dictionary the cache file was built from.
+    # @type _map: mmap.mmap
+    #     The memory-mapped cache file.
+    # @type _groups: dict[int, (int, int, memoryview, memoryview)]
+    #     For each word length, the number of words, the position of the
+    #     first word in the file, and the offsets and neighbours arrays.
+
+    def __init__(self, filename, digest=None):
+        """Open the cache file <filename>.
+
+        Raise a ValueError if the file is not a cache file written on a
+        machine with this byte order, or if <digest> is given and is not
+        the digest the file was written with.
+
+        @type self: WordGraph
+        @type filename: str
+        @type digest: bytes | None
+        @rtype: None
+        """
+        self._filename = filename
+        with open(filename, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        data = self._map
+        if data[:len(MAGIC)] != MAGIC or \
+                data[len(MAGIC):len(MAGIC) + 1] != sys.byteorder[0].encode():
+            raise ValueError(filename + ' is not a word graph cache file')
+        self._digest = data[len(MAGIC) + 1:_HEADER_SIZE - _INT.size]
+        if digest is not None and self._digest != digest:
+            raise ValueError(filename + ' was built from another dictionary')
+
+        view = memoryview(data)
+        self._groups = {}
+        position = _HEADER_SIZE
+        try:
+            groups = _INT.unpack_from(data, _HEADER_SIZE - _INT.size)[0]
+            for _ in range(groups):
+                length, count, edges = _GROUP.unpack_from(data, position)
+                words_start = position + _GROUP.size
+                position = words_start + count * length
+                position += -position % _INT.size
+                offsets_end = position + (count + 1) * _INT.size
+                neighbours_end = offsets_end + edges * _INT.size
+                if neighbours_end > len(data):
+                    raise ValueError(filename + ' is truncated')
+                self._groups[length] = (
+                    count, words_start,
+                    view[position:offsets_end].cast('I'),
+                    view[offsets_end:neighbours_end].cast('I'))
+                position = neighbours_end
+        except struct.error:
+            raise ValueError(filename + ' is truncated')
+
+    def __reduce__(self):
+        """Pickle <self> as the name of its cache file, so that another
+        process maps the file itself instead of receiving a copy, or uses
+        the WordGraph it already has for the file (see open_graph).
+
+        @type self: WordGraph
+        @rtype: (callable, (str,))
+        """
+        return open_graph, (self._filename,)
+
+    def __contains__(self, word):
+        """Return True if <word> is in the dictionary.
+
+        @type self: WordGraph
+        @type word: str
+        @rtype: bool
+        """
+        return self._number(word) is not None
+
+    def neighbours(self, word):
+        """Return the words in the dictionary that differ from <word> in
+        exactly one letter, in alphabetical order.
+
+        <word> itself does not have to be in the dictionary.
+
+        @type self: WordGraph
+        @type word: str
+        @rtype: list[str]
+        """
+        number = self._number(word)
+        if number is None:
+            # Not in the graph, so try every one-letter change.
+            found = []
+            for i in range(len(word)):
+                for char in 'abcdefghijklmnopqrstuvwxyz':
+                    new = word[:i] + char + word[i + 1:]
+                    if new != word and new in self:
+                        found.append(new)
+            return sorted(found)
+        count, words_start, offsets, neighbours = self._groups[len(word)]
+        return [self._word(len(word), neighbours[i])
+                for i in range(offsets[number], offsets[number + 1])]
+
+    def lengths(self):
+        """Return the lengths of the words in the dictionary, in increasing
+        order.
+
+        @type self: WordGraph
+        @rtype: list[int]
+        """
+        return sorted(self._groups)
+
+    def words_of_length(self, length):
+        """Return the words of length <length> in alphabetical order.
+
+        @type self: WordGraph
+        @type length: int
+        @rtype: list[str]
+        """
+        if length not in self._groups:
+            return []
+        return [self._word(length, number)
+                for number in range(self._groups[length][0])]
+
+    def _word(self, length, number):
+        """Return word <number> of the words of length <length>.
+
+        @type self: WordGraph
+        @type length: int
+        @type number: int
+        @rtype: str
+        """
+        start = self._groups[length][1] + number * length
+        return self._map[start:start + length].decode('ascii')
+
+    def _number(self, word):
+        """Return the number of <word> among the words of its length, or
+        None if it is not in the dictionary.
+
+        The words are stored in alphabetical order, so this is a binary
+        search.
+
+        @type self: WordGraph
+        @type word: str
+        @rtype: int | None
+        """
+        if len(word) not in self._groups:
+            return None
+        try:
+            key = word.encode('ascii')
+        except UnicodeEncodeError:
+            return None
+        length = len(word)
+        count, words_start = self._groups[length][:2]
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            start = words_start + middle * length
+            if self._map[start:start + length] < key:
+                low = middle + 1
+            else:
+                high = middle
+        start = words_start + low * length
+        if low < count and self._map[start:start + length] == key:
+            return low
+        return None
+
+
+def open_graph(filename):
+    """Return the WordGraph of the cache file <filename>.
+
+    The file is only mapped the first time it is opened in this process,
+    here or by load_graph; later calls return the same WordGraph. Pickled
+    WordGraphs are loaded with this, so a word ladder sent to another
+    process shares the WordGraph that word_index returns there.
+
+    @type filename: str
+    @rtype: WordGraph
+    """
+    if filename not in _graphs:
+        _graphs[filename] = WordGraph(filename)
+    return _graphs[filename]
+
+
+def load_graph(filename, build_index):
+    """Return a WordGraph for the dictionary file <filename>, building its
+    cache file first if it is missing or out of date.
+
+    The cache is the file <filename> + SUFFIX. When the cache must be
+    built, <build_index> is called with <filename> to get the WordIndex to
+    build it from. If the cache cannot be used, e.g. because the dictionary
+    has words that are not ASCII or the cache cannot be written, that
+    WordIndex is returned instead.
+
+    A cache file that is up to date and already open in this process is
+    not mapped again (see open_graph).
+
+    @type filename: str
+    @type build_index: callable
+    @rtype: WordGraph | WordIndex
+    """
+    cache_name = filename + SUFFIX
+    digest = dictionary_digest(filename)
+    graph = _graphs.get(cache_name)
+    if graph is not None and graph._digest == digest:
+        return graph
+    try:
+        graph = WordGraph(cache_name, digest)
+    except (OSError, ValueError):
+        index = build_index(filename)
+        if not index.is_ascii():
+            return index
+        try:
+            write_graph(cache_name, index, digest)
+            graph = WordGraph(cache_name, digest)
+        except (OSError, ValueError):
+            return index
+    _graphs[cache_name] = graph
+    return graph
@@ -34,9 +34,9 @@ Example:
     exists for the above puzzle. Do you see it? make cake care cure
 
 Implementation details:
-- We have provided some starter code in the constructor which reads in a list
-  of valid English words from wordsEn.txt. You should use this list to
-  determine what moves are valid.
+- The list of valid English words is read from a dictionary file once per
+  process, into a WordIndex shared by every puzzle state that uses it.
+  The index is used to determine what moves are valid.
 - **WARNING**: unlike Sudoku, Word Ladder has the possibility of getting
   into infinite recursion if you aren't careful. The puzzle state
   should keep track not just of the current word, but all words
@@ -44,49 +44,209 @@ Implementation details:
   return the possible new words which haven't already been used.
 """
 from puzzle import Puzzle
+from word_graph import load_graph
 
 
 CHARS = 'abcdefghijklmnopqrstuvwxyz'
 
+# The dictionary file used by puzzles that are not given a WordIndex.
+WORDS_FILE = 'wordsEnTest.txt'
+
+
+class WordIndex:
+    """The words of a dictionary, indexed for building word ladders.
+
+    Words are bucketed by length. For each length, every word is also put in
+    one wildcard bucket per letter, e.g. 'care' is in '_are', 'c_re', 'ca_e'
+    and 'car_'. The one-letter neighbours of a word are the other words in
+    its wildcard buckets. Wildcard buckets are built the first time a word of
+    that length is looked up, and neighbours are cached per word.
+
+    >>> index = WordIndex(['care', 'cars', 'mare', 'mars', 'cat'])
+    >>> 'care' in index
+    True
+    >>> index.neighbours('care')
+    ['cars', 'mare']
+    >>> index.neighbours('mist')
+    []
+    """
+    # === Private Attributes ===
+    # @type _words: set[str]
+    #     All the words in the dictionary.
+    # @type _by_length: dict[int, list[str]]
+    #     The words of each length.
+    # @type _buckets: dict[int, dict[str, list[str]]]
+    #     For each length that has been looked up, the words in each
+    #     wildcard bucket, keyed by the bucket's pattern.
+    # @type _neighbours: dict[str, list[str]]
+    #     The sorted one-letter neighbours of each word looked up so far.
+
+    def __init__(self, words):
+        """Create an index of <words>.
+
+        @type self: WordIndex
+        @type words: iterable[str]
+        @rtype: None
+        """
+        self._words = set(words)
+        self._by_length = {}
+        for word in self._words:
+            self._by_length.setdefault(len(word), []).append(word)
+        self._buckets = {}
+        self._neighbours = {}
+
+    def __contains__(self, word):
+        """Return True if <word> is in the dictionary.
+
+        @type self: WordIndex
+        @type word: str
+        @rtype: bool
+        """
+        return word in self._words
+
+    def neighbours(self, word):
+        """Return the words in the dictionary that differ from <word> in
+        exactly one letter, in alphabetical order.
+
+        <word> itself does not have to be in the dictionary.
+
+        @type self: WordIndex
+        @type word: str
+        @rtype: list[str]
+        """
+        if word not in self._neighbours:
+            buckets = self._length_buckets(len(word))
+            found = set()
+            for i in range(len(word)):
+                pattern = word[:i] + '_' + word[i + 1:]
+                found.update(buckets.get(pattern, []))
+            found.discard(word)
+            self._neighbours[word] = sorted(found)
+        return self._neighbours[word]
+
+    def lengths(self):
+        """Return the lengths of the words in the dictionary, in increasing
+        order.
+
+        @type self: WordIndex
+        @rtype: list[int]
+        """
+        return sorted(self._by_length)
+
+    def words_of_length(self, length):
+        """Return the words of length <length> in alphabetical order.
+
+        @type self: WordIndex
+        @type length: int
+        @rtype: list[str]
+        """
+        return sorted(self._by_length.get(length, []))
+
+    def is_ascii(self):
+        """Return True if every word in the dictionary is ASCII.
+
+        @type self: WordIndex
+        @rtype: bool
+        """
+        return all(word.isascii() for word in self._words)
+
+    def _length_buckets(self, length):
+        """Return the wildcard buckets of the words of length <length>,
+        building them if this is the first time they are needed.
+
+        @type self: WordIndex
+        @type length: int
+        @rtype: dict[str, list[str]]
+        """
+        if length not in self._buckets:
+            buckets = {}
+            for word in self._by_length.get(length, []):
+                for i in range(length):
+                    pattern = word[:i] + '_' + word[i + 1:]
+                    buckets.setdefault(pattern, []).append(word)
+            self._buckets[length] = buckets
+        return self._buckets[length]
+
+
+# The index of each dictionary file that has been loaded, keyed by file
+# name and whether the cache file was used.
+_indexes = {}
+
+
+def read_word_index(filename):
+    """Return a new WordIndex of the dictionary file <filename>, which has
+    one word per line.
+
+    @type filename: str
+    @rtype: WordIndex
+    """
+    with open(filename) as wordfile:
+        words = [line.strip() for line in wordfile]
+    return WordIndex(word for word in words if word != '')
+
+
+def word_index(filename=WORDS_FILE, cache=True):
+    """Return the index of the dictionary file <filename>, which has one
+    word per line.
+
+    The index is only loaded the first time it is asked for; later calls
+    with the same arguments return the same index. With <cache>, the
+    words and their neighbours are memory-mapped from a cache file next
+    to the dictionary (see word_graph.py), which is built if it is
+    missing or out of date. Otherwise the file is read into a WordIndex.
+
+    @type filename: str
+    @type cache: bool
+    @rtype: WordIndex | WordGraph
+    """
+    key = (filename, cache)
+    if key not in _indexes:
+        if cache:
+            _indexes[key] = load_graph(filename, read_word_index)
+        else:
+            _indexes[key] = read_word_index(filename)
+    return _indexes[key]
+
 
 class WordLadderPuzzle(Puzzle):
     """A word ladder puzzle."""
 
     # === Private attributes ===
-    # @type _words: list[str]
-    #     List of allowed English words
-    # @type _narrow_words: list[str]
-    #     List of allowed English words that are same length as the given word
+    # @type _words: WordIndex | WordGraph
+    #     The allowed English words. Shared by every state of the puzzle.
     # @type _start: str
     #     The given start word
     # @type _target: str
     #     The give target word
     # @type _ladder: list[str]
     #     List of valid words that the user inputs to build the word ladder
+    # @type _used: set[str]
+    #     The start word and the words in the ladder, which may not be
+    #     used again.
 
-    def __init__(self, start, target, ladder=None):
+    def __init__(self, start, target, ladder=None, words=None):
         """Create a new word ladder puzzle with given start and target words.
 
+        By default the allowed words are those in WORDS_FILE.
+
         @type self: WordLadderPuzzle
         @type start: str
         @type target: str
         @type ladder: list[str]
+        @type words: WordIndex | WordGraph | None
         @rtype: None
         """
-        self._words = []
-        with open('wordsEnTest.txt') as wordfile:
-            for line in wordfile:
-                self._words.append(line.strip())
-        self._narrow_words = []
-        for word in self._words:
-            if len(word) == len(start):
-                self._narrow_words.append(word)
+        if words is None:
+            words = word_index()
+        self._words = words
         self._start = start
         self._target = target
         if ladder is None:
             self._ladder = []
         else:
             self._ladder = ladder
+        self._used = set(self._ladder)
+        self._used.add(start)
 
     def __str__(self):
         """Return a human-readable string representation of <self>
@@ -147,7 +307,7 @@ class WordLadderPuzzle(Puzzle):
                     match = (self._ladder[i] == self._target)
                     if match is False:
                         return False
-                if self._ladder[i] not in self._narrow_words:
+                if not self._is_word(self._ladder[i]):
                     return False
         return True
 
@@ -183,27 +343,29 @@ class WordLadderPuzzle(Puzzle):
         <BLANKLINE>
 
         """
+        return list(self.iter_extensions())
+
+    def iter_extensions(self):
+        """Yield the possible new states after a valid move, in the same
+        order as extensions, making each one only when it is needed.
 
-        possible = []
+        @type self: WordLadderPuzzle
+        @rtype: generator[WordLadderPuzzle]
+
+        >>> w = WordLadderPuzzle('mire','cars')
+        >>> print(next(w.iter_extensions()))
+        START: mire
+        mare
+        TARGET: cars
+        <BLANKLINE>
+        """
         if len(self._ladder) == 0:
-            # intersection of words that both in _narrow_words(list contains
-            # all words with same length) and _possible_words(list contains
-            # all permutation of that word with one character difference)
-            more_nar = list(set(self._narrow_words).
-                            intersection(self._possible_words(self._start)))
-            for word in more_nar:
-                if self._diffone(word, self._start):
-                    possible.append(word)
+            current = self._start
         else:
-            more_nar = list(set(self._narrow_words).intersection
-                            (self._possible_words(self._ladder[-1])))
-
-            for word in more_nar:
-                if self._diffone(word, self._ladder[-1]):
-                    possible.append(word)
-        possible.sort()
-        results = [self._extend(word) for word in possible]
-        return results
+            current = self._ladder[-1]
+        for word in self._words.neighbours(current):
+            if word not in self._used:
+                yield self._extend(word)
 
     def move(self, move):
         """Return a new word ladder puzzle state specified
@@ -216,11 +378,9 @@ class WordLadderPuzzle(Puzzle):
         @type move: str
         @rtype: WordLadderPuzzle
         """
-        if move not in self._narrow_words:
-            raise ValueError
-        if move in self._ladder:
+        if not self._is_word(move):
             raise ValueError
-        if move == self._start:
+        if move in self._used:
             raise ValueError
         if len(self._ladder) == 0:
             if not len(move) == len(self._start):
@@ -233,11 +393,7 @@ class WordLadderPuzzle(Puzzle):
             if not self._diffone(move, self._ladder[-1]):
                 raise ValueError
 
-        new_ladder = []
-        for element in self._ladder:
-            new_ladder.append(element)
-        new_ladder.append(move)
-        return WordLadderPuzzle(self._start, self._target, new_ladder)
+        return self._extend(move)
 
     def is_valid(self, move):
         """Return True if the given move is valid,
@@ -247,11 +403,9 @@ class WordLadderPuzzle(Puzzle):
         @type move: str
         @rtype: bool
         """
-        if move not in self._narrow_words:
+        if not self._is_word(move):
             return False
-        if move in self._ladder:
-            return False
-        if move == self._start:
+        if move in self._used:
             return False
         if len(self._ladder) == 0:
             if not len(move) == len(self._start):
@@ -274,18 +428,30 @@ class WordLadderPuzzle(Puzzle):
         @type other: WordLadderPuzzle
         @rtype: bool
         """
-        if not self._start == other._start:
-            return False
-        if not self._target == other._target:
-            return False
+        return self.key() == other.key()
 
-        if not len(self._ladder) == len(other._ladder):
-            return False
-        else:
-            for index in range(len(self._ladder)):
-                if not self._ladder[index] == other._ladder[index]:
-                    return False
-            return True
+    def key(self):
+        """Return a canonical key for <self>: its start word, target word
+        and ladder.
+
+        @type self: WordLadderPuzzle
+        @rtype: (str, str, tuple[str])
+
+        >>> w = WordLadderPuzzle('mire', 'cars', ['mare'])
+        >>> w.key()
+        ('mire', 'cars', ('mare',))
+        >>> w == WordLadderPuzzle('mire', 'cars').move('mare')
+        True
+        """
+        return self._start, self._target, tuple(self._ladder)
+
+    def __hash__(self):
+        """Return a hash of <self>, consistent with __eq__.
+
+        @type self: WordLadderPuzzle
+        @rtype: int
+        """
+        return hash(self.key())
 
     def hint_generator(self, puzzle):
         """Compare two states of the puzzle and generate a valid hint of move.
@@ -297,6 +463,58 @@ class WordLadderPuzzle(Puzzle):
         index = len(self._ladder)
         return puzzle._ladder[index]
 
+    def shortest_solution(self):
+        """Return the solved state reachable from <self> in the fewest
+        moves, or None if the target cannot be reached.
+
+        Runs a breadth-first search from the current word and another from
+        the target at the same time, always growing the smaller frontier
+        by one level, until the two searches meet. Words already in the
+        ladder are never used again.
+
+        >>> w = WordLadderPuzzle('mist', 'cars')
+        >>> print(w.shortest_solution())
+        None
+        >>> w = WordLadderPuzzle('mire', 'cars')
+        >>> print(w.shortest_solution())
+        START: mire
+        mare
+        care
+        cars
+        TARGET: cars
+        <BLANKLINE>
+
+        @type self: WordLadderPuzzle
+        @rtype: WordLadderPuzzle | None
+        """
+        if self.is_solved():
+            return self
+        if len(self._ladder) == 0:
+            current = self._start
+        else:
+            current = self._ladder[-1]
+        if self._target in self._used or not self._is_word(self._target):
+            return None
+
+        # Each word reached by a search, mapped to the word it was reached
+        # from and its number of moves from where that search started.
+        forward = {current: (None, 0)}
+        backward = {self._target: (None, 0)}
+        forward_level = [current]
+        backward_level = [self._target]
+        while len(forward_level) > 0 and len(backward_level) > 0:
+            if len(forward_level) <= len(backward_level):
+                forward_level, meetings = self._grow_search(
+                    forward_level, forward, backward, self._used)
+            else:
+                backward_level, meetings = self._grow_search(
+                    backward_level, backward, forward, self._used)
+            if len(meetings) > 0:
+                best = min(meetings, key=lambda word: (
+                    forward[word][1] + backward[word][1], word))
+                return self._join_searches(best, forward, backward)
+        return None
+
     # ------------------------------------------------------------------------
     # Helpers for method 'is_solved' and 'extensions'
     # ------------------------------------------------------------------------
@@ -321,21 +539,66 @@ class WordLadderPuzzle(Puzzle):
                     one_diff = True
         return True
 
-    def _possible_words(self, word):
-        """Return a list of all possible word choices from the given word.
-        These choices are exactly one character different as the given word.
+    def _grow_search(self, level, reached, other, used):
+        """Grow a breadth-first search by one level.
+
+        Return the next level of the search, and the words in it that the
+        other search has also reached.
+
+        @type level: list[str]
+            The words the search reached in its last level.
+        @type reached: dict[str, (str | None, int)]
+            The words this search has reached, as in shortest_solution.
+            New words are added to it.
+        @type other: dict[str, (str | None, int)]
+            The words the other search has reached.
+        @type used: set[str]
+            Words that may not be used.
+        @rtype: (list[str], list[str])
+        """
+        next_level = []
+        meetings = []
+        for word in level:
+            moves = reached[word][1] + 1
+            for neighbour in self._words.neighbours(word):
+                if neighbour not in reached and neighbour not in used:
+                    reached[neighbour] = (word, moves)
+                    next_level.append(neighbour)
+                    if neighbour in other:
+                        meetings.append(neighbour)
+        return next_level, meetings
+
+    def _join_searches(self, word, forward, backward):
+        """Return the state made by extending the ladder along the path
+        the two searches of shortest_solution found through <word>.
 
         @type word: str
-        @rtype: list[str]
+        @type forward: dict[str, (str | None, int)]
+        @type backward: dict[str, (str | None, int)]
+        @rtype: WordLadderPuzzle
+        """
+        # Walk back to the current word, then forward to the target.
+        path = []
+        step = word
+        while forward[step][0] is not None:
+            path.append(step)
+            step = forward[step][0]
+        path.reverse()
+        step = backward[word][0]
+        while step is not None:
+            path.append(step)
+            step = backward[step][0]
+        return WordLadderPuzzle(self._start, self._target,
+                                self._ladder + path, self._words)
+
+    def _is_word(self, word):
+        """Return True if <word> is an allowed word with the same length
+        as the start word.
+
+        @type word: str
+        @rtype: bool
         """
-        result = []
-        for i in range(len(word)):
-            for char in CHARS:
-                new = word[:i] + word[i].replace(word[i], char, 1) + word[i+1:]
-                if new not in self._ladder:
-                    if not new == self._start:
-                        result.append(new)
-        return result
+        return len(word) == len(self._start) and word in self._words
 
     def _extend(self, word):
         """Return a new word ladder puzzle that has the given word
@@ -344,11 +607,8 @@ class WordLadderPuzzle(Puzzle):
         @type word: str
         @rtype: WordLadderPuzzle
         """
-        new_ladder = []
-        for element in self._ladder:
-            new_ladder.append(element)
-        new_ladder.append(word)
-        return WordLadderPuzzle(self._start, self._target, new_ladder)
+        return WordLadderPuzzle(self._start, self._target,
+                                self._ladder + [word], self._words)
 
 if __name__ == '__main__':
     import doctest